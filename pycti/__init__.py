@@ -64,6 +64,7 @@ from .utils.constants import (
     CustomObservableText,
     CustomObservableTrackingNumber,
     CustomObservableUserAgent,
+    DistributionFields,
     MultipleRefRelationship,
     StixCyberObservableTypes,
     StixMetaTypes,
@@ -125,6 +126,7 @@ __all__ = [
     "StixDomainObject",
     "StixMetaTypes",
     "MultipleRefRelationship",
+    "DistributionFields",
     "StixObjectOrStixRelationship",
     "StixSightingRelationship",
     "ThreatActor",
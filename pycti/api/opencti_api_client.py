@@ -3,8 +3,15 @@ import base64
 import datetime
 import io
 import json
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Union
 
+import dateutil.parser
 import magic
 import requests
 
@@ -62,9 +69,40 @@ from pycti.entities.opencti_tool import Tool
 from pycti.entities.opencti_vocabulary import Vocabulary
 from pycti.entities.opencti_vulnerability import Vulnerability
 from pycti.utils.opencti_logger import logger
+from pycti.utils.opencti_mapping_cache import PersistentMappingCache, SharedMappingCache
 from pycti.utils.opencti_stix2 import OpenCTIStix2
 from pycti.utils.opencti_stix2_utils import OpenCTIStix2Utils
 
+# Fields selected by create and update mutations for each returning mode
+RETURNING_SELECTIONS = {
+    "id": "id",
+    "minimal": "id standard_id entity_type parent_types",
+}
+
+
+class CapturedData(dict):
+    """Answer of a captured query
+
+    Missing fields are empty answers too, except the ids which are generated
+    and the list edges which are empty. The root fields echo the scalar
+    `input` values of the query, so the code reading a creation answer goes
+    on as if the platform had created the entity.
+    """
+
+    def __init__(self, values=None, echo=None):
+        super().__init__(values or {})
+        self.echo = echo
+
+    def __missing__(self, key):
+        if key in ["id", "standard_id"]:
+            value = "captured--" + str(uuid.uuid4())
+        elif key == "edges":
+            value = []
+        else:
+            value = CapturedData(self.echo)
+        self[key] = value
+        return value
+
 
 class File:
     def __init__(self, name, data, mime="text/plain"):
@@ -73,6 +111,85 @@ class File:
         self.mime = mime
 
 
+def quote_multipart_param(value):
+    return str(value).replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+class MultipartStream:
+    """Streamed multipart/form-data body of an upload
+
+    The files are read by chunks while the request is sent, instead of
+    being copied in a body built in memory. The body has a length, so it is
+    sent with a Content-Length, and can be iterated again on a retry.
+
+    :param fields: the form fields, by name
+    :type fields: dict
+    :param files: the `(name, (file_name, data, mime_type))` files, `data`
+        being bytes or a seekable binary file
+    :type files: list
+    :param chunk_size: number of bytes read at once, defaults to 1 MiB
+    :type chunk_size: int, optional
+    """
+
+    def __init__(self, fields, files, chunk_size=1 << 20):
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.parts = []
+        for name, value in fields.items():
+            header = (
+                "--" + self.boundary + "\r\n"
+                'Content-Disposition: form-data; name="'
+                + quote_multipart_param(name)
+                + '"\r\n\r\n'
+            )
+            self.parts.append((header.encode("utf-8"), value.encode("utf-8")))
+        for name, (file_name, data, mime_type) in files:
+            header = (
+                "--" + self.boundary + "\r\n"
+                'Content-Disposition: form-data; name="'
+                + quote_multipart_param(name)
+                + '"; filename="'
+                + quote_multipart_param(file_name)
+                + '"\r\nContent-Type: '
+                + mime_type
+                + "\r\n\r\n"
+            )
+            self.parts.append((header.encode("utf-8"), data))
+        self.footer = ("--" + self.boundary + "--\r\n").encode("utf-8")
+
+    @property
+    def content_type(self):
+        return "multipart/form-data; boundary=" + self.boundary
+
+    @staticmethod
+    def source_size(source):
+        if isinstance(source, bytes):
+            return len(source)
+        size = source.seek(0, io.SEEK_END)
+        source.seek(0)
+        return size
+
+    def __len__(self):
+        return sum(
+            len(header) + self.source_size(source) + 2 for header, source in self.parts
+        ) + len(self.footer)
+
+    def __iter__(self):
+        for header, source in self.parts:
+            yield header
+            if isinstance(source, bytes):
+                yield source
+            else:
+                source.seek(0)
+                while True:
+                    chunk = source.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            yield b"\r\n"
+        yield self.footer
+
+
 class OpenCTIApiClient:
     """Main API client for OpenCTI
 
@@ -98,6 +215,16 @@ class OpenCTIApiClient:
     :type cert: str, tuple, optional
     :param auth: Add a AuthBase class with custom authentication for you OpenCTI infrastructure.
     :type auth: requests.auth.AuthBase, optional
+    :param mapping_cache_path: path of a SQLite file keeping the import mapping cache between restarts
+    :type mapping_cache_path: str, optional
+    :param mapping_cache_ttl: seconds before an entry of the persistent mapping cache expires, defaults to one day
+    :type mapping_cache_ttl: int, optional
+    :param mapping_cache_max_entries: bound of the mapping cache file, to share it between the processes of a host (e.g. under /dev/shm)
+    :type mapping_cache_max_entries: int, optional
+    :param mapping_cache_max_size: maximum number of entries of the import mapping cache in memory, defaults to 50000
+    :type mapping_cache_max_size: int, optional
+    :param mapping_cache_max_bytes: maximum size in bytes of the import mapping cache in memory, replaces mapping_cache_max_size when set
+    :type mapping_cache_max_bytes: int, optional
     """
 
     def __init__(
@@ -112,6 +239,11 @@ class OpenCTIApiClient:
         cert=None,
         auth=None,
         perform_health_check=True,
+        mapping_cache_path=None,
+        mapping_cache_ttl=86400,
+        mapping_cache_max_entries=None,
+        mapping_cache_max_size=50000,
+        mapping_cache_max_bytes=None,
     ):
         """Constructor method"""
 
@@ -129,6 +261,7 @@ class OpenCTIApiClient:
         self.logger_class = logger(log_level.upper(), json_logging)
         self.app_logger = self.logger_class("api")
 
+        self.platform_version = None
         # Define API
         self.api_token = token
         self.api_url = url + "/graphql"
@@ -137,6 +270,13 @@ class OpenCTIApiClient:
             "Authorization": "Bearer " + token,
         }
 
+        # Per thread buffer used to capture queries instead of sending them
+        self.query_capture = threading.local()
+        # Per thread retry number, sent with the requests of the thread
+        self.query_retry = threading.local()
+        # Optional ImportProfiler recording the calls and their size
+        self.profiler = None
+
         if auth is not None:
             self.session = requests.session()
             self.session.auth = auth
@@ -147,7 +287,11 @@ class OpenCTIApiClient:
         self.work = OpenCTIApiWork(self)
         self.playbook = OpenCTIApiPlaybook(self)
         self.connector = OpenCTIApiConnector(self)
-        self.stix2 = OpenCTIStix2(self)
+        self.stix2 = OpenCTIStix2(
+            self,
+            mapping_cache_max_size=mapping_cache_max_size,
+            mapping_cache_max_bytes=mapping_cache_max_bytes,
+        )
 
         # Define the entities
         self.vocabulary = Vocabulary(self)
@@ -204,6 +348,27 @@ class OpenCTIApiClient:
                 "OpenCTI API is not reachable. Waiting for OpenCTI API to start or check your configuration..."
             )
 
+        # Persistent mapping cache, stamped with the platform it maps ids of
+        if mapping_cache_path is not None:
+            if self.platform_version is not None or self.health_check():
+                version = self.api_url + "@" + self.platform_version
+                if mapping_cache_max_entries is not None:
+                    persistent = SharedMappingCache(
+                        mapping_cache_path,
+                        max_entries=mapping_cache_max_entries,
+                        ttl=mapping_cache_ttl,
+                        version=version,
+                    )
+                else:
+                    persistent = PersistentMappingCache(
+                        mapping_cache_path, ttl=mapping_cache_ttl, version=version
+                    )
+                self.stix2.set_persistent_cache(persistent)
+            else:
+                self.app_logger.warning(
+                    "Platform version unknown, persistent mapping cache disabled"
+                )
+
     def set_applicant_id_header(self, applicant_id):
         self.request_headers["opencti-applicant-id"] = applicant_id
 
@@ -222,13 +387,32 @@ class OpenCTIApiClient:
         self.request_headers["previous-standard"] = previous_standard
 
     def get_request_headers(self):
-        return self.request_headers
+        retry_number = getattr(self.query_retry, "retry_number", None)
+        if retry_number is None:
+            return self.request_headers
+        return dict(self.request_headers, **{"opencti-retry-number": retry_number})
 
     def set_retry_number(self, retry_number):
         self.request_headers["opencti-retry-number"] = (
             "" if retry_number is None else str(retry_number)
         )
 
+    @contextmanager
+    def retry_number(self, retry_number):
+        """send the retry number with the requests of the current thread
+
+        Contrary to `set_retry_number`, the shared headers are left untouched,
+        so concurrent imports each send their own retry number.
+        """
+        previous = getattr(self.query_retry, "retry_number", None)
+        self.query_retry.retry_number = (
+            "" if retry_number is None else str(retry_number)
+        )
+        try:
+            yield
+        finally:
+            self.query_retry.retry_number = previous
+
     def query(self, query, variables=None):
         """submit a query to the OpenCTI GraphQL API
 
@@ -240,6 +424,20 @@ class OpenCTIApiClient:
         :rtype: Any
         """
         variables = variables or {}
+        captured = getattr(self.query_capture, "operations", None)
+        if captured is not None:
+            captured.append((query, variables))
+            echo = variables.get("input")
+            if isinstance(echo, dict):
+                # Relations are answered as objects, not as their input ids
+                echo = {
+                    key: value
+                    for key, value in echo.items()
+                    if isinstance(value, (str, int, float, bool)) and key != "createdBy"
+                }
+            else:
+                echo = None
+            return {"data": CapturedData(echo=echo)}
         query_var = {}
         files_vars = []
         # Implementation of spec https://github.com/jaydenseric/graphql-multipart-request-spec
@@ -260,6 +458,7 @@ class OpenCTIApiClient:
             else:
                 query_var[key] = val
 
+        start = time.perf_counter()
         # If yes, transform variable (file to null) and create multipart query
         if len(files_vars) > 0:
             multipart_data = {
@@ -322,25 +521,42 @@ class OpenCTIApiClient:
                     multipart_files.append(file_multi)
                     file_index += 1
             # Send the multipart request
-            r = self.session.post(
-                self.api_url,
-                data=multipart_data,
-                files=multipart_files,
-                headers=self.request_headers,
-                verify=self.ssl_verify,
-                cert=self.cert,
-                proxies=self.proxies,
-            )
+            if any(hasattr(file[1][1], "read") for file in multipart_files):
+                # Files are streamed rather than copied in the request body
+                body = MultipartStream(multipart_data, multipart_files)
+                r = self.session.post(
+                    self.api_url,
+                    data=body,
+                    headers=dict(
+                        self.get_request_headers(),
+                        **{"Content-Type": body.content_type},
+                    ),
+                    verify=self.ssl_verify,
+                    cert=self.cert,
+                    proxies=self.proxies,
+                )
+            else:
+                r = self.session.post(
+                    self.api_url,
+                    data=multipart_data,
+                    files=multipart_files,
+                    headers=self.get_request_headers(),
+                    verify=self.ssl_verify,
+                    cert=self.cert,
+                    proxies=self.proxies,
+                )
         # If no
         else:
             r = self.session.post(
                 self.api_url,
                 json={"query": query, "variables": variables},
-                headers=self.request_headers,
+                headers=self.get_request_headers(),
                 verify=self.ssl_verify,
                 cert=self.cert,
                 proxies=self.proxies,
             )
+        if self.profiler is not None:
+            self.profile_call(r, start, upload=len(files_vars) > 0)
         # Build response
         if r.status_code == 200:
             result = r.json()
@@ -366,6 +582,297 @@ class OpenCTIApiClient:
         else:
             raise ValueError(r.text)
 
+    def profile_call(self, response, start, upload=False):
+        body = response.request.body if response.request is not None else None
+        self.profiler.count_call(
+            time.perf_counter() - start,
+            len(body or b"") + len(response.content),
+            upload=upload,
+        )
+
+    @contextmanager
+    def capture_queries(self):
+        """capture the queries of the current thread instead of sending them
+
+        Inside the context, `query` records `(query, variables)` in the
+        yielded list and answers an empty result, so the entity methods build
+        their documents without reaching the platform.
+        """
+        previous = getattr(self.query_capture, "operations", None)
+        operations = []
+        self.query_capture.operations = operations
+        try:
+            yield operations
+        finally:
+            self.query_capture.operations = previous
+
+    @staticmethod
+    def build_multiple_query(operations):
+        """merge single root operations into one aliased GraphQL document
+
+        Variables of the operation `i` are renamed `o{i}_name` and its root
+        field is aliased `o{i}`.
+
+        :param operations: list of `(query, variables)` tuples
+        :type operations: list
+        :return: the merged query and variables
+        :rtype: tuple
+        """
+        operation_type = "mutation"
+        declarations = []
+        selections = []
+        merged_variables = {}
+        for index, (query, variables) in enumerate(operations):
+            alias = "o" + str(index)
+            query = query.strip()
+            operation_type = query.split(None, 1)[0]
+            body_start = query.index("{")
+            header = query[:body_start]
+            body = query[body_start + 1 : query.rindex("}")].strip()
+            header = re.sub(r"\$(\w+)", "$" + alias + r"_\1", header)
+            body = re.sub(r"\$(\w+)", "$" + alias + r"_\1", body)
+            if "(" in header:
+                declarations.append(header[header.index("(") + 1 : header.rindex(")")])
+            selections.append(alias + ": " + body)
+            for key, value in (variables or {}).items():
+                merged_variables[alias + "_" + key] = value
+        query = (
+            operation_type
+            + " Multiple"
+            + ("(" + ", ".join(declarations) + ")" if declarations else "")
+            + " {\n"
+            + "\n".join(selections)
+            + "\n}"
+        )
+        return query, merged_variables
+
+    def query_multiple(self, operations):
+        """submit single root operations as one aliased GraphQL document
+
+        Contrary to `query`, an error on one operation does not fail the
+        others: each operation gets its own data or error.
+
+        :param operations: list of `(query, variables)` tuples
+        :type operations: list
+        :return: list of `{"data": ..., "error": ...}` in the operations order
+        :rtype: list
+        """
+        if getattr(self.query_capture, "operations", None) is not None:
+            # Captured one by one, each answered as its root field
+            return [
+                {"data": self.query(query, variables)["data"]["root"], "error": None}
+                for query, variables in operations
+            ]
+        query, variables = self.build_multiple_query(operations)
+        start = time.perf_counter()
+        r = self.session.post(
+            self.api_url,
+            json={"query": query, "variables": variables},
+            headers=self.get_request_headers(),
+            verify=self.ssl_verify,
+            cert=self.cert,
+            proxies=self.proxies,
+        )
+        if self.profiler is not None:
+            self.profile_call(r, start)
+        if r.status_code != 200:
+            error = {"name": "Request error", "error_message": r.text}
+            return [{"data": None, "error": error} for _ in operations]
+        result = r.json()
+        data = result.get("data") or {}
+        errors = {}
+        for error in result.get("errors", []):
+            error_detail = {
+                "name": error["name"] if "name" in error else error["message"],
+                "error_message": error["message"],
+            }
+            path = error.get("path") or []
+            if len(path) == 0:
+                # Error on the whole document, every operation failed
+                return [{"data": None, "error": error_detail} for _ in operations]
+            errors.setdefault(path[0], error_detail)
+        outcomes = []
+        for index in range(len(operations)):
+            alias = "o" + str(index)
+            operation_data = data.get(alias)
+            error = errors.get(alias)
+            if error is None and operation_data is None:
+                error = {"name": "No data", "error_message": "Empty operation result"}
+            outcomes.append({"data": operation_data, "error": error})
+        return outcomes
+
+    def query_many(self, operations, chunk_size=100, max_workers=1):
+        """submit many single root operations by chunks of aliased documents
+
+        Chunks are sent by at most `max_workers` concurrent requests. As
+        mutation root fields run serially, the operations of a chunk are
+        applied in order.
+
+        :param operations: list of `(query, variables)` tuples
+        :type operations: list
+        :param chunk_size: number of operations per request, defaults to 100
+        :type chunk_size: int, optional
+        :param max_workers: number of concurrent requests, defaults to 1
+        :type max_workers: int, optional
+        :return: list of `{"data": ..., "error": ...}` in the operations order
+        :rtype: list
+        """
+        chunks = [
+            operations[start : start + chunk_size]
+            for start in range(0, len(operations), chunk_size)
+        ]
+        if max_workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                chunks_outcomes = list(executor.map(self.query_multiple, chunks))
+        else:
+            chunks_outcomes = [self.query_multiple(chunk) for chunk in chunks]
+        return [outcome for outcomes in chunks_outcomes for outcome in outcomes]
+
+    def create_many(self, create_method, items, chunk_size=100, max_retries=1):
+        """create many entities with aliased multi-mutation requests
+
+        Every item is given to `create_method` to build its mutation, then the
+        mutations are sent by chunks of `chunk_size`. Only the failed items
+        are sent again, at most `max_retries` times.
+
+        :param create_method: the `create` method of an entity class
+        :param items: list of kwargs dicts accepted by `create_method`
+        :type items: list
+        :param chunk_size: number of mutations per request, defaults to 100
+        :type chunk_size: int, optional
+        :param max_retries: number of retries of the failed items, defaults to 1
+        :type max_retries: int, optional
+        :return: list of `{"item": ..., "result": ..., "error": ...}` in the items order
+        :rtype: list
+        """
+        outcomes = [{"item": item, "result": None, "error": None} for item in items]
+        operations = {}
+        for index, item in enumerate(items):
+            with self.capture_queries() as captured:
+                create_method(**item)
+            if len(captured) != 1:
+                outcomes[index]["error"] = {
+                    "name": "Invalid item",
+                    "error_message": "Item does not build a single mutation",
+                }
+            elif any(
+                isinstance(value, File)
+                or isinstance(value, list)
+                and any(isinstance(v, File) for v in value)
+                for value in captured[0][1].values()
+            ):
+                # Uploads require a multipart request of their own
+                try:
+                    outcomes[index]["result"] = create_method(**item)
+                except ValueError as err:
+                    outcomes[index]["error"] = err.args[0]
+            else:
+                operations[index] = captured[0]
+        pending = list(operations.keys())
+        attempt = 0
+        while len(pending) > 0 and attempt <= max_retries:
+            failed = []
+            self.app_logger.info(
+                "Sending multiple mutations",
+                {"count": len(pending), "attempt": attempt},
+            )
+            pending_outcomes = self.query_many(
+                [operations[index] for index in pending], chunk_size=chunk_size
+            )
+            for index, outcome in zip(pending, pending_outcomes):
+                if outcome["error"] is not None:
+                    outcomes[index]["error"] = outcome["error"]
+                    failed.append(index)
+                else:
+                    outcomes[index]["error"] = None
+                    outcomes[index]["result"] = self.process_multiple_fields(
+                        outcome["data"]
+                    )
+            pending = failed
+            attempt += 1
+        return outcomes
+
+    def edit_relations(self, edit_field, **kwargs):
+        """add and remove many ref relations of an entity in few requests
+
+        Every `relationAdd`/`relationDelete` is aliased in multi-mutation
+        requests of `chunk_size` operations, without reading the entity first.
+
+        :param edit_field: the edit root field (e.g. `stixDomainObjectEdit`)
+        :type edit_field: str
+        :param id: the id of the entity to edit
+        :type id: str
+        :param add: list of `{"toId": ..., "relationship_type": ...}` to add
+        :type add: list, optional
+        :param remove: list of `{"toId": ..., "relationship_type": ...}` to remove
+        :type remove: list, optional
+        :param chunk_size: number of operations per request, defaults to 100
+        :type chunk_size: int, optional
+        :return: True if every operation succeeded
+        :rtype: bool
+        """
+        id = kwargs.get("id", None)
+        add = kwargs.get("add", None) or []
+        remove = kwargs.get("remove", None) or []
+        chunk_size = kwargs.get("chunk_size", 100)
+        if id is None:
+            self.app_logger.error("[opencti_api] Missing parameters: id")
+            return False
+        add_query = (
+            "mutation RelationAdd($id: ID!, $input: StixRefRelationshipAddInput!) {\n"
+            + edit_field
+            + "(id: $id) {\nrelationAdd(input: $input) {\nid\n}\n}\n}"
+        )
+        delete_query = (
+            "mutation RelationDelete($id: ID!, $toId: StixRef!, $relationship_type: String!) {\n"
+            + edit_field
+            + "(id: $id) {\nrelationDelete(toId: $toId, relationship_type: $relationship_type) {\nid\n}\n}\n}"
+        )
+        operations = [
+            (
+                add_query,
+                {
+                    "id": id,
+                    "input": {
+                        "toId": relation["toId"],
+                        "relationship_type": relation["relationship_type"],
+                    },
+                },
+            )
+            for relation in add
+        ] + [
+            (
+                delete_query,
+                {
+                    "id": id,
+                    "toId": relation["toId"],
+                    "relationship_type": relation["relationship_type"],
+                },
+            )
+            for relation in remove
+        ]
+        if len(operations) == 0:
+            return True
+        self.app_logger.info(
+            "Editing ref relations",
+            {"id": id, "add": len(add), "remove": len(remove)},
+        )
+        success = True
+        for start in range(0, len(operations), chunk_size):
+            chunk = operations[start : start + chunk_size]
+            for (_, variables), outcome in zip(chunk, self.query_multiple(chunk)):
+                if outcome["error"] is not None:
+                    success = False
+                    self.app_logger.error(
+                        "Cannot edit ref relation",
+                        {
+                            "id": id,
+                            "variables": variables,
+                            "error": outcome["error"],
+                        },
+                    )
+        return success
+
     def fetch_opencti_file(self, fetch_uri, binary=False, serialize=False):
         """get file from the OpenCTI API
 
@@ -379,7 +886,7 @@ class OpenCTIApiClient:
 
         r = self.session.get(
             fetch_uri,
-            headers=self.request_headers,
+            headers=self.get_request_headers(),
             verify=self.ssl_verify,
             cert=self.cert,
             proxies=self.proxies,
@@ -410,6 +917,7 @@ class OpenCTIApiClient:
                 """
             )
             if test is not None:
+                self.platform_version = test["data"]["about"]["version"]
                 return True
         except Exception as err:  # pylint: disable=broad-except
             self.app_logger.error(str(err))
@@ -516,6 +1024,107 @@ class OpenCTIApiClient:
             result["pagination"] = data["pageInfo"]
         return result
 
+    def iter_changed(self, list_method, **kwargs):
+        """iterate over the entities changed since a high-water mark
+
+        Rows are listed by `updated_at` ascending with cursor pagination. The
+        watermark keeps the highest `updated_at` seen and the ids already
+        returned close to it, so rows sharing a timestamp across two runs are
+        neither missed nor returned twice.
+
+        :param list_method: the `list` method of an entity class
+        :param since: date string, datetime or watermark of a previous run
+        :type since: str or datetime or dict, optional
+        :param watermark: dict updated in place after every returned entity
+        :type watermark: dict, optional
+        :param lookback: seconds re-scanned before the watermark to absorb
+                         clock skew, defaults to 0
+        :type lookback: int, optional
+        :param filters: additional filters to apply
+        :type filters: dict, optional
+        :param first: page size, defaults to 500
+        :type first: int, optional
+        :return: generator of entities, returning the final watermark
+        :rtype: Generator
+        """
+
+        since = kwargs.pop("since", None)
+        watermark = kwargs.pop("watermark", None)
+        lookback = kwargs.pop("lookback", 0)
+        filters = kwargs.pop("filters", None)
+        first = kwargs.pop("first", 500)
+        if watermark is None:
+            watermark = {}
+        if isinstance(since, dict):
+            watermark["updated_at"] = since.get("updated_at")
+            watermark["ids"] = dict(since.get("ids", {}))
+        elif isinstance(since, datetime.date):
+            watermark["updated_at"] = since.isoformat()
+        elif since is not None:
+            watermark["updated_at"] = since
+        watermark.setdefault("updated_at", None)
+        watermark.setdefault("ids", {})
+
+        changed_filters = []
+        if watermark["updated_at"] is not None:
+            start = self._parse_utc(watermark["updated_at"])
+            start = start - datetime.timedelta(seconds=lookback)
+            changed_filters.append(
+                {"key": "updated_at", "values": [start.isoformat()], "operator": "gte"}
+            )
+        query_filters = {
+            "mode": "and",
+            "filters": changed_filters,
+            "filterGroups": [filters] if filters is not None else [],
+        }
+
+        after = None
+        while True:
+            result = list_method(
+                filters=query_filters,
+                first=first,
+                after=after,
+                orderBy="updated_at",
+                orderMode="asc",
+                withPagination=True,
+                **kwargs,
+            )
+            for entity in result["entities"]:
+                updated_at = entity["updated_at"]
+                if watermark["ids"].get(entity["id"]) == updated_at:
+                    continue
+                yield entity
+                self._advance_watermark(watermark, entity, lookback)
+            page_info = result["pagination"]
+            if not page_info.get("hasNextPage") or len(result["entities"]) == 0:
+                break
+            after = page_info["endCursor"]
+        return watermark
+
+    @staticmethod
+    def _parse_utc(value):
+        """parse a date string, the dates without a timezone being UTC"""
+        date = dateutil.parser.parse(value)
+        if date.tzinfo is None:
+            return date.replace(tzinfo=datetime.timezone.utc)
+        return date.astimezone(datetime.timezone.utc)
+
+    def _advance_watermark(self, watermark, entity, lookback):
+        updated_at = entity["updated_at"]
+        watermark["ids"][entity["id"]] = updated_at
+        current = self._parse_utc(updated_at)
+        if watermark["updated_at"] is None or current > self._parse_utc(
+            watermark["updated_at"]
+        ):
+            watermark["updated_at"] = updated_at
+            # Only keep the ids that can be listed again on the next run
+            horizon = current - datetime.timedelta(seconds=lookback)
+            watermark["ids"] = {
+                key: value
+                for key, value in watermark["ids"].items()
+                if self._parse_utc(value) >= horizon
+            }
+
     def process_multiple_ids(self, data) -> list:
         """processes data returned by the OpenCTI API with multiple ids
 
@@ -626,6 +1235,70 @@ class OpenCTIApiClient:
             del data["content_alt"]
         return data
 
+    @staticmethod
+    def returning_query(query, returning="full"):
+        """shrink the selection set of a create or update mutation
+
+        The selection of the innermost root field (e.g. `malwareAdd` or
+        `stixDomainObjectEdit.fieldPatch`) is replaced by the fields of the
+        `returning` mode.
+
+        :param query: the GraphQL mutation
+        :type query: str
+        :param returning: `id`, `minimal` or `full`, defaults to `full`
+        :type returning: str, optional
+        :return: the GraphQL mutation with the selected fields
+        :rtype: str
+        """
+        if returning == "full":
+            return query
+        if returning not in RETURNING_SELECTIONS:
+            raise ValueError("Unknown returning mode: " + str(returning))
+        # Skip the operation header and its variables declaration
+        start = query.index("{")
+        while True:
+            # The selection starts with a field taking arguments: go deeper
+            match = re.match(r"\s*\w+\s*\(", query[start + 1 :])
+            if match is None:
+                break
+            depth = 1
+            position = start + 1 + match.end()
+            while depth > 0:
+                depth += {"(": 1, ")": -1}.get(query[position], 0)
+                position += 1
+            next_start = query.find("{", position)
+            if next_start == -1 or query[position:next_start].strip() != "":
+                break
+            start = next_start
+        depth = 1
+        end = start + 1
+        while depth > 0:
+            depth += {"{": 1, "}": -1}.get(query[end], 0)
+            end += 1
+        return (
+            query[: start + 1]
+            + "\n"
+            + RETURNING_SELECTIONS[returning]
+            + "\n"
+            + query[end - 1 :]
+        )
+
+    def process_returning(self, data, returning="full"):
+        """processes data returned by a create or update mutation
+
+        Only the `full` mode needs the fields post-processing.
+
+        :param data: data to process
+        :type data: dict
+        :param returning: `id`, `minimal` or `full`, defaults to `full`
+        :type returning: str, optional
+        :return: returns the data dict
+        :rtype: dict
+        """
+        if returning == "full":
+            return self.process_multiple_fields(data)
+        return data
+
     def upload_file(self, **kwargs):
         """upload a file to OpenCTI API
 
@@ -13,6 +13,7 @@ import tempfile
 import threading
 import time
 import uuid
+from contextlib import nullcontext
 from enum import Enum
 from queue import Queue
 from typing import Callable, Dict, List, Optional, Union
@@ -538,6 +539,7 @@ class ListenStream(threading.Thread):
         no_dependencies,
         recover_iso_date,
         with_inferences,
+        coalesce_updates=False,
     ) -> None:
         threading.Thread.__init__(self)
         self.helper = helper
@@ -551,8 +553,19 @@ class ListenStream(threading.Thread):
         self.no_dependencies = no_dependencies
         self.recover_iso_date = recover_iso_date
         self.with_inferences = with_inferences
+        self.coalesce_updates = coalesce_updates
         self.exit_event = threading.Event()
 
+    def process_message(self, msg) -> None:
+        # Pending patches are applied before any other event, in stream order
+        if msg.event != "update":
+            self.helper.api.stix2.stix2_update.flush_updates()
+        self.callback(msg)
+
+    def resume_position(self, msg) -> str:
+        # The stream resumes before the coalesced patches not applied yet
+        return self.helper.api.stix2.stix2_update.stream_position(str(msg.id))
+
     def run(self) -> None:  # pylint: disable=too-many-branches
         try:
             self.helper.connector_logger.info("Starting ListenStream thread")
@@ -624,34 +637,42 @@ class ListenStream(threading.Thread):
                 },
                 verify=self.verify_ssl,
             )
-            # Iter on stream messages
-            for msg in messages:
-                if self.exit_event.is_set():
-                    stream_alive.stop()
-                    break
-                if msg.id is not None:
-                    try:
-                        q.put(msg.event, block=False)
-                    except queue.Full:
-                        pass
-                    if msg.event == "heartbeat" or msg.event == "connected":
-                        state = self.helper.get_state()
-                        # state can be None if reset from the UI
-                        # In this case, default parameters will be used but SSE Client needs to be restarted
-                        if state is None:
-                            self.exit_event.set()
+            # Patches processed by the callback are coalesced when enabled
+            coalescing = (
+                self.helper.api.stix2.stix2_update.coalescing()
+                if self.coalesce_updates
+                else nullcontext()
+            )
+            self.helper.api.stix2.stix2_update.stream_position(start_from)
+            with coalescing:
+                # Iter on stream messages
+                for msg in messages:
+                    if self.exit_event.is_set():
+                        stream_alive.stop()
+                        break
+                    if msg.id is not None:
+                        try:
+                            q.put(msg.event, block=False)
+                        except queue.Full:
+                            pass
+                        if msg.event == "heartbeat" or msg.event == "connected":
+                            state = self.helper.get_state()
+                            # state can be None if reset from the UI
+                            # In this case, default parameters will be used but SSE Client needs to be restarted
+                            if state is None:
+                                self.exit_event.set()
+                            else:
+                                state["start_from"] = self.resume_position(msg)
+                                self.helper.set_state(state)
                         else:
-                            state["start_from"] = str(msg.id)
+                            self.process_message(msg)
+                            state = self.helper.get_state()
+                            # state can be None if reset from the UI
+                            # In this case, default parameters will be used but SSE Client needs to be restarted
+                            if state is None:
+                                self.exit = True
+                            state["start_from"] = self.resume_position(msg)
                             self.helper.set_state(state)
-                    else:
-                        self.callback(msg)
-                        state = self.helper.get_state()
-                        # state can be None if reset from the UI
-                        # In this case, default parameters will be used but SSE Client needs to be restarted
-                        if state is None:
-                            self.exit = True
-                        state["start_from"] = str(msg.id)
-                        self.helper.set_state(state)
         except Exception as ex:
             self.helper.connector_logger.error(
                 "Error in ListenStream loop, exit.", {"reason": str(ex)}
@@ -772,6 +793,41 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         self.opencti_json_logging = get_config_variable(
             "OPENCTI_JSON_LOGGING", ["opencti", "json_logging"], config, False, True
         )
+        self.opencti_mapping_cache_path = get_config_variable(
+            "OPENCTI_MAPPING_CACHE_PATH",
+            ["opencti", "mapping_cache_path"],
+            config,
+            False,
+            None,
+        )
+        self.opencti_mapping_cache_ttl = get_config_variable(
+            "OPENCTI_MAPPING_CACHE_TTL",
+            ["opencti", "mapping_cache_ttl"],
+            config,
+            True,
+            86400,
+        )
+        self.opencti_mapping_cache_max_entries = get_config_variable(
+            "OPENCTI_MAPPING_CACHE_MAX_ENTRIES",
+            ["opencti", "mapping_cache_max_entries"],
+            config,
+            True,
+            None,
+        )
+        self.opencti_mapping_cache_max_size = get_config_variable(
+            "OPENCTI_MAPPING_CACHE_MAX_SIZE",
+            ["opencti", "mapping_cache_max_size"],
+            config,
+            True,
+            50000,
+        )
+        self.opencti_mapping_cache_max_bytes = get_config_variable(
+            "OPENCTI_MAPPING_CACHE_MAX_BYTES",
+            ["opencti", "mapping_cache_max_bytes"],
+            config,
+            True,
+            None,
+        )
         # Load connector config
         self.connect_id = get_config_variable(
             "CONNECTOR_ID", ["connector", "id"], config
@@ -816,6 +872,13 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             False,
             False,
         )
+        self.connect_live_stream_coalesce_updates = get_config_variable(
+            "CONNECTOR_LIVE_STREAM_COALESCE_UPDATES",
+            ["connector", "live_stream_coalesce_updates"],
+            config,
+            False,
+            False,
+        )
         self.connect_live_stream_recover_iso_date = get_config_variable(
             "CONNECTOR_LIVE_STREAM_RECOVER_ISO_DATE",
             ["connector", "live_stream_recover_iso_date"],
@@ -869,6 +932,20 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             True,
             7,
         )
+        self.bundle_pack_max_objects = get_config_variable(
+            "CONNECTOR_SEND_TO_QUEUE_PACK_MAX_OBJECTS",
+            ["connector", "send_to_queue_pack_max_objects"],
+            config,
+            True,
+            1,
+        )
+        self.bundle_pack_max_bytes = get_config_variable(
+            "CONNECTOR_SEND_TO_QUEUE_PACK_MAX_BYTES",
+            ["connector", "send_to_queue_pack_max_bytes"],
+            config,
+            True,
+            None,
+        )
         self.connect_only_contextual = get_config_variable(
             "CONNECTOR_ONLY_CONTEXTUAL",
             ["connector", "only_contextual"],
@@ -916,6 +993,11 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             self.opencti_ssl_verify,
             json_logging=self.opencti_json_logging,
             bundle_send_to_queue=self.bundle_send_to_queue,
+            mapping_cache_path=self.opencti_mapping_cache_path,
+            mapping_cache_ttl=self.opencti_mapping_cache_ttl,
+            mapping_cache_max_entries=self.opencti_mapping_cache_max_entries,
+            mapping_cache_max_size=self.opencti_mapping_cache_max_size,
+            mapping_cache_max_bytes=self.opencti_mapping_cache_max_bytes,
         )
         # - Impersonate API that will use applicant id
         # Behave like standard api if applicant not found
@@ -926,6 +1008,11 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             self.opencti_ssl_verify,
             json_logging=self.opencti_json_logging,
             bundle_send_to_queue=self.bundle_send_to_queue,
+            mapping_cache_path=self.opencti_mapping_cache_path,
+            mapping_cache_ttl=self.opencti_mapping_cache_ttl,
+            mapping_cache_max_entries=self.opencti_mapping_cache_max_entries,
+            mapping_cache_max_size=self.opencti_mapping_cache_max_size,
+            mapping_cache_max_bytes=self.opencti_mapping_cache_max_bytes,
         )
         self.connector_logger = self.api.logger_class(self.connect_name)
         # For retro compatibility
@@ -938,6 +1025,9 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         self.metric = OpenCTIMetricHandler(
             self.connector_logger, expose_metrics, metrics_port
         )
+        if expose_metrics:
+            self.api.stix2.set_metric_handler(self.metric)
+            self.api_impersonate.stix2.set_metric_handler(self.metric)
         # Register the connector in OpenCTI
         self.connector = OpenCTIConnector(
             self.connect_id,
@@ -1442,10 +1532,13 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         no_dependencies=None,
         recover_iso_date=None,
         with_inferences=None,
+        coalesce_updates=None,
     ) -> ListenStream:
         """listen for messages and register callback function
 
         :param message_callback: callback function to process messages
+        :param coalesce_updates: coalesce the patches given by the callback
+            to `api.stix2.stix2_update.process_update`, see `coalescing`
         """
         # URL
         if url is None:
@@ -1480,6 +1573,14 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             with_inferences = self.connect_live_stream_with_inferences
         elif with_inferences is None:
             with_inferences = False
+        # Coalesce updates
+        if (
+            coalesce_updates is None
+            and self.connect_live_stream_coalesce_updates is not None
+        ):
+            coalesce_updates = self.connect_live_stream_coalesce_updates
+        elif coalesce_updates is None:
+            coalesce_updates = False
         # Start timestamp
         if (
             start_timestamp is None
@@ -1510,6 +1611,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             no_dependencies,
             recover_iso_date,
             with_inferences,
+            coalesce_updates,
         )
         self.listen_stream.start()
         return self.listen_stream
@@ -1557,6 +1659,12 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         :type entities_types: list, optional
         :param update: whether to updated data in the database, defaults to False
         :type update: bool, optional
+        :param pack_max_objects: maximum number of objects of a queued bundle,
+            objects of a same dependency level are packed together
+        :type pack_max_objects: int, optional
+        :param pack_max_bytes: maximum JSON size of the objects of a queued
+            bundle
+        :type pack_max_bytes: int, optional
         :raises ValueError: if the bundle is empty
         :return: list of bundles
         :rtype: list
@@ -1580,52 +1688,26 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         bundle_send_to_directory_retention = kwargs.get(
             "send_to_directory_retention", self.bundle_send_to_directory_retention
         )
+        pack_max_objects = kwargs.get("pack_max_objects", self.bundle_pack_max_objects)
+        pack_max_bytes = kwargs.get("pack_max_bytes", self.bundle_pack_max_bytes)
 
-        # Bundle ids must be rewritten
-        bundle = self.api.stix2.prepare_bundle_ids(
-            bundle=bundle, use_json=True, keep_original_id=keep_original_id
-        )
-
-        # In case of enrichment ingestion, ensure the sharing if needed
-        if self.enrichment_shared_organizations is not None:
-            # Every element of the bundle must be enriched with the same organizations
+        # The bundle is parsed once, every stage below works on its objects
+        try:
             bundle_data = json.loads(bundle)
-            for item in bundle_data["objects"]:
-                if (
-                    "extensions" in item
-                    and "extension-definition--ea279b3e-5c71-4632-ac08-831c66a786ba"
-                    in item["extensions"]
-                ):
-                    octi_extensions = item["extensions"][
-                        "extension-definition--ea279b3e-5c71-4632-ac08-831c66a786ba"
-                    ]
-                    if octi_extensions.get("granted_refs") is not None:
-                        octi_extensions["granted_refs"] = list(
-                            set(
-                                octi_extensions["granted_refs"]
-                                + self.enrichment_shared_organizations
-                            )
-                        )
-                    else:
-                        octi_extensions["granted_refs"] = (
-                            self.enrichment_shared_organizations
-                        )
-                else:
-                    if item.get("x_opencti_granted_refs") is not None:
-                        item["x_opencti_granted_refs"] = list(
-                            set(
-                                item["x_opencti_granted_refs"]
-                                + self.enrichment_shared_organizations
-                            )
-                        )
-                    else:
-                        item["x_opencti_granted_refs"] = (
-                            self.enrichment_shared_organizations
-                        )
-            bundle = json.dumps(bundle_data)
+        except:
+            raise Exception("File data is not a valid JSON")
+        # Bundle ids must be rewritten, in case of enrichment ingestion every
+        # element is shared with the same organizations in the same pass
+        self.api.stix2.prepare_bundle_ids(
+            bundle=bundle_data,
+            use_json=False,
+            keep_original_id=keep_original_id,
+            granted_refs=self.enrichment_shared_organizations,
+        )
 
         # If execution in playbook, callback the api
         if self.playbook is not None:
+            bundle = json.dumps(bundle_data)
             self.api.playbook.playbook_step_execution(self.playbook, bundle)
             return [bundle]
 
@@ -1635,7 +1717,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         if self.connect_validate_before_import and not bypass_validation and file_name:
             self.api.upload_pending_file(
                 file_name=file_name,
-                data=bundle,
+                data=json.dumps(bundle_data),
                 mime_type="application/json",
                 entity_id=entity_id,
             )
@@ -1673,7 +1755,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
                     "validate_before_import": self.connect_validate_before_import,
                 },
                 "entities_types": entities_types,
-                "bundle": json.loads(bundle),
+                "bundle": bundle_data,
                 "update": update,
             }
             # Maintains the list of files under control
@@ -1698,16 +1780,22 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             os.rename(write_file, final_write_file)
 
         if bypass_split:
-            bundles = [bundle]
-            expectations_number = len(json.loads(bundle)["objects"])
+            bundles = [json.dumps(bundle_data)]
+            expectations_number = len(bundle_data["objects"])
         else:
             stix2_splitter = OpenCTIStix2Splitter()
             (
                 expectations_number,
                 bundles,
             ) = stix2_splitter.split_bundle_with_expectations(
-                bundle, True, event_version
+                bundle_data,
+                False,
+                event_version,
+                max_objects=pack_max_objects,
+                max_bytes=pack_max_bytes,
             )
+            # Every split bundle is serialized once, for the queue
+            bundles = [json.dumps(split_bundle) for split_bundle in bundles]
 
         if len(bundles) == 0:
             self.metric.inc("error_count")
@@ -1,4 +1,4 @@
-from typing import Type, Union
+from typing import Dict, Optional, Type, Union
 
 from prometheus_client import Counter, Enum, start_http_server
 
@@ -49,6 +49,21 @@ class OpenCTIMetricHandler:
                     "client_error_count",
                     "Number of client error",
                 ),
+                "mapping_cache_hit": Counter(
+                    "mapping_cache_hit",
+                    "Number of import mapping cache hits",
+                    ["cache", "namespace"],
+                ),
+                "mapping_cache_miss": Counter(
+                    "mapping_cache_miss",
+                    "Number of import mapping cache misses",
+                    ["cache", "namespace"],
+                ),
+                "mapping_cache_eviction": Counter(
+                    "mapping_cache_eviction",
+                    "Number of import mapping cache evictions",
+                    ["cache", "namespace"],
+                ),
                 "state": Enum(
                     "state", "State of connector", states=["idle", "running", "stopped"]
                 ),
@@ -85,7 +100,7 @@ class OpenCTIMetricHandler:
             return False
         return True
 
-    def inc(self, name: str, n: int = 1):
+    def inc(self, name: str, n: int = 1, labels: Optional[Dict[str, str]] = None):
         """
         Increment the metric (counter) `name` by `n`.
 
@@ -95,10 +110,15 @@ class OpenCTIMetricHandler:
             Name of the metric to increment.
         n : int, default 1
             Increment the counter by `n`.
+        labels : dict, optional
+            Label values of the counter, for labelled metrics.
         """
         if self.activated:
             if self._metric_exists(name, Counter):
-                self._metrics[name].inc(n)
+                if labels is not None:
+                    self._metrics[name].labels(**labels).inc(n)
+                else:
+                    self._metrics[name].inc(n)
 
     def state(self, state: str, name: str = "state"):
         """
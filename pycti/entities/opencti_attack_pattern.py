@@ -326,6 +326,43 @@ class AttackPattern:
                 result["data"]["attackPatterns"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Attack-Patterns
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Attack-Patterns
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Attack-Patterns with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query AttackPatternsCount($filters: FilterGroup, $search: String) {
+                attackPatterns(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["attackPatterns"]["pageInfo"]["globalCount"]
+
     """
         Read a Attack-Pattern object
 
@@ -374,6 +411,7 @@ class AttackPattern:
         Create a Attack-Pattern object
 
         :param name: the name of the Attack Pattern
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Attack-Pattern object
     """
 
@@ -400,6 +438,7 @@ class AttackPattern:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Attack-Pattern", {"name": name})
@@ -413,6 +452,7 @@ class AttackPattern:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -442,14 +482,26 @@ class AttackPattern:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["attackPatternAdd"]
+            return self.opencti.process_returning(
+                result["data"]["attackPatternAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_attack_pattern] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many AttackPattern objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Attack-Pattern object from a STIX2 object
 
@@ -310,6 +310,43 @@ class Campaign:
                 result["data"]["campaigns"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Campaigns
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Campaigns
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Campaigns with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query CampaignsCount($filters: FilterGroup, $search: String) {
+                campaigns(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["campaigns"]["pageInfo"]["globalCount"]
+
     """
         Read a Campaign object
 
@@ -358,6 +395,7 @@ class Campaign:
         Create a Campaign object
 
         :param name: the name of the Campaign
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Campaign object
     """
 
@@ -382,6 +420,7 @@ class Campaign:
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Campaign", {"name": name})
@@ -395,6 +434,7 @@ class Campaign:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -422,12 +462,26 @@ class Campaign:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["campaignAdd"])
+            return self.opencti.process_returning(
+                result["data"]["campaignAdd"], returning
+            )
         else:
             self.opencti.app_logger.error(
                 "[opencti_campaign] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Campaign objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import a Campaign object from a STIX2 object
 
@@ -555,6 +555,43 @@ class CaseIncident:
                 result["data"]["caseIncidents"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Case Incidents
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Case Incidents
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Case Incidents with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query CaseIncidentsCount($filters: FilterGroup, $search: String) {
+                caseIncidents(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["caseIncidents"]["pageInfo"]["globalCount"]
+
     """
         Read a Case Incident object
 
@@ -669,6 +706,7 @@ class CaseIncident:
         Create a Case Incident object
 
         :param name: the name of the Case Incident
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Case Incident object
     """
 
@@ -694,6 +732,7 @@ class CaseIncident:
         response_types = kwargs.get("response_types", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Case Incident", {"name": name})
@@ -707,6 +746,7 @@ class CaseIncident:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -735,14 +775,26 @@ class CaseIncident:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["caseIncidentAdd"]
+            return self.opencti.process_returning(
+                result["data"]["caseIncidentAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_caseIncident] Missing parameters: name"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many CaseIncident objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
         """
         Add a Stix-Entity object to Case Incident object (object_refs)
 
@@ -551,6 +551,43 @@ class CaseRfi:
                 result["data"]["caseRfis"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Case Rfis
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Case Rfis
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Case Rfis with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query CaseRfisCount($filters: FilterGroup, $search: String) {
+                caseRfis(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["caseRfis"]["pageInfo"]["globalCount"]
+
     """
         Read a Case Rfi object
 
@@ -665,6 +702,7 @@ class CaseRfi:
         Create a Case Rfi object
 
         :param name: the name of the Case Rfi
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Case Rfi object
     """
 
@@ -687,6 +725,7 @@ class CaseRfi:
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
         information_types = kwargs.get("information_types", None)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Case Rfi", {"name": name})
@@ -700,6 +739,7 @@ class CaseRfi:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -725,10 +765,24 @@ class CaseRfi:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["caseRfiAdd"])
+            return self.opencti.process_returning(
+                result["data"]["caseRfiAdd"], returning
+            )
         else:
             self.opencti.app_logger.error("[opencti_caseRfi] Missing parameters: name")
 
+    def create_many(self, items, **kwargs):
+        """Create many CaseRfi objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
         """
         Add a Stix-Entity object to Case Rfi object (object_refs)
 
@@ -550,6 +550,43 @@ class CaseRft:
                 result["data"]["caseRfts"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Case Rfts
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Case Rfts
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Case Rfts with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query CaseRftsCount($filters: FilterGroup, $search: String) {
+                caseRfts(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["caseRfts"]["pageInfo"]["globalCount"]
+
     """
         Read a Case Rft object
 
@@ -664,6 +701,7 @@ class CaseRft:
         Create a Case Rft object
 
         :param name: the name of the Case Rft
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Case Rft object
     """
 
@@ -686,6 +724,7 @@ class CaseRft:
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
         takedown_types = kwargs.get("takedown_types", None)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Case Rft", {"name": name})
@@ -699,6 +738,7 @@ class CaseRft:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -724,10 +764,24 @@ class CaseRft:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["caseRftAdd"])
+            return self.opencti.process_returning(
+                result["data"]["caseRftAdd"], returning
+            )
         else:
             self.opencti.app_logger.error("[opencti_caseRft] Missing parameters: name")
 
+    def create_many(self, items, **kwargs):
+        """Create many CaseRft objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
         """
         Add a Stix-Entity object to Case Rft object (object_refs)
 
@@ -306,6 +306,43 @@ class Channel:
                 result["data"]["channels"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Channels
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Channels
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Channels with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query ChannelsCount($filters: FilterGroup, $search: String) {
+                channels(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["channels"]["pageInfo"]["globalCount"]
+
     """
         Read a Channel object
 
@@ -354,6 +391,7 @@ class Channel:
         Create a Channel object
 
         :param name: the name of the Channel
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Channel object
     """
 
@@ -375,6 +413,7 @@ class Channel:
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         granted_refs = kwargs.get("objectOrganization", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Channel", {"name": name})
@@ -388,6 +427,7 @@ class Channel:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -412,12 +452,26 @@ class Channel:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["channelAdd"])
+            return self.opencti.process_returning(
+                result["data"]["channelAdd"], returning
+            )
         else:
             self.opencti.app_logger.error(
                 "[opencti_channel] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Channel objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Channel object from a STIX2 object
 
@@ -300,6 +300,43 @@ class CourseOfAction:
                 result["data"]["coursesOfAction"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Courses-Of-Action
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Courses-Of-Action
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Courses-Of-Action with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query CoursesOfActionCount($filters: FilterGroup, $search: String) {
+                coursesOfAction(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["coursesOfAction"]["pageInfo"]["globalCount"]
+
     """
         Read a Course-Of-Action object
 
@@ -350,6 +387,7 @@ class CourseOfAction:
         Create a Course Of Action object
 
         :param name: the name of the Course Of Action
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Course Of Action object
     """
 
@@ -372,6 +410,7 @@ class CourseOfAction:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Course Of Action", {"name": name})
@@ -385,6 +424,7 @@ class CourseOfAction:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -410,14 +450,26 @@ class CourseOfAction:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["courseOfActionAdd"]
+            return self.opencti.process_returning(
+                result["data"]["courseOfActionAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_course_of_action] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many CourseOfAction objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Course-Of-Action object from a STIX2 object
 
@@ -342,6 +342,43 @@ class DataComponent:
                 result["data"]["dataComponents"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Data-Components
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Data-Components
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Data-Components with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query DataComponentsCount($filters: FilterGroup, $search: String) {
+                dataComponents(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["dataComponents"]["pageInfo"]["globalCount"]
+
     """
         Read a Data-Component object
 
@@ -390,6 +427,7 @@ class DataComponent:
         Create a Data Component object
 
         :param name: the name of the Data Component
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Data Component object
     """
 
@@ -412,6 +450,7 @@ class DataComponent:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Data Component", {"name": name})
@@ -428,6 +467,7 @@ class DataComponent:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -453,14 +493,26 @@ class DataComponent:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["dataComponentAdd"]
+            return self.opencti.process_returning(
+                result["data"]["dataComponentAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_data_component] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many DataComponent objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Data-Component object from a STIX2 object
 
@@ -298,6 +298,43 @@ class DataSource:
                 result["data"]["dataSources"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Data-Sources
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Data-Sources
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Data-Sources with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query DataSourcesCount($filters: FilterGroup, $search: String) {
+                dataSources(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["dataSources"]["pageInfo"]["globalCount"]
+
     """
         Read a Data-Source object
 
@@ -346,6 +383,7 @@ class DataSource:
         Create a Data Source object
 
         :param name: the name of the Data Source
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Data Source object
     """
 
@@ -369,6 +407,7 @@ class DataSource:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Data Source", {"name": name})
@@ -383,6 +422,7 @@ class DataSource:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -409,12 +449,26 @@ class DataSource:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["dataSourceAdd"])
+            return self.opencti.process_returning(
+                result["data"]["dataSourceAdd"], returning
+            )
         else:
             self.opencti.app_logger.error(
                 "[opencti_data_source] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many DataSource objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Data-Source object from a STIX2 object
 
@@ -310,6 +310,43 @@ class Event:
                 result["data"]["events"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Events
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Events
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Events with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query EventsCount($filters: FilterGroup, $search: String) {
+                events(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["events"]["pageInfo"]["globalCount"]
+
     """
         Read a Event object
 
@@ -358,6 +395,7 @@ class Event:
         Create a Event object
 
         :param name: the name of the Event
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Event object
     """
 
@@ -380,6 +418,7 @@ class Event:
         event_types = kwargs.get("event_types", None)
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Event", {"name": name})
@@ -393,6 +432,7 @@ class Event:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -418,12 +458,24 @@ class Event:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["eventAdd"])
+            return self.opencti.process_returning(result["data"]["eventAdd"], returning)
         else:
             self.opencti.app_logger.error(
                 "[opencti_event] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Event objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Event object from a STIX2 object
 
@@ -164,6 +164,40 @@ class ExternalReference:
                 result["data"]["externalReferences"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count External-Reference
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+
+        :return: number of matching External-Reference
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+
+        self.opencti.app_logger.info(
+            "Counting External-Reference with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query ExternalReferencesCount($filters: FilterGroup) {
+                externalReferences(filters: $filters, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+            },
+        )
+        return result["data"]["externalReferences"]["pageInfo"]["globalCount"]
+
     """
         Read a External-Reference object
 
@@ -208,6 +242,7 @@ class ExternalReference:
         Create a External Reference object
 
         :param source_name: the source_name of the External Reference
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return External Reference object
     """
 
@@ -221,6 +256,7 @@ class ExternalReference:
         description = kwargs.get("description", None)
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if source_name is not None or url is not None:
             self.opencti.app_logger.info(
@@ -237,6 +273,7 @@ class ExternalReference:
                 }
             """
             )
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -253,14 +290,26 @@ class ExternalReference:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["externalReferenceAdd"]
+            return self.opencti.process_returning(
+                result["data"]["externalReferenceAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_external_reference] Missing parameters: source_name and url"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many ExternalReference objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Upload a file in this External-Reference
 
@@ -323,12 +372,14 @@ class ExternalReference:
 
         :param id: the External Reference id
         :param input: the input of the field
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return The updated External Reference object
     """
 
     def update_field(self, **kwargs):
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             self.opencti.app_logger.info("Updating External-Reference", {"id": id})
             query = """
@@ -340,9 +391,10 @@ class ExternalReference:
                         }
                     }
                 """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(query, {"id": id, "input": input})
-            return self.opencti.process_multiple_fields(
-                result["data"]["externalReferenceEdit"]["fieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["externalReferenceEdit"]["fieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
@@ -513,6 +513,43 @@ class Feedback:
                 result["data"]["feedbacks"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Feedbacks
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Feedbacks
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Feedbacks with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query FeedbacksCount($filters: FilterGroup, $search: String) {
+                feedbacks(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["feedbacks"]["pageInfo"]["globalCount"]
+
     """
         Read a Feedback object
 
@@ -629,6 +666,7 @@ class Feedback:
         Create a Feedback object
 
         :param name: the name of the Feedback
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Feedback object
     """
 
@@ -651,6 +689,7 @@ class Feedback:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Feedback", {"name": name})
@@ -664,6 +703,7 @@ class Feedback:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -689,14 +729,29 @@ class Feedback:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["feedbackAdd"])
+            return self.opencti.process_returning(
+                result["data"]["feedbackAdd"], returning
+            )
         else:
             self.opencti.app_logger.error("[opencti_feedback] Missing parameters: name")
 
+    def create_many(self, items, **kwargs):
+        """Create many Feedback objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     def update_field(self, **kwargs):
         self.opencti.app_logger.info("Updating Feedback", {"data": json.dumps(kwargs)})
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             query = """
                         mutation FeedbackEdit($id: ID!, $input: [EditInput]!) {
@@ -711,9 +766,10 @@ class Feedback:
                            }
                         }
                     """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(query, {"id": id, "input": input})
-            return self.opencti.process_multiple_fields(
-                result["data"]["stixDomainObjectEdit"]["fieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["stixDomainObjectEdit"]["fieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
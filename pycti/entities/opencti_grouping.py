@@ -500,6 +500,43 @@ class Grouping:
                 result["data"]["groupings"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Groupings
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Groupings
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Groupings with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query GroupingsCount($filters: FilterGroup, $search: String) {
+                groupings(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["groupings"]["pageInfo"]["globalCount"]
+
     """
         Read a Grouping object
 
@@ -610,6 +647,7 @@ class Grouping:
         Create a Grouping object
 
         :param name: the name of the Grouping
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Grouping object
     """
 
@@ -633,6 +671,7 @@ class Grouping:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None and context is not None:
             self.opencti.app_logger.info("Creating Grouping", {"name": name})
@@ -646,6 +685,7 @@ class Grouping:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -672,12 +712,26 @@ class Grouping:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["groupingAdd"])
+            return self.opencti.process_returning(
+                result["data"]["groupingAdd"], returning
+            )
         else:
             self.opencti.app_logger.error(
                 "[opencti_grouping] Missing parameters: name and description and context"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Grouping objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Add a Stix-Entity object to Grouping object (object_refs)
 
@@ -328,6 +328,46 @@ class Identity:
                 result["data"]["identities"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Identities
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list types: (optional) the entity types to count
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Identities
+        :rtype: int
+        """
+
+        types = kwargs.get("types", None)
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Identities with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query IdentitiesCount($types: [String], $filters: FilterGroup, $search: String) {
+                identities(types: $types, filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "types": types,
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["identities"]["pageInfo"]["globalCount"]
+
     """
         Read a Identity object
 
@@ -376,6 +416,7 @@ class Identity:
         Create a Identity object
 
         :param name: the name of the Identity
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Identity object
     """
 
@@ -404,6 +445,7 @@ class Identity:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if type is not None and name is not None:
             self.opencti.app_logger.info("Creating Identity", {"name": name})
@@ -488,20 +530,33 @@ class Identity:
                 """
                 input_variables["type"] = type
                 result_data_field = "identityAdd"
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
                     "input": input_variables,
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"][result_data_field]
+            return self.opencti.process_returning(
+                result["data"][result_data_field], returning
             )
         else:
             self.opencti.app_logger.error(
                 "Missing parameters: type, name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Identity objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Identity object from a STIX2 object
 
@@ -319,6 +319,43 @@ class Incident:
                 result["data"]["incidents"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Incidents
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Incidents
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Incidents with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query IncidentsCount($filters: FilterGroup, $search: String) {
+                incidents(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["incidents"]["pageInfo"]["globalCount"]
+
     """
         Read a Incident object
 
@@ -367,6 +404,7 @@ class Incident:
         Create a Incident object
 
         :param name: the name of the Incident
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Incident object
     """
 
@@ -394,6 +432,7 @@ class Incident:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Incident", {"name": name})
@@ -407,6 +446,7 @@ class Incident:
                     }
                }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -437,10 +477,24 @@ class Incident:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["incidentAdd"])
+            return self.opencti.process_returning(
+                result["data"]["incidentAdd"], returning
+            )
         else:
             self.opencti.app_logger.error("Missing parameters: name and description")
 
+    def create_many(self, items, **kwargs):
+        """Create many Incident objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import a Incident object from a STIX2 object
 
@@ -132,6 +132,43 @@ class Indicator:
                 result["data"]["indicators"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Indicators
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Indicators
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Indicators with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query IndicatorsCount($filters: FilterGroup, $search: String) {
+                indicators(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["indicators"]["pageInfo"]["globalCount"]
+
     def read(self, **kwargs):
         """Read an Indicator object
 
@@ -225,6 +262,7 @@ class Indicator:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if (
             name is not None
@@ -254,6 +292,7 @@ class Indicator:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -289,13 +328,27 @@ class Indicator:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["indicatorAdd"])
+            return self.opencti.process_returning(
+                result["data"]["indicatorAdd"], returning
+            )
         else:
             self.opencti.app_logger.error(
                 "[opencti_indicator] Missing parameters: "
                 "name or pattern or pattern_type or x_opencti_main_observable_type"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Indicator objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     def add_stix_cyber_observable(self, **kwargs):
         """
         Add a Stix-Cyber-Observable object to Indicator object (based-on)
@@ -342,6 +342,43 @@ class Infrastructure:
                 result["data"]["infrastructures"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Infrastructures
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Infrastructures
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Infrastructures with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query InfrastructuresCount($filters: FilterGroup, $search: String) {
+                infrastructures(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["infrastructures"]["pageInfo"]["globalCount"]
+
     def read(self, **kwargs):
         """Read an Infrastructure object
 
@@ -397,6 +434,7 @@ class Infrastructure:
         Create a Infrastructure object
 
         :param name: the name of the Infrastructure
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Infrastructure object
     """
 
@@ -422,6 +460,7 @@ class Infrastructure:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Infrastructure", {"name": name})
@@ -435,6 +474,7 @@ class Infrastructure:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -463,8 +503,8 @@ class Infrastructure:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["infrastructureAdd"]
+            return self.opencti.process_returning(
+                result["data"]["infrastructureAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
@@ -472,6 +512,18 @@ class Infrastructure:
                 "name and infrastructure_pattern and main_observable_type"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Infrastructure objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Infrastructure object from a STIX2 object
 
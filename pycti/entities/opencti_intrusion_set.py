@@ -314,6 +314,43 @@ class IntrusionSet:
                 result["data"]["intrusionSets"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Intrusion-Sets
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Intrusion-Sets
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Intrusion-Sets with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query IntrusionSetsCount($filters: FilterGroup, $search: String) {
+                intrusionSets(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["intrusionSets"]["pageInfo"]["globalCount"]
+
     """
         Read a Intrusion-Set object
 
@@ -362,6 +399,7 @@ class IntrusionSet:
         Create a Intrusion-Set object
 
         :param name: the name of the Intrusion Set
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Intrusion-Set object
     """
 
@@ -389,6 +427,7 @@ class IntrusionSet:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Intrusion-Set", {"name": name})
@@ -402,6 +441,7 @@ class IntrusionSet:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -432,14 +472,26 @@ class IntrusionSet:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["intrusionSetAdd"]
+            return self.opencti.process_returning(
+                result["data"]["intrusionSetAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_intrusion_set] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many IntrusionSet objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Intrusion-Set object from a STIX2 object
 
@@ -94,6 +94,40 @@ class KillChainPhase:
             result["data"]["killChainPhases"], with_pagination
         )
 
+    def count(self, **kwargs):
+        """Count Kill-Chain-Phase
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+
+        :return: number of matching Kill-Chain-Phase
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+
+        self.opencti.app_logger.info(
+            "Counting Kill-Chain-Phase with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query KillChainPhasesCount($filters: FilterGroup) {
+                killChainPhases(filters: $filters, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+            },
+        )
+        return result["data"]["killChainPhases"]["pageInfo"]["globalCount"]
+
     """
         Read a Kill-Chain-Phase object
 
@@ -138,6 +172,7 @@ class KillChainPhase:
         Create a Kill-Chain-Phase object
 
         :param name: the name of the Kill-Chain-Phase
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Kill-Chain-Phase object
     """
 
@@ -149,6 +184,7 @@ class KillChainPhase:
         phase_name = kwargs.get("phase_name", None)
         x_opencti_order = kwargs.get("x_opencti_order", 0)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if kill_chain_name is not None and phase_name is not None:
             self.opencti.app_logger.info(
@@ -165,6 +201,7 @@ class KillChainPhase:
                 }
             """
             )
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -179,25 +216,39 @@ class KillChainPhase:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["killChainPhaseAdd"]
+            return self.opencti.process_returning(
+                result["data"]["killChainPhaseAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_kill_chain_phase] Missing parameters: kill_chain_name and phase_name",
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many KillChainPhase objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Update a Kill chain object field
 
         :param id: the Kill chain id
         :param input: the input of the field
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return The updated Kill chain object
     """
 
     def update_field(self, **kwargs):
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             self.opencti.app_logger.info("Updating Kill chain", {"id": id})
             query = """
@@ -211,6 +262,7 @@ class KillChainPhase:
                         }
                     }
                 """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -218,8 +270,8 @@ class KillChainPhase:
                     "input": input,
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["killChainPhaseEdit"]["fieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["killChainPhaseEdit"]["fieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
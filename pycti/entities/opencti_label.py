@@ -109,6 +109,43 @@ class Label:
                 result["data"]["labels"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Labels
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Labels
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Labels with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query LabelsCount($filters: FilterGroup, $search: String) {
+                labels(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["labels"]["pageInfo"]["globalCount"]
+
     """
         Read a Label object
 
@@ -152,6 +189,7 @@ class Label:
 
         :param value: the value
         :param color: the color
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return label object
     """
 
@@ -161,6 +199,7 @@ class Label:
         color = kwargs.get("color", None)
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if value is not None:
             self.opencti.app_logger.info("Creating Label", {"value": value})
@@ -175,6 +214,7 @@ class Label:
                 }
             """
             )
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -187,10 +227,22 @@ class Label:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["labelAdd"])
+            return self.opencti.process_returning(result["data"]["labelAdd"], returning)
         else:
             self.opencti.app_logger.error("[opencti_label] Missing parameters: value")
 
+    def create_many(self, items, **kwargs):
+        """Create many Label objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Read or create a Label
         If the user has no rights to create the label, return None
@@ -218,12 +270,14 @@ class Label:
 
         :param id: the Label id
         :param input: the input of the field
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return The updated Label object
     """
 
     def update_field(self, **kwargs):
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             self.opencti.app_logger.info("Updating Label", {"id": id})
             query = """
@@ -237,6 +291,7 @@ class Label:
                         }
                     }
                 """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -244,8 +299,8 @@ class Label:
                     "input": input,
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["labelEdit"]["fieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["labelEdit"]["fieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
@@ -318,6 +318,43 @@ class Language:
                 result["data"]["languages"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Languages
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Languages
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Languages with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query LanguagesCount($filters: FilterGroup, $search: String) {
+                languages(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["languages"]["pageInfo"]["globalCount"]
+
     """
         Read a Language object
 
@@ -366,6 +403,7 @@ class Language:
         Create a Language object
 
         :param name: the name of the Language
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Language object
     """
 
@@ -384,6 +422,7 @@ class Language:
         aliases = kwargs.get("aliases", None)
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Language", {"name": name})
@@ -397,6 +436,7 @@ class Language:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -418,10 +458,24 @@ class Language:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["languageAdd"])
+            return self.opencti.process_returning(
+                result["data"]["languageAdd"], returning
+            )
         else:
             self.opencti.app_logger.error("[opencti_language] Missing parameters: name")
 
+    def create_many(self, items, **kwargs):
+        """Create many Language objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Language object from a STIX2 object
 
@@ -308,6 +308,46 @@ class Location:
             result["data"]["locations"], with_pagination
         )
 
+    def count(self, **kwargs):
+        """Count Locations
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list types: (optional) the entity types to count
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Locations
+        :rtype: int
+        """
+
+        types = kwargs.get("types", None)
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Locations with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query LocationsCount($types: [String], $filters: FilterGroup, $search: String) {
+                locations(types: $types, filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "types": types,
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["locations"]["pageInfo"]["globalCount"]
+
     """
         Read a Location object
 
@@ -356,6 +396,7 @@ class Location:
         Create a Location object
 
         :param name: the name of the Location
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Location object
     """
 
@@ -380,6 +421,7 @@ class Location:
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Location", {"name": name})
@@ -393,6 +435,7 @@ class Location:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -420,10 +463,24 @@ class Location:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["locationAdd"])
+            return self.opencti.process_returning(
+                result["data"]["locationAdd"], returning
+            )
         else:
             self.opencti.app_logger.error("Missing parameters: name")
 
+    def create_many(self, items, **kwargs):
+        """Create many Location objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Location object from a STIX2 object
 
@@ -345,6 +345,43 @@ class Malware:
                 result["data"]["malwares"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Malwares
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Malwares
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Malwares with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query MalwaresCount($filters: FilterGroup, $search: String) {
+                malwares(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["malwares"]["pageInfo"]["globalCount"]
+
     """
         Read a Malware object
 
@@ -393,6 +430,7 @@ class Malware:
         Create a Malware object
 
         :param name: the name of the Malware
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Malware object
     """
 
@@ -423,6 +461,7 @@ class Malware:
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         samples = kwargs.get("samples", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Malware", {"name": name})
@@ -436,6 +475,7 @@ class Malware:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -469,12 +509,26 @@ class Malware:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["malwareAdd"])
+            return self.opencti.process_returning(
+                result["data"]["malwareAdd"], returning
+            )
         else:
             self.opencti.app_logger.error(
                 "[opencti_malware] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Malware objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Malware object from a STIX2 object
 
@@ -327,6 +327,43 @@ class MalwareAnalysis:
                 result["data"]["malwareAnalyses"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Malware analyses
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Malware analyses
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Malware analyses with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query MalwareAnalysesCount($filters: FilterGroup, $search: String) {
+                malwareAnalyses(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["malwareAnalyses"]["pageInfo"]["globalCount"]
+
     """
         Read a Malware analysis object
 
@@ -377,6 +414,7 @@ class MalwareAnalysis:
         Create a Malware analysis object
 
         :param name: the name of the Malware analysis
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Malware analysis object
     """
 
@@ -411,6 +449,7 @@ class MalwareAnalysis:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if product is not None and result_name is not None:
             self.opencti.app_logger.info(
@@ -426,6 +465,7 @@ class MalwareAnalysis:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -463,14 +503,26 @@ class MalwareAnalysis:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["malwareAnalysisAdd"]
+            return self.opencti.process_returning(
+                result["data"]["malwareAnalysisAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_malwareAnalysis] Missing parameters: product and result_name"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many MalwareAnalysis objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Malware analysis object from a STIX2 object
 
@@ -97,6 +97,41 @@ class MarkingDefinition:
             result["data"]["markingDefinitions"], with_pagination
         )
 
+    def count(self, **kwargs):
+        """Count Marking-Definitions
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+
+        :return: number of matching Marking-Definitions
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+
+        self.opencti.app_logger.info(
+            "Counting Marking-Definitions with filters",
+            {"filters": json.dumps(filters)},
+        )
+        query = """
+            query MarkingDefinitionsCount($filters: FilterGroup) {
+                markingDefinitions(filters: $filters, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+            },
+        )
+        return result["data"]["markingDefinitions"]["pageInfo"]["globalCount"]
+
     """
         Read a Marking-Definition object
 
@@ -142,6 +177,7 @@ class MarkingDefinition:
 
         :param definition_type: the definition_type
         :param definition: the definition
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Marking-Definition object
     """
 
@@ -155,6 +191,7 @@ class MarkingDefinition:
         x_opencti_color = kwargs.get("x_opencti_color", None)
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if definition is not None and definition_type is not None:
             query = (
@@ -168,6 +205,7 @@ class MarkingDefinition:
                 }
             """
             )
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -184,25 +222,39 @@ class MarkingDefinition:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["markingDefinitionAdd"]
+            return self.opencti.process_returning(
+                result["data"]["markingDefinitionAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_marking_definition] Missing parameters: definition and definition_type",
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many MarkingDefinition objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Update a Marking definition object field
 
         :param id: the Marking definition id
         :param input: the input of the field
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return The updated Marking definition object
     """
 
     def update_field(self, **kwargs):
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             self.opencti.app_logger.info("Updating Marking Definition", {"id": id})
             query = """
@@ -216,6 +268,7 @@ class MarkingDefinition:
                         }
                     }
                 """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -223,8 +276,8 @@ class MarkingDefinition:
                     "input": input,
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["markingDefinitionEdit"]["fieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["markingDefinitionEdit"]["fieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
@@ -296,6 +296,43 @@ class Narrative:
                 result["data"]["narratives"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Narratives
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Narratives
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Narratives with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query NarrativesCount($filters: FilterGroup, $search: String) {
+                narratives(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["narratives"]["pageInfo"]["globalCount"]
+
     """
         Read a Narrative object
 
@@ -344,6 +381,7 @@ class Narrative:
         Create a Narrative object
 
         :param name: the name of the Narrative
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Narrative object
     """
 
@@ -366,6 +404,7 @@ class Narrative:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Narrative", {"name": name})
@@ -379,6 +418,7 @@ class Narrative:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -404,12 +444,26 @@ class Narrative:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["narrativeAdd"])
+            return self.opencti.process_returning(
+                result["data"]["narrativeAdd"], returning
+            )
         else:
             self.opencti.app_logger.error(
                 "[opencti_narrative] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Narrative objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Narrative object from a STIX2 object
 
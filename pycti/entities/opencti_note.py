@@ -542,6 +542,43 @@ class Note:
                 result["data"]["notes"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Notes
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Notes
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Notes with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query NotesCount($filters: FilterGroup, $search: String) {
+                notes(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["notes"]["pageInfo"]["globalCount"]
+
     """
         Read a Note object
 
@@ -622,6 +659,7 @@ class Note:
         Create a Note object
 
         :param name: the name of the Note
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Note object
     """
 
@@ -646,6 +684,7 @@ class Note:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if content is not None:
             self.opencti.app_logger.info("Creating Note", {"content": content})
@@ -659,6 +698,7 @@ class Note:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -686,10 +726,22 @@ class Note:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["noteAdd"])
+            return self.opencti.process_returning(result["data"]["noteAdd"], returning)
         else:
             self.opencti.app_logger.error("[opencti_note] Missing parameters: content")
 
+    def create_many(self, items, **kwargs):
+        """Create many Note objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Add a Stix-Entity object to Note object (object_refs)
 
@@ -511,6 +511,43 @@ class ObservedData:
             result["data"]["observedDatas"], with_pagination
         )
 
+    def count(self, **kwargs):
+        """Count ObservedDatas
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching ObservedDatas
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting ObservedDatas with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query ObservedDatasCount($filters: FilterGroup, $search: String) {
+                observedDatas(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["observedDatas"]["pageInfo"]["globalCount"]
+
     """
         Read a ObservedData object
 
@@ -591,6 +628,7 @@ class ObservedData:
         Create a ObservedData object
 
         :param name: the name of the ObservedData
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return ObservedData object
     """
 
@@ -613,6 +651,7 @@ class ObservedData:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if (
             first_observed is not None
@@ -630,6 +669,7 @@ class ObservedData:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -655,8 +695,8 @@ class ObservedData:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["observedDataAdd"]
+            return self.opencti.process_returning(
+                result["data"]["observedDataAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
@@ -664,6 +704,18 @@ class ObservedData:
                 "first_observed, last_observed or objects"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many ObservedData objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Add a Stix-Core-Object or stix_relationship to ObservedData object (object)
 
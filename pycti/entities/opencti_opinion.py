@@ -315,6 +315,43 @@ class Opinion:
                 result["data"]["opinions"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Opinions
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Opinions
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Opinions with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query OpinionsCount($filters: FilterGroup, $search: String) {
+                opinions(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["opinions"]["pageInfo"]["globalCount"]
+
     """
         Read a Opinion object
 
@@ -394,6 +431,7 @@ class Opinion:
         Create a Opinion object
 
         :param name: the name of the Opinion
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Opinion object
     """
 
@@ -415,6 +453,7 @@ class Opinion:
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         granted_refs = kwargs.get("objectOrganization", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if opinion is not None:
             self.opencti.app_logger.info("Creating Opinion", {"opinion": opinion})
@@ -428,6 +467,7 @@ class Opinion:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -452,12 +492,26 @@ class Opinion:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["opinionAdd"])
+            return self.opencti.process_returning(
+                result["data"]["opinionAdd"], returning
+            )
         else:
             self.opencti.app_logger.error(
                 "[opencti_opinion] Missing parameters: content"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Opinion objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Add a Stix-Entity object to Opinion object (object_refs)
 
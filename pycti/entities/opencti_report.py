@@ -574,6 +574,43 @@ class Report:
                 result["data"]["reports"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Reports
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Reports
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Reports with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query ReportsCount($filters: FilterGroup, $search: String) {
+                reports(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["reports"]["pageInfo"]["globalCount"]
+
     """
         Read a Report object
 
@@ -690,6 +727,7 @@ class Report:
         Create a Report object
 
         :param name: the name of the Report
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Report object
     """
 
@@ -717,6 +755,7 @@ class Report:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None and published is not None:
             self.opencti.app_logger.info("Creating Report", {"name": name})
@@ -730,6 +769,7 @@ class Report:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -760,13 +800,27 @@ class Report:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["reportAdd"])
+            return self.opencti.process_returning(
+                result["data"]["reportAdd"], returning
+            )
         else:
             self.opencti.app_logger.error(
                 "[opencti_report] "
                 "Missing parameters: name and description and published and report_class"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Report objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Add a Stix-Entity object to Report object (object_refs)
 
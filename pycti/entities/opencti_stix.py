@@ -67,3 +67,81 @@ class Stix:
                 "[opencti_stix] Missing parameters: id and object_ids"
             )
             return None
+
+    """
+        Delete many Stix elements with aliased multi-mutation requests
+
+        :param ids: the Stix elements ids
+        :param chunk_size: (optional) number of deletions per request
+        :param max_workers: (optional) number of concurrent requests
+        :return list of `{"id": ..., "error": ...}` in the ids order
+    """
+
+    def delete_many(self, **kwargs):
+        ids = kwargs.get("ids", None) or []
+        chunk_size = kwargs.get("chunk_size", 100)
+        max_workers = kwargs.get("max_workers", 1)
+        outcomes = [{"id": id, "error": self.invalid_operation_error()} for id in ids]
+        indexes = []
+        operations = []
+        for index, id in enumerate(ids):
+            with self.opencti.capture_queries() as captured:
+                self.delete(id=id)
+            if len(captured) == 1:
+                indexes.append(index)
+                operations.extend(captured)
+        results = self.opencti.query_many(
+            operations, chunk_size=chunk_size, max_workers=max_workers
+        )
+        for index, result in zip(indexes, results):
+            outcomes[index]["error"] = result["error"]
+        return outcomes
+
+    """
+        Merge many Stix-Object objects with aliased multi-mutation requests
+
+        :param merges: list of `(target_id, source_ids)` tuples
+        :param chunk_size: (optional) number of merges per request
+        :param max_workers: (optional) number of concurrent requests
+        :return list of `{"id": ..., "object_ids": ..., "result": ..., "error": ...}`
+    """
+
+    def merge_many(self, **kwargs):
+        merges = kwargs.get("merges", None) or []
+        chunk_size = kwargs.get("chunk_size", 100)
+        max_workers = kwargs.get("max_workers", 1)
+        outcomes = [
+            {
+                "id": id,
+                "object_ids": object_ids,
+                "result": None,
+                "error": self.invalid_operation_error(),
+            }
+            for id, object_ids in merges
+        ]
+        indexes = []
+        operations = []
+        for index, (id, object_ids) in enumerate(merges):
+            with self.opencti.capture_queries() as captured:
+                self.merge(id=id, object_ids=object_ids)
+            if len(captured) == 1:
+                indexes.append(index)
+                operations.extend(captured)
+        results = self.opencti.query_many(
+            operations, chunk_size=chunk_size, max_workers=max_workers
+        )
+        for index, result in zip(indexes, results):
+            outcomes[index]["error"] = result["error"]
+            if result["error"] is None:
+                outcomes[index]["result"] = self.opencti.process_multiple_fields(
+                    result["data"]["merge"]
+                )
+        return outcomes
+
+    @staticmethod
+    def invalid_operation_error():
+        # Entries with missing parameters do not build any mutation
+        return {
+            "name": "Invalid item",
+            "error_message": "Item does not build a single mutation",
+        }
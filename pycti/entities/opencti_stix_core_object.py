@@ -1,6 +1,8 @@
 # coding: utf-8
 import json
 
+from pycti.utils.constants import DistributionFields
+
 
 class StixCoreObject:
     def __init__(self, opencti, file):
@@ -1414,6 +1416,108 @@ class StixCoreObject:
                 result["data"]["stixCoreObjects"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Stix-Core-Objects
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list types: (optional) the entity types to count
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Stix-Core-Objects
+        :rtype: int
+        """
+
+        types = kwargs.get("types", None)
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Stix-Core-Objects with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query StixCoreObjectsCount($types: [String], $filters: FilterGroup, $search: String) {
+                stixCoreObjects(types: $types, filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "types": types,
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["stixCoreObjects"]["pageInfo"]["globalCount"]
+
+    def count_by(self, **kwargs):
+        """Count Stix-Core-Objects grouped by a field
+
+        No entity is fetched, the platform computes the distribution of the
+        matching rows. The count_by method accepts the following kwargs:
+
+        :param str field: the field to group on, either a raw platform field or a
+                          :py:class:`~pycti.utils.constants.DistributionFields`
+                          (defaults to the entity type)
+        :param list types: (optional) the entity types to count
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+        :param int limit: (optional) the maximum number of groups to return
+
+        :return: list of groups as `{"label": ..., "value": ...}` dicts
+        :rtype: list
+        """
+
+        field = kwargs.get("field", DistributionFields.ENTITY_TYPE)
+        types = kwargs.get("types", None)
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+        limit = kwargs.get("limit", 50)
+        if isinstance(field, DistributionFields):
+            field = field.value
+
+        self.opencti.app_logger.info(
+            "Counting Stix-Core-Objects by field",
+            {"field": field, "filters": json.dumps(filters)},
+        )
+        query = """
+            query StixCoreObjectsDistribution($field: String!, $types: [String], $filters: FilterGroup, $search: String, $limit: Int) {
+                stixCoreObjectsDistribution(field: $field, operation: count, types: $types, filters: $filters, search: $search, limit: $limit) {
+                    label
+                    value
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "field": field,
+                "types": types,
+                "filters": filters,
+                "search": search,
+                "limit": limit,
+            },
+        )
+        return result["data"]["stixCoreObjectsDistribution"] or []
+
+    def iter_changed(self, **kwargs):
+        """Iterate over the Stix-Core-Objects changed since a high-water mark
+
+        See :py:meth:`~pycti.api.opencti_api_client.OpenCTIApiClient.iter_changed`
+        for the `since`, `watermark`, `lookback`, `filters` and `first` kwargs,
+        any other kwarg is forwarded to `list`.
+
+        :return: generator of Stix-Core-Objects, returning the final watermark
+        :rtype: Generator
+        """
+        return self.opencti.iter_changed(self.list, **kwargs)
+
     """
             Read a Stix-Core-Object object
 
@@ -3,7 +3,8 @@
 import datetime
 import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.constants import DistributionFields
+from pycti.utils.opencti_stix2_identifier import canonicalize_data
 
 
 class StixCoreRelationship:
@@ -358,7 +359,7 @@ class StixCoreRelationship:
                 "source_ref": source_ref,
                 "target_ref": target_ref,
             }
-        data = canonicalize(data, utf8=False)
+        data = canonicalize_data(data)
         id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
         return "relationship--" + id
 
@@ -510,6 +511,127 @@ class StixCoreRelationship:
                 result["data"]["stixCoreRelationships"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Stix-Core-Relationships
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param str fromOrToId: (optional) the id of the source or target entity
+        :param list elementWithTargetTypes: (optional) the types of the opposite entity
+        :param str fromId: (optional) the id of the source entity
+        :param list fromTypes: (optional) the types of the source entity
+        :param str toId: (optional) the id of the target entity
+        :param list toTypes: (optional) the types of the target entity
+        :param list relationship_type: (optional) the relationship types
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Stix-Core-Relationships
+        :rtype: int
+        """
+
+        from_or_to_id = kwargs.get("fromOrToId", None)
+        element_with_target_types = kwargs.get("elementWithTargetTypes", None)
+        from_id = kwargs.get("fromId", None)
+        from_types = kwargs.get("fromTypes", None)
+        to_id = kwargs.get("toId", None)
+        to_types = kwargs.get("toTypes", None)
+        relationship_type = kwargs.get("relationship_type", None)
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info("Counting Stix-Core-Relationships")
+        query = """
+            query StixCoreRelationshipsCount($fromOrToId: [String], $elementWithTargetTypes: [String], $fromId: [String], $fromTypes: [String], $toId: [String], $toTypes: [String], $relationship_type: [String], $filters: FilterGroup, $search: String) {
+                stixCoreRelationships(fromOrToId: $fromOrToId, elementWithTargetTypes: $elementWithTargetTypes, fromId: $fromId, fromTypes: $fromTypes, toId: $toId, toTypes: $toTypes, relationship_type: $relationship_type, filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "fromOrToId": from_or_to_id,
+                "elementWithTargetTypes": element_with_target_types,
+                "fromId": from_id,
+                "fromTypes": from_types,
+                "toId": to_id,
+                "toTypes": to_types,
+                "relationship_type": relationship_type,
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["stixCoreRelationships"]["pageInfo"]["globalCount"]
+
+    def count_by(self, **kwargs):
+        """Count Stix-Core-Relationships grouped by a field
+
+        No relationship is fetched, the platform computes the distribution of
+        the matching rows. The count_by method accepts the following kwargs:
+
+        :param str field: the field to group on, either a raw platform field or a
+                          :py:class:`~pycti.utils.constants.DistributionFields`
+                          (defaults to the entity type)
+        :param str fromOrToId: (optional) the id of the source or target entity
+        :param list relationship_type: (optional) the relationship types
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+        :param int limit: (optional) the maximum number of groups to return
+
+        :return: list of groups as `{"label": ..., "value": ...}` dicts
+        :rtype: list
+        """
+
+        field = kwargs.get("field", DistributionFields.ENTITY_TYPE)
+        from_or_to_id = kwargs.get("fromOrToId", None)
+        relationship_type = kwargs.get("relationship_type", None)
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+        limit = kwargs.get("limit", 50)
+        if isinstance(field, DistributionFields):
+            field = field.value
+
+        self.opencti.app_logger.info(
+            "Counting Stix-Core-Relationships by field",
+            {"field": field, "relationship_type": relationship_type},
+        )
+        query = """
+            query StixCoreRelationshipsDistribution($field: String!, $fromOrToId: [String], $relationship_type: [String], $filters: FilterGroup, $search: String, $limit: Int) {
+                stixCoreRelationshipsDistribution(field: $field, operation: count, fromOrToId: $fromOrToId, relationship_type: $relationship_type, filters: $filters, search: $search, limit: $limit) {
+                    label
+                    value
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "field": field,
+                "fromOrToId": from_or_to_id,
+                "relationship_type": relationship_type,
+                "filters": filters,
+                "search": search,
+                "limit": limit,
+            },
+        )
+        return result["data"]["stixCoreRelationshipsDistribution"] or []
+
+    def iter_changed(self, **kwargs):
+        """Iterate over the Stix-Core-Relationships changed since a high-water mark
+
+        See :py:meth:`~pycti.api.opencti_api_client.OpenCTIApiClient.iter_changed`
+        for the `since`, `watermark`, `lookback`, `filters` and `first` kwargs,
+        any other kwarg is forwarded to `list`.
+
+        :return: generator of Stix-Core-Relationships, returning the final watermark
+        :rtype: Generator
+        """
+        return self.opencti.iter_changed(self.list, **kwargs)
+
     """
         Read a stix_core_relationship object
 
@@ -587,6 +709,7 @@ class StixCoreRelationship:
         Create a stix_core_relationship object
 
         :param name: the name of the Attack Pattern
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return stix_core_relationship object
     """
 
@@ -611,6 +734,7 @@ class StixCoreRelationship:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         self.opencti.app_logger.info(
             "Creating stix_core_relationship",
@@ -630,6 +754,7 @@ class StixCoreRelationship:
                     }
                 }
             """
+        query = self.opencti.returning_query(query, returning)
         result = self.opencti.query(
             query,
             {
@@ -657,21 +782,35 @@ class StixCoreRelationship:
                 }
             },
         )
-        return self.opencti.process_multiple_fields(
-            result["data"]["stixCoreRelationshipAdd"]
+        return self.opencti.process_returning(
+            result["data"]["stixCoreRelationshipAdd"], returning
         )
 
+    def create_many(self, items, **kwargs):
+        """Create many StixCoreRelationship objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Update a stix_core_relationship object field
 
         :param id: the stix_core_relationship id
         :param input: the input of the field
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return The updated stix_core_relationship object
     """
 
     def update_field(self, **kwargs):
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             self.opencti.app_logger.info("Updating stix_core_relationship", {"id": id})
             query = """
@@ -685,6 +824,7 @@ class StixCoreRelationship:
                         }
                     }
                 """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -692,8 +832,8 @@ class StixCoreRelationship:
                     "input": input,
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["stixCoreRelationshipEdit"]["fieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["stixCoreRelationshipEdit"]["fieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
@@ -726,67 +866,82 @@ class StixCoreRelationship:
             )
             return None
 
+    """
+        Add and remove many ref relations of a stix_core_relationship in few requests
+
+        :param id: the id of the stix_core_relationship
+        :param add: list of `{"toId": ..., "relationship_type": ...}` to add
+        :param remove: list of `{"toId": ..., "relationship_type": ...}` to remove
+        :param chunk_size: number of operations per request
+        :return: Boolean
+    """
+
+    def edit_relations(self, **kwargs):
+        return self.opencti.edit_relations("stixCoreRelationshipEdit", **kwargs)
+
     """
         Add a Marking-Definition object to stix_core_relationship object (object_marking_refs)
 
         :param id: the id of the stix_core_relationship
         :param marking_definition_id: the id of the Marking-Definition
+        :param check_existing: read the entity to skip an existing ref, defaults to True
         :return Boolean
     """
 
     def add_marking_definition(self, **kwargs):
         id = kwargs.get("id", None)
         marking_definition_id = kwargs.get("marking_definition_id", None)
+        check_existing = kwargs.get("check_existing", True)
         if id is not None and marking_definition_id is not None:
-            custom_attributes = """
-                id
-                objectMarking {
+            if check_existing:
+                custom_attributes = """
                     id
-                    standard_id
-                    entity_type
-                    definition_type
-                    definition
-                    x_opencti_order
-                    x_opencti_color
-                    created
-                    modified
-                }
-            """
-            stix_core_relationship = self.read(
-                id=id, customAttributes=custom_attributes
-            )
-            if stix_core_relationship is None:
-                self.opencti.app_logger.error(
-                    "Cannot add Marking-Definition, entity not found"
-                )
-                return False
-            if marking_definition_id in stix_core_relationship["objectMarkingIds"]:
-                return True
-            else:
-                self.opencti.app_logger.info(
-                    "Adding Marking-Definition to Stix-Domain-Object",
-                    {"id": id, "marking_definition_id": marking_definition_id},
+                    objectMarking {
+                        id
+                        standard_id
+                        entity_type
+                        definition_type
+                        definition
+                        x_opencti_order
+                        x_opencti_color
+                        created
+                        modified
+                    }
+                """
+                stix_core_relationship = self.read(
+                    id=id, customAttributes=custom_attributes
                 )
-                query = """
-                   mutation StixCoreRelationshipAddRelation($id: ID!, $input: StixRefRelationshipAddInput!) {
-                       stixCoreRelationshipEdit(id: $id) {
-                            relationAdd(input: $input) {
-                                id
-                            }
-                       }
+                if stix_core_relationship is None:
+                    self.opencti.app_logger.error(
+                        "Cannot add Marking-Definition, entity not found"
+                    )
+                    return False
+                if marking_definition_id in stix_core_relationship["objectMarkingIds"]:
+                    return True
+            self.opencti.app_logger.info(
+                "Adding Marking-Definition to Stix-Domain-Object",
+                {"id": id, "marking_definition_id": marking_definition_id},
+            )
+            query = """
+               mutation StixCoreRelationshipAddRelation($id: ID!, $input: StixRefRelationshipAddInput!) {
+                   stixCoreRelationshipEdit(id: $id) {
+                        relationAdd(input: $input) {
+                            id
+                        }
                    }
-                """
-                self.opencti.query(
-                    query,
-                    {
-                        "id": id,
-                        "input": {
-                            "toId": marking_definition_id,
-                            "relationship_type": "object-marking",
-                        },
+               }
+            """
+            self.opencti.query(
+                query,
+                {
+                    "id": id,
+                    "input": {
+                        "toId": marking_definition_id,
+                        "relationship_type": "object-marking",
                     },
-                )
-                return True
+                },
+            )
+            return True
         else:
             self.opencti.app_logger.error(
                 "Missing parameters: id and marking_definition_id"
@@ -125,6 +125,59 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
                 result["data"]["stixCyberObservables"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count StixCyberObservables
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list types: (optional) the entity types to count
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching StixCyberObservables
+        :rtype: int
+        """
+
+        types = kwargs.get("types", None)
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting StixCyberObservables with filters",
+            {"filters": json.dumps(filters)},
+        )
+        query = """
+            query StixCyberObservablesCount($types: [String], $filters: FilterGroup, $search: String) {
+                stixCyberObservables(types: $types, filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "types": types,
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["stixCyberObservables"]["pageInfo"]["globalCount"]
+
+    def iter_changed(self, **kwargs):
+        """Iterate over the Stix-Cyber-Observables changed since a high-water mark
+
+        See :py:meth:`~pycti.api.opencti_api_client.OpenCTIApiClient.iter_changed`
+        for the `since`, `watermark`, `lookback`, `filters` and `first` kwargs,
+        any other kwarg is forwarded to `list`.
+
+        :return: generator of Stix-Cyber-Observables, returning the final watermark
+        :rtype: Generator
+        """
+        return self.opencti.iter_changed(self.list, **kwargs)
+
     """
         Read a StixCyberObservable object
 
@@ -232,6 +285,7 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
         Create a Stix-Observable object
 
         :param observableData: the data of the observable (STIX2 structure)
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Stix-Observable object
     """
 
@@ -250,6 +304,7 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
         external_references = kwargs.get("externalReferences", None)
         granted_refs = kwargs.get("objectOrganization", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         create_indicator = (
             observable_data["x_opencti_create_indicator"]
@@ -1071,6 +1126,7 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
                         observable_data["value"] if "value" in observable_data else None
                     ),
                 }
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(query, input_variables)
             if "payload_bin" in observable_data and "mime_type" in observable_data:
                 self.add_file(
@@ -1084,16 +1140,29 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
                     data=base64.b64decode(observable_data["payload_bin"]),
                     mime_type=observable_data["mime_type"],
                 )
-            return self.opencti.process_multiple_fields(
-                result["data"]["stixCyberObservableAdd"]
+            return self.opencti.process_returning(
+                result["data"]["stixCyberObservableAdd"], returning
             )
         else:
             self.opencti.app_logger.error("Missing parameters: type")
 
+    def create_many(self, items, **kwargs):
+        """Create many StixCyberObservable objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Upload an artifact
 
         :param file_path: the file path
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Stix-Observable object
     """
 
@@ -1106,6 +1175,7 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
         object_marking = kwargs.get("objectMarking", None)
         object_label = kwargs.get("objectLabel", None)
         create_indicator = kwargs.get("createIndicator", False)
+        returning = kwargs.get("returning", "full")
 
         if file_name is not None and mime_type is not None:
             final_file_name = os.path.basename(file_name)
@@ -1224,6 +1294,7 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
                 else:
                     mime_type = magic.from_file(file_name, mime=True)
 
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -1234,8 +1305,8 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
                     "objectLabel": object_label,
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["artifactImport"]
+            return self.opencti.process_returning(
+                result["data"]["artifactImport"], returning
             )
         else:
             self.opencti.app_logger.error("Missing parameters: type")
@@ -1245,12 +1316,14 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
 
         :param id: the Stix-Observable id
         :param input: the input of the field
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return The updated Stix-Observable object
     """
 
     def update_field(self, **kwargs):
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             self.opencti.app_logger.info("Updating Stix-Observable", {"id": id})
             query = """
@@ -1264,6 +1337,7 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -1271,8 +1345,8 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
                     "input": input,
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["stixCyberObservableEdit"]["fieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["stixCyberObservableEdit"]["fieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
@@ -1426,64 +1500,81 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
             self.opencti.app_logger.error("Missing parameters: id")
             return False
 
+    """
+        Add and remove many ref relations of a Stix-Cyber-Observable in few requests
+
+        :param id: the id of the Stix-Cyber-Observable
+        :param add: list of `{"toId": ..., "relationship_type": ...}` to add
+        :param remove: list of `{"toId": ..., "relationship_type": ...}` to remove
+        :param chunk_size: number of operations per request
+        :return: Boolean
+    """
+
+    def edit_relations(self, **kwargs):
+        return self.opencti.edit_relations("stixCyberObservableEdit", **kwargs)
+
     """
         Add a Marking-Definition object to Stix-Cyber-Observable object (object_marking_refs)
 
         :param id: the id of the Stix-Cyber-Observable
         :param marking_definition_id: the id of the Marking-Definition
+        :param check_existing: read the entity to skip an existing ref, defaults to True
         :return Boolean
     """
 
     def add_marking_definition(self, **kwargs):
         id = kwargs.get("id", None)
         marking_definition_id = kwargs.get("marking_definition_id", None)
+        check_existing = kwargs.get("check_existing", True)
         if id is not None and marking_definition_id is not None:
-            custom_attributes = """
-                id
-                objectMarking {
-                    standard_id
-                    entity_type
-                    definition_type
-                    definition
-                    x_opencti_order
-                    x_opencti_color
-                    created
-                    modified
-                }
-            """
-            stix_cyber_observable = self.read(id=id, customAttributes=custom_attributes)
-            if stix_cyber_observable is None:
-                self.opencti.app_logger.error(
-                    "Cannot add Marking-Definition, entity not found"
-                )
-                return False
-            if marking_definition_id in stix_cyber_observable["objectMarkingIds"]:
-                return True
-            else:
-                self.opencti.app_logger.info(
-                    "Adding Marking-Definition to Stix-Cyber-Observable",
-                    {"marking_definition_id": marking_definition_id, "id": id},
+            if check_existing:
+                custom_attributes = """
+                    id
+                    objectMarking {
+                        standard_id
+                        entity_type
+                        definition_type
+                        definition
+                        x_opencti_order
+                        x_opencti_color
+                        created
+                        modified
+                    }
+                """
+                stix_cyber_observable = self.read(
+                    id=id, customAttributes=custom_attributes
                 )
-                query = """
-                   mutation StixCyberObservableAddRelation($id: ID!, $input: StixRefRelationshipAddInput!) {
-                       stixCyberObservableEdit(id: $id) {
-                            relationAdd(input: $input) {
-                                id
-                            }
-                       }
+                if stix_cyber_observable is None:
+                    self.opencti.app_logger.error(
+                        "Cannot add Marking-Definition, entity not found"
+                    )
+                    return False
+                if marking_definition_id in stix_cyber_observable["objectMarkingIds"]:
+                    return True
+            self.opencti.app_logger.info(
+                "Adding Marking-Definition to Stix-Cyber-Observable",
+                {"marking_definition_id": marking_definition_id, "id": id},
+            )
+            query = """
+               mutation StixCyberObservableAddRelation($id: ID!, $input: StixRefRelationshipAddInput!) {
+                   stixCyberObservableEdit(id: $id) {
+                        relationAdd(input: $input) {
+                            id
+                        }
                    }
-                """
-                self.opencti.query(
-                    query,
-                    {
-                        "id": id,
-                        "input": {
-                            "toId": marking_definition_id,
-                            "relationship_type": "object-marking",
-                        },
+               }
+            """
+            self.opencti.query(
+                query,
+                {
+                    "id": id,
+                    "input": {
+                        "toId": marking_definition_id,
+                        "relationship_type": "object-marking",
                     },
-                )
-                return True
+                },
+            )
+            return True
         else:
             self.opencti.app_logger.error(
                 "Missing parameters: id and marking_definition_id"
@@ -1636,65 +1727,69 @@ class StixCyberObservable(StixCyberObservableDeprecatedMixin):
 
         :param id: the id of the Stix-Cyber-Observable
         :param marking_definition_id: the id of the Marking-Definition
+        :param check_existing: read the entity to skip an existing ref, defaults to True
         :return Boolean
     """
 
     def add_external_reference(self, **kwargs):
         id = kwargs.get("id", None)
         external_reference_id = kwargs.get("external_reference_id", None)
+        check_existing = kwargs.get("check_existing", True)
         if id is not None and external_reference_id is not None:
-            custom_attributes = """
-                id
-                externalReferences {
-                    edges {
-                        node {
-                            id
-                            standard_id
-                            entity_type
-                            source_name
-                            description
-                            url
-                            hash
-                            external_id
-                            created
-                            modified
+            if check_existing:
+                custom_attributes = """
+                    id
+                    externalReferences {
+                        edges {
+                            node {
+                                id
+                                standard_id
+                                entity_type
+                                source_name
+                                description
+                                url
+                                hash
+                                external_id
+                                created
+                                modified
+                            }
                         }
                     }
-                }
-            """
-            stix_domain_object = self.read(id=id, customAttributes=custom_attributes)
-            if stix_domain_object is None:
-                self.opencti.app_logger.error(
-                    "Cannot add External-Reference, entity not found"
-                )
-                return False
-            if external_reference_id in stix_domain_object["externalReferencesIds"]:
-                return True
-            else:
-                self.opencti.app_logger.info(
-                    "Adding External-Reference to Stix-Cyber-Observable",
-                    {"external_reference_id": external_reference_id, "id": id},
+                """
+                stix_domain_object = self.read(
+                    id=id, customAttributes=custom_attributes
                 )
-                query = """
-                   mutation StixCyberObservabletEditRelationAdd($id: ID!, $input: StixRefRelationshipAddInput!) {
-                       stixCyberObservableEdit(id: $id) {
-                            relationAdd(input: $input) {
-                                id
-                            }
-                       }
+                if stix_domain_object is None:
+                    self.opencti.app_logger.error(
+                        "Cannot add External-Reference, entity not found"
+                    )
+                    return False
+                if external_reference_id in stix_domain_object["externalReferencesIds"]:
+                    return True
+            self.opencti.app_logger.info(
+                "Adding External-Reference to Stix-Cyber-Observable",
+                {"external_reference_id": external_reference_id, "id": id},
+            )
+            query = """
+               mutation StixCyberObservabletEditRelationAdd($id: ID!, $input: StixRefRelationshipAddInput!) {
+                   stixCyberObservableEdit(id: $id) {
+                        relationAdd(input: $input) {
+                            id
+                        }
                    }
-                """
-                self.opencti.query(
-                    query,
-                    {
-                        "id": id,
-                        "input": {
-                            "toId": external_reference_id,
-                            "relationship_type": "external-reference",
-                        },
+               }
+            """
+            self.opencti.query(
+                query,
+                {
+                    "id": id,
+                    "input": {
+                        "toId": external_reference_id,
+                        "relationship_type": "external-reference",
                     },
-                )
-                return True
+                },
+            )
+            return True
         else:
             self.opencti.app_logger.error(
                 "Missing parameters: id and external_reference_id"
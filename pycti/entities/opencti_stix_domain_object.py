@@ -1106,6 +1106,59 @@ class StixDomainObject:
                 result["data"]["stixDomainObjects"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Stix-Domain-Objects
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list types: (optional) the entity types to count
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Stix-Domain-Objects
+        :rtype: int
+        """
+
+        types = kwargs.get("types", None)
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Stix-Domain-Objects with filters",
+            {"filters": json.dumps(filters)},
+        )
+        query = """
+            query StixDomainObjectsCount($types: [String], $filters: FilterGroup, $search: String) {
+                stixDomainObjects(types: $types, filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "types": types,
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["stixDomainObjects"]["pageInfo"]["globalCount"]
+
+    def iter_changed(self, **kwargs):
+        """Iterate over the Stix-Domain-Objects changed since a high-water mark
+
+        See :py:meth:`~pycti.api.opencti_api_client.OpenCTIApiClient.iter_changed`
+        for the `since`, `watermark`, `lookback`, `filters` and `first` kwargs,
+        any other kwarg is forwarded to `list`.
+
+        :return: generator of Stix-Domain-Objects, returning the final watermark
+        :rtype: Generator
+        """
+        return self.opencti.iter_changed(self.list, **kwargs)
+
     """
         Read a Stix-Domain-Object object
 
@@ -1214,11 +1267,13 @@ class StixDomainObject:
 
         :param id: the Stix-Domain-Object id
         :param input: the input of the field
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
     """
 
     def update_field(self, **kwargs):
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             self.opencti.app_logger.info("Updating Stix-Domain-Object", {"id": id})
             query = """
@@ -1232,6 +1287,7 @@ class StixDomainObject:
                         }
                     }
                 """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -1239,8 +1295,8 @@ class StixDomainObject:
                     "input": input,
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["stixDomainObjectEdit"]["fieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["stixDomainObjectEdit"]["fieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
@@ -1468,65 +1524,82 @@ class StixDomainObject:
             self.opencti.app_logger.error("Missing parameters: id")
             return False
 
+    """
+        Add and remove many ref relations of a Stix-Domain-Object in few requests
+
+        :param id: the id of the Stix-Domain-Object
+        :param add: list of `{"toId": ..., "relationship_type": ...}` to add
+        :param remove: list of `{"toId": ..., "relationship_type": ...}` to remove
+        :param chunk_size: number of operations per request
+        :return: Boolean
+    """
+
+    def edit_relations(self, **kwargs):
+        return self.opencti.edit_relations("stixDomainObjectEdit", **kwargs)
+
     """
         Add a Marking-Definition object to Stix-Domain-Object object (object_marking_refs)
 
         :param id: the id of the Stix-Domain-Object
         :param marking_definition_id: the id of the Marking-Definition
+        :param check_existing: read the entity to skip an existing ref, defaults to True
         :return Boolean
     """
 
     def add_marking_definition(self, **kwargs):
         id = kwargs.get("id", None)
         marking_definition_id = kwargs.get("marking_definition_id", None)
+        check_existing = kwargs.get("check_existing", True)
         if id is not None and marking_definition_id is not None:
-            custom_attributes = """
-                id
-                objectMarking {
+            if check_existing:
+                custom_attributes = """
                     id
-                    standard_id
-                    entity_type
-                    definition_type
-                    definition
-                    x_opencti_order
-                    x_opencti_color
-                    created
-                    modified
-                }
-            """
-            stix_domain_object = self.read(id=id, customAttributes=custom_attributes)
-            if stix_domain_object is None:
-                self.opencti.app_logger.error(
-                    "Cannot add Marking-Definition, entity not found"
-                )
-                return False
-            if marking_definition_id in stix_domain_object["objectMarkingIds"]:
-                return True
-            else:
-                self.opencti.app_logger.info(
-                    "Adding Marking-Definition to Stix-Domain-Object",
-                    {"marking_definition_id": marking_definition_id, "id": id},
+                    objectMarking {
+                        id
+                        standard_id
+                        entity_type
+                        definition_type
+                        definition
+                        x_opencti_order
+                        x_opencti_color
+                        created
+                        modified
+                    }
+                """
+                stix_domain_object = self.read(
+                    id=id, customAttributes=custom_attributes
                 )
-                query = """
-                   mutation StixDomainObjectAddRelation($id: ID!, $input: StixRefRelationshipAddInput!) {
-                       stixDomainObjectEdit(id: $id) {
-                            relationAdd(input: $input) {
-                                id
-                            }
-                       }
+                if stix_domain_object is None:
+                    self.opencti.app_logger.error(
+                        "Cannot add Marking-Definition, entity not found"
+                    )
+                    return False
+                if marking_definition_id in stix_domain_object["objectMarkingIds"]:
+                    return True
+            self.opencti.app_logger.info(
+                "Adding Marking-Definition to Stix-Domain-Object",
+                {"marking_definition_id": marking_definition_id, "id": id},
+            )
+            query = """
+               mutation StixDomainObjectAddRelation($id: ID!, $input: StixRefRelationshipAddInput!) {
+                   stixDomainObjectEdit(id: $id) {
+                        relationAdd(input: $input) {
+                            id
+                        }
                    }
-                """
-                self.opencti.query(
-                    query,
-                    {
-                        "id": id,
-                        "input": {
-                            "toId": marking_definition_id,
-                            "relationship_type": "object-marking",
-                        },
+               }
+            """
+            self.opencti.query(
+                query,
+                {
+                    "id": id,
+                    "input": {
+                        "toId": marking_definition_id,
+                        "relationship_type": "object-marking",
                     },
-                )
-                return True
+                },
+            )
+            return True
         else:
             self.opencti.app_logger.error(
                 "Missing parameters: id and marking_definition_id"
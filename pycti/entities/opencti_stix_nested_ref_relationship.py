@@ -152,6 +152,56 @@ class StixNestedRefRelationship:
             result["data"]["stixNestedRefRelationships"], with_pagination
         )
 
+    def count(self, **kwargs):
+        """Count Stix-Nested-Ref-Relationships
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param str fromOrToId: (optional) the id of the source or target entity
+        :param str fromId: (optional) the id of the source entity
+        :param list fromTypes: (optional) the types of the source entity
+        :param str toId: (optional) the id of the target entity
+        :param list toTypes: (optional) the types of the target entity
+        :param list relationship_type: (optional) the relationship types
+        :param list filters: (optional) the filters to apply
+
+        :return: number of matching Stix-Nested-Ref-Relationships
+        :rtype: int
+        """
+
+        from_or_to_id = kwargs.get("fromOrToId", None)
+        from_id = kwargs.get("fromId", None)
+        from_types = kwargs.get("fromTypes", None)
+        to_id = kwargs.get("toId", None)
+        to_types = kwargs.get("toTypes", None)
+        relationship_type = kwargs.get("relationship_type", None)
+        filters = kwargs.get("filters", None)
+
+        self.opencti.app_logger.info("Counting Stix-Nested-Ref-Relationships")
+        query = """
+            query StixNestedRefRelationshipsCount($fromOrToId: String, $fromId: StixRef, $fromTypes: [String], $toId: StixRef, $toTypes: [String], $relationship_type: [String], $filters: FilterGroup) {
+                stixNestedRefRelationships(fromOrToId: $fromOrToId, fromId: $fromId, fromTypes: $fromTypes, toId: $toId, toTypes: $toTypes, relationship_type: $relationship_type, filters: $filters, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "fromOrToId": from_or_to_id,
+                "fromId": from_id,
+                "fromTypes": from_types,
+                "toId": to_id,
+                "toTypes": to_types,
+                "relationship_type": relationship_type,
+                "filters": filters,
+            },
+        )
+        return result["data"]["stixNestedRefRelationships"]["pageInfo"]["globalCount"]
+
     """
         Read a stix_observable_relationship object
 
@@ -228,6 +278,7 @@ class StixNestedRefRelationship:
         Create a stix_observable_relationship object
 
         :param from_id: id of the source entity
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return stix_observable_relationship object
     """
 
@@ -244,6 +295,7 @@ class StixNestedRefRelationship:
         object_marking = kwargs.get("objectMarking", None)
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if relationship_type == "resolves-to":
             relationship_type = "obs_resolves-to"
@@ -270,6 +322,7 @@ class StixNestedRefRelationship:
                     }
                 }
                 """
+        query = self.opencti.returning_query(query, returning)
         result = self.opencti.query(
             query,
             {
@@ -289,21 +342,35 @@ class StixNestedRefRelationship:
                 }
             },
         )
-        return self.opencti.process_multiple_fields(
-            result["data"]["stixRefRelationshipAdd"]
+        return self.opencti.process_returning(
+            result["data"]["stixRefRelationshipAdd"], returning
         )
 
+    def create_many(self, items, **kwargs):
+        """Create many StixNestedRefRelationship objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Update a stix_observable_relationship object field
 
         :param id: the stix_observable_relationship id
         :param input: the input of the field
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return The updated stix_observable_relationship object
     """
 
     def update_field(self, **kwargs):
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             self.opencti.app_logger.info(
                 "Updating stix_observable_relationship", {"id": id}
@@ -321,9 +388,10 @@ class StixNestedRefRelationship:
                 }
             """
             )
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(query, {"id": id, "input": input})
-            return self.opencti.process_multiple_fields(
-                result["data"]["stixRefRelationshipEdit"]["fieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["stixRefRelationshipEdit"]["fieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error("Missing parameters: id and key and value")
@@ -590,3 +590,43 @@ class StixObjectOrStixRelationship:
             return self.opencti.process_multiple(
                 result["data"]["stixObjectOrStixRelationships"], with_pagination
             )
+
+    def count(self, **kwargs):
+        """Count StixObjectOrStixRelationships
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching StixObjectOrStixRelationships
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting StixObjectOrStixRelationships with filters",
+            {"filters": json.dumps(filters)},
+        )
+        query = """
+            query StixObjectOrStixRelationshipsCount($filters: FilterGroup, $search: String) {
+                stixObjectOrStixRelationships(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["stixObjectOrStixRelationships"]["pageInfo"][
+            "globalCount"
+        ]
@@ -3,7 +3,7 @@
 import datetime
 import uuid
 
-from stix2.canonicalization.Canonicalize import canonicalize
+from pycti.utils.opencti_stix2_identifier import canonicalize_data
 
 
 class StixSightingRelationship:
@@ -295,7 +295,7 @@ class StixSightingRelationship:
                 "sighting_of_ref": sighting_of_ref,
                 "where_sighted_refs": where_sighted_refs,
             }
-        data = canonicalize(data, utf8=False)
+        data = canonicalize_data(data)
         id = str(uuid.uuid5(uuid.UUID("00abedb4-aa42-466c-9c01-fed23315a9b7"), data))
         return "sighting--" + id
 
@@ -435,6 +435,68 @@ class StixSightingRelationship:
                 result["data"]["stixSightingRelationships"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Stix-Sighting-Relationships
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param str fromOrToId: (optional) the id of the source or target entity
+        :param str fromId: (optional) the id of the source entity
+        :param list fromTypes: (optional) the types of the source entity
+        :param str toId: (optional) the id of the target entity
+        :param list toTypes: (optional) the types of the target entity
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Stix-Sighting-Relationships
+        :rtype: int
+        """
+
+        from_or_to_id = kwargs.get("fromOrToId", None)
+        from_id = kwargs.get("fromId", None)
+        from_types = kwargs.get("fromTypes", None)
+        to_id = kwargs.get("toId", None)
+        to_types = kwargs.get("toTypes", None)
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info("Counting Stix-Sighting-Relationships")
+        query = """
+            query StixSightingRelationshipsCount($fromOrToId: String, $fromId: StixRef, $fromTypes: [String], $toId: StixRef, $toTypes: [String], $filters: FilterGroup, $search: String) {
+                stixSightingRelationships(fromOrToId: $fromOrToId, fromId: $fromId, fromTypes: $fromTypes, toId: $toId, toTypes: $toTypes, filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "fromOrToId": from_or_to_id,
+                "fromId": from_id,
+                "fromTypes": from_types,
+                "toId": to_id,
+                "toTypes": to_types,
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["stixSightingRelationships"]["pageInfo"]["globalCount"]
+
+    def iter_changed(self, **kwargs):
+        """Iterate over the Stix-Sighting-Relationships changed since a high-water mark
+
+        See :py:meth:`~pycti.api.opencti_api_client.OpenCTIApiClient.iter_changed`
+        for the `since`, `watermark`, `lookback`, `filters` and `first` kwargs,
+        any other kwarg is forwarded to `list`.
+
+        :return: generator of Stix-Sighting-Relationships, returning the final watermark
+        :rtype: Generator
+        """
+        return self.opencti.iter_changed(self.list, **kwargs)
+
     """
         Read a stix_sighting object
 
@@ -508,6 +570,7 @@ class StixSightingRelationship:
         Create a stix_sighting object
 
         :param name: the name of the Attack Pattern
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return stix_sighting object
     """
 
@@ -530,6 +593,7 @@ class StixSightingRelationship:
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         self.opencti.app_logger.info(
             "Creating stix_sighting", {"from_id": from_id, "to_id": to_id}
@@ -544,6 +608,7 @@ class StixSightingRelationship:
                     }
                 }
             """
+        query = self.opencti.returning_query(query, returning)
         result = self.opencti.query(
             query,
             {
@@ -569,21 +634,35 @@ class StixSightingRelationship:
                 }
             },
         )
-        return self.opencti.process_multiple_fields(
-            result["data"]["stixSightingRelationshipAdd"]
+        return self.opencti.process_returning(
+            result["data"]["stixSightingRelationshipAdd"], returning
         )
 
+    def create_many(self, items, **kwargs):
+        """Create many StixSightingRelationship objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Update a stix_sighting object field
 
         :param id: the stix_sighting id
         :param input: the input of the field
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return The updated stix_sighting object
     """
 
     def update_field(self, **kwargs):
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             self.opencti.app_logger.info("Updating stix_sighting", {"id": id})
             query = """
@@ -595,6 +674,7 @@ class StixSightingRelationship:
                         }
                     }
                 """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -602,8 +682,8 @@ class StixSightingRelationship:
                     "input": input,
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["stixSightingRelationshipEdit"]["fieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["stixSightingRelationshipEdit"]["fieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
@@ -611,67 +691,82 @@ class StixSightingRelationship:
             )
             return None
 
+    """
+        Add and remove many ref relations of a stix_sighting in few requests
+
+        :param id: the id of the stix_sighting
+        :param add: list of `{"toId": ..., "relationship_type": ...}` to add
+        :param remove: list of `{"toId": ..., "relationship_type": ...}` to remove
+        :param chunk_size: number of operations per request
+        :return: Boolean
+    """
+
+    def edit_relations(self, **kwargs):
+        return self.opencti.edit_relations("stixSightingRelationshipEdit", **kwargs)
+
     """
         Add a Marking-Definition object to stix_sighting_relationship object (object_marking_refs)
 
         :param id: the id of the stix_sighting_relationship
         :param marking_definition_id: the id of the Marking-Definition
+        :param check_existing: read the entity to skip an existing ref, defaults to True
         :return Boolean
     """
 
     def add_marking_definition(self, **kwargs):
         id = kwargs.get("id", None)
         marking_definition_id = kwargs.get("marking_definition_id", None)
+        check_existing = kwargs.get("check_existing", True)
         if id is not None and marking_definition_id is not None:
-            custom_attributes = """
-                id
-                objectMarking {
+            if check_existing:
+                custom_attributes = """
                     id
-                    standard_id
-                    entity_type
-                    definition_type
-                    definition
-                    x_opencti_order
-                    x_opencti_color
-                    created
-                    modified
-                }
-            """
-            stix_core_relationship = self.read(
-                id=id, customAttributes=custom_attributes
-            )
-            if stix_core_relationship is None:
-                self.opencti.app_logger.error(
-                    "Cannot add Marking-Definition, entity not found"
-                )
-                return False
-            if marking_definition_id in stix_core_relationship["objectMarkingIds"]:
-                return True
-            else:
-                self.opencti.app_logger.info(
-                    "Adding Marking-Definition to stix_sighting_relationship",
-                    {"marking_definition_id": marking_definition_id, "id": id},
+                    objectMarking {
+                        id
+                        standard_id
+                        entity_type
+                        definition_type
+                        definition
+                        x_opencti_order
+                        x_opencti_color
+                        created
+                        modified
+                    }
+                """
+                stix_core_relationship = self.read(
+                    id=id, customAttributes=custom_attributes
                 )
-                query = """
-                   mutation StixSightingRelationshipEdit($id: ID!, $input: StixRefRelationshipAddInput!) {
-                       stixSightingRelationshipEdit(id: $id) {
-                            relationAdd(input: $input) {
-                                id
-                            }
-                       }
+                if stix_core_relationship is None:
+                    self.opencti.app_logger.error(
+                        "Cannot add Marking-Definition, entity not found"
+                    )
+                    return False
+                if marking_definition_id in stix_core_relationship["objectMarkingIds"]:
+                    return True
+            self.opencti.app_logger.info(
+                "Adding Marking-Definition to stix_sighting_relationship",
+                {"marking_definition_id": marking_definition_id, "id": id},
+            )
+            query = """
+               mutation StixSightingRelationshipEdit($id: ID!, $input: StixRefRelationshipAddInput!) {
+                   stixSightingRelationshipEdit(id: $id) {
+                        relationAdd(input: $input) {
+                            id
+                        }
                    }
-                """
-                self.opencti.query(
-                    query,
-                    {
-                        "id": id,
-                        "input": {
-                            "toId": marking_definition_id,
-                            "relationship_type": "object-marking",
-                        },
+               }
+            """
+            self.opencti.query(
+                query,
+                {
+                    "id": id,
+                    "input": {
+                        "toId": marking_definition_id,
+                        "relationship_type": "object-marking",
                     },
-                )
-                return True
+                },
+            )
+            return True
         else:
             self.opencti.app_logger.error(
                 "Missing parameters: id and marking_definition_id"
@@ -322,6 +322,43 @@ class Task:
                 result["data"]["tasks"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Tasks
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Tasks
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Tasks with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query tasksCount($filters: FilterGroup, $search: String) {
+                tasks(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["tasks"]["pageInfo"]["globalCount"]
+
     """
         Read a Task object
 
@@ -435,6 +472,7 @@ class Task:
         Create a Task object
 
         :param name: the name of the Task
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Task object
     """
 
@@ -451,6 +489,7 @@ class Task:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Task", {"name": name})
@@ -464,6 +503,7 @@ class Task:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -483,14 +523,27 @@ class Task:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["taskAdd"])
+            return self.opencti.process_returning(result["data"]["taskAdd"], returning)
         else:
             self.opencti.app_logger.error("[opencti_task] Missing parameters: name")
 
+    def create_many(self, items, **kwargs):
+        """Create many Task objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     def update_field(self, **kwargs):
         self.opencti.app_logger.info("Updating Task", {"data": json.dumps(kwargs)})
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             query = """
                         mutation TaskEdit($id: ID!, $input: [EditInput!]!) {
@@ -501,9 +554,10 @@ class Task:
                            }
                         }
                     """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(query, {"id": id, "input": input})
-            return self.opencti.process_multiple_fields(
-                result["data"]["taskFieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["taskFieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
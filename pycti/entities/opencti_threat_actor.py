@@ -224,6 +224,43 @@ class ThreatActor:
             result["data"]["threatActors"], with_pagination
         )
 
+    def count(self, **kwargs):
+        """Count Threat-Actors
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Threat-Actors
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Threat-Actors with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query ThreatActorsCount($filters: FilterGroup, $search: String) {
+                threatActors(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["threatActors"]["pageInfo"]["globalCount"]
+
     def read(self, **kwargs) -> Union[dict, None]:
         """Read a Threat-Actor object
 
@@ -277,6 +314,18 @@ class ThreatActor:
         # For backward compatibility, please use threat_actor_group or threat_actor_individual
         return self.threat_actor_group.create(**kwargs)
 
+    def create_many(self, items, **kwargs):
+        """Create many ThreatActor objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Threat-Actor object from a STIX2 object
 
@@ -217,6 +217,44 @@ class ThreatActorGroup:
             result["data"]["threatActorsGroup"], with_pagination
         )
 
+    def count(self, **kwargs):
+        """Count Threat-Actors-Group
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Threat-Actors-Group
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Threat-Actors-Group with filters",
+            {"filters": json.dumps(filters)},
+        )
+        query = """
+            query ThreatActorsGroupCount($filters: FilterGroup, $search: String) {
+                threatActorsGroup(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["threatActorsGroup"]["pageInfo"]["globalCount"]
+
     def read(self, **kwargs) -> Union[dict, None]:
         """Read a Threat-Actor-Group object
 
@@ -330,6 +368,7 @@ class ThreatActorGroup:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Threat-Actor-Group", {"name": name})
@@ -343,6 +382,7 @@ class ThreatActorGroup:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -376,14 +416,26 @@ class ThreatActorGroup:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["threatActorGroupAdd"]
+            return self.opencti.process_returning(
+                result["data"]["threatActorGroupAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_threat_actor_group] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many ThreatActorGroup objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Threat-Actor-Group object from a STIX2 object
 
@@ -218,6 +218,44 @@ class ThreatActorIndividual:
             result["data"]["threatActorsIndividuals"], with_pagination
         )
 
+    def count(self, **kwargs):
+        """Count Threat-Actors-Individual
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Threat-Actors-Individual
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Threat-Actors-Individual with filters",
+            {"filters": json.dumps(filters)},
+        )
+        query = """
+            query ThreatActorsIndividualCount($filters: FilterGroup, $search: String) {
+                threatActorsIndividuals(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["threatActorsIndividuals"]["pageInfo"]["globalCount"]
+
     def read(self, **kwargs) -> Union[dict, None]:
         """Read a Threat-Actor-Individual object
 
@@ -331,6 +369,7 @@ class ThreatActorIndividual:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info(
@@ -346,6 +385,7 @@ class ThreatActorIndividual:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -379,14 +419,26 @@ class ThreatActorIndividual:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["threatActorIndividualAdd"]
+            return self.opencti.process_returning(
+                result["data"]["threatActorIndividualAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_threat_actor_individual] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many ThreatActorIndividual objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Threat-Actor-Individual object from a STIX2 object
 
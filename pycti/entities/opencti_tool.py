@@ -223,6 +223,43 @@ class Tool:
                 result["data"]["tools"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Tools
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Tools
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Tools with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query ToolsCount($filters: FilterGroup, $search: String) {
+                tools(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["tools"]["pageInfo"]["globalCount"]
+
     """
         Read a Tool object
 
@@ -270,6 +307,7 @@ class Tool:
         Create a Tool object
 
         :param name: the name of the Tool
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Tool object
     """
 
@@ -294,6 +332,7 @@ class Tool:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Tool", {"name": name})
@@ -307,6 +346,7 @@ class Tool:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -334,12 +374,24 @@ class Tool:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(result["data"]["toolAdd"])
+            return self.opencti.process_returning(result["data"]["toolAdd"], returning)
         else:
             self.opencti.app_logger.error(
                 "[opencti_tool] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Tool objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Tool object from a STIX2 object
 
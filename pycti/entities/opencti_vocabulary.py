@@ -58,6 +58,40 @@ class Vocabulary:
         )
         return self.opencti.process_multiple(result["data"]["vocabularies"])
 
+    def count(self, **kwargs):
+        """Count Vocabularies
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+
+        :return: number of matching Vocabularies
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+
+        self.opencti.app_logger.info(
+            "Counting Vocabularies with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query VocabulariesCount($filters: FilterGroup) {
+                vocabularies(filters: $filters, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+            },
+        )
+        return result["data"]["vocabularies"]["pageInfo"]["globalCount"]
+
     def read(self, **kwargs):
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
@@ -111,6 +145,7 @@ class Vocabulary:
         aliases = kwargs.get("aliases", None)
         x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None and category is not None:
             self.opencti.app_logger.info(
@@ -127,6 +162,7 @@ class Vocabulary:
                 }
             """
             )
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -149,6 +185,18 @@ class Vocabulary:
                 "[opencti_vocabulary] Missing parameters: name or category",
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Vocabulary objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     def read_or_create_unchecked(self, **kwargs):
         value = kwargs.get("name", None)
         vocab = self.read(
@@ -168,6 +216,7 @@ class Vocabulary:
     def update_field(self, **kwargs):
         id = kwargs.get("id", None)
         input = kwargs.get("input", None)
+        returning = kwargs.get("returning", "full")
         if id is not None and input is not None:
             self.opencti.app_logger.info("Updating Vocabulary", {"id": id})
             query = """
@@ -179,6 +228,7 @@ class Vocabulary:
                             }
                         }
                     """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -186,8 +236,8 @@ class Vocabulary:
                     "input": input,
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["vocabularyFieldPatch"]
+            return self.opencti.process_returning(
+                result["data"]["vocabularyFieldPatch"], returning
             )
         else:
             self.opencti.app_logger.error(
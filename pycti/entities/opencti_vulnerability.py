@@ -223,6 +223,43 @@ class Vulnerability:
                 result["data"]["vulnerabilities"], with_pagination
             )
 
+    def count(self, **kwargs):
+        """Count Vulnerabilities
+
+        Only the global count of the matching rows is requested, no entity is
+        fetched. The count method accepts the following kwargs:
+
+        :param list filters: (optional) the filters to apply
+        :param str search: (optional) a search keyword to apply for the counting
+
+        :return: number of matching Vulnerabilities
+        :rtype: int
+        """
+
+        filters = kwargs.get("filters", None)
+        search = kwargs.get("search", None)
+
+        self.opencti.app_logger.info(
+            "Counting Vulnerabilities with filters", {"filters": json.dumps(filters)}
+        )
+        query = """
+            query VulnerabilitiesCount($filters: FilterGroup, $search: String) {
+                vulnerabilities(filters: $filters, search: $search, first: 1) {
+                    pageInfo {
+                        globalCount
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(
+            query,
+            {
+                "filters": filters,
+                "search": search,
+            },
+        )
+        return result["data"]["vulnerabilities"]["pageInfo"]["globalCount"]
+
     """
         Read a Vulnerability object
 
@@ -270,6 +307,7 @@ class Vulnerability:
         Create a Vulnerability object
 
         :param name: the name of the Vulnerability
+        :param returning: the fields to return, "id", "minimal" or "full" (default)
         :return Vulnerability object
     """
 
@@ -306,6 +344,7 @@ class Vulnerability:
         granted_refs = kwargs.get("objectOrganization", None)
         x_opencti_workflow_id = kwargs.get("x_opencti_workflow_id", None)
         update = kwargs.get("update", False)
+        returning = kwargs.get("returning", "full")
 
         if name is not None:
             self.opencti.app_logger.info("Creating Vulnerability", {"name": name})
@@ -319,6 +358,7 @@ class Vulnerability:
                     }
                 }
             """
+            query = self.opencti.returning_query(query, returning)
             result = self.opencti.query(
                 query,
                 {
@@ -352,14 +392,26 @@ class Vulnerability:
                     }
                 },
             )
-            return self.opencti.process_multiple_fields(
-                result["data"]["vulnerabilityAdd"]
+            return self.opencti.process_returning(
+                result["data"]["vulnerabilityAdd"], returning
             )
         else:
             self.opencti.app_logger.error(
                 "[opencti_vulnerability] Missing parameters: name and description"
             )
 
+    def create_many(self, items, **kwargs):
+        """Create many Vulnerability objects with aliased multi-mutation requests
+
+        :param list items: list of kwargs dicts accepted by `create`
+        :param int chunk_size: (optional) number of mutations per request
+        :param int max_retries: (optional) number of retries of the failed items
+
+        :return: list of `{"item": ..., "result": ..., "error": ...}` dicts
+        :rtype: list
+        """
+        return self.opencti.create_many(self.create, items, **kwargs)
+
     """
         Import an Vulnerability object from a STIX2 object
 
@@ -138,6 +138,19 @@ class MultipleRefRelationship(Enum):
         return value.lower() in lower_attr
 
 
+class DistributionFields(Enum):
+    ENTITY_TYPE = "entity_type"
+    CREATOR = "creator_id"
+    CREATED_BY = "created-by.internal_id"
+    OBJECT_MARKING = "object-marking.internal_id"
+    OBJECT_LABEL = "object-label.internal_id"
+
+    @classmethod
+    def has_value(cls, value):
+        lower_attr = list(map(lambda x: x.lower(), cls._value2member_map_))
+        return value.lower() in lower_attr
+
+
 # Custom objects
 
 
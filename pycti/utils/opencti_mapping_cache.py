@@ -0,0 +1,349 @@
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from cachetools import LRUCache
+from opentelemetry import metrics
+
+# Kind of the resolved entries, by mapping cache key prefix
+KEY_NAMESPACES = [
+    ("label_", "label"),
+    ("kill_chain_phase_", "kill_chain_phase"),
+    ("author_", "author"),
+    ("external_reference_", "external_reference"),
+    ("marking_", "marking"),
+    ("category_", "vocabulary"),
+    ("vocabularies_", "vocabulary"),
+]
+MAPPING_CACHE_EVENTS = ["hit", "miss", "eviction"]
+
+meter = metrics.get_meter(__name__)
+mapping_cache_counters = {
+    event: meter.create_counter(
+        name="opencti_mapping_cache_" + event + "_counter",
+        description="number of mapping cache " + event + "s",
+    )
+    for event in MAPPING_CACHE_EVENTS
+}
+
+
+def key_namespace(key: str) -> str:
+    """kind of the entry stored under a mapping cache key, `id` by default"""
+    for prefix, namespace in KEY_NAMESPACES:
+        if key.startswith(prefix):
+            return namespace
+    return "id"
+
+
+def entry_size(value) -> int:
+    """approximate size in bytes of a mapping cache entry"""
+    return len(json.dumps(value, default=str))
+
+
+class PersistentMappingCache:
+    """SQLite store keeping the resolved ids between worker restarts
+
+    Entries expire after `ttl` seconds. The store is stamped with `version`
+    (the platform url and version): a different stamp empties it, as ids may
+    not be valid anymore after an upgrade or on another platform.
+
+    :param path: path of the SQLite database file
+    :type path: str
+    :param ttl: seconds before an entry expires, defaults to one day
+    :type ttl: int, optional
+    :param version: version stamp of the entries, defaults to None
+    :type version: str, optional
+    """
+
+    def __init__(self, path, ttl=86400, version=None):
+        self.ttl = ttl
+        self.version = version
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            # With WAL, commits do not wait for the disk, a crash only loses
+            # the last resolutions
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata "
+                "(name TEXT PRIMARY KEY, value TEXT)"
+            )
+            row = self.connection.execute(
+                "SELECT value FROM metadata WHERE name = 'version'"
+            ).fetchone()
+            if row is None or row[0] != str(version):
+                self.connection.execute("DELETE FROM entries")
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO metadata (name, value) VALUES ('version', ?)",
+                    (str(version),),
+                )
+
+    def get(self, key, default=None):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return default
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(value, default=str),
+                    now + (self.ttl if ttl is None else ttl),
+                    now,
+                ),
+            )
+
+    def delete(self, key):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def purge_expired(self):
+        with self.lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM entries WHERE expires_at < ?", (time.time(),)
+            )
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM entries")
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class SharedMappingCache(PersistentMappingCache):
+    """Bounded SQLite store shared by the importer processes of a host
+
+    Several processes open the same file (under `/dev/shm` to keep it in
+    memory) and read each other's resolutions. The store keeps at most
+    `max_entries` entries, the least recently read ones are evicted first.
+
+    :param path: path of the SQLite database file
+    :type path: str
+    :param max_entries: maximum number of entries, defaults to 500000
+    :type max_entries: int, optional
+    :param ttl: default seconds before an entry expires, defaults to one day
+    :type ttl: int, optional
+    :param version: version stamp of the entries, defaults to None
+    :type version: str, optional
+    """
+
+    # Reads refresh the access time at most once per interval (seconds),
+    # writes check the bound once per interval (writes)
+    ACCESS_INTERVAL = 60
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, path, max_entries=500000, ttl=86400, version=None):
+        super().__init__(path, ttl=ttl, version=version)
+        self.max_entries = max_entries
+        self.writes = 0
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed_at "
+                "ON entries (accessed_at)"
+            )
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                "SELECT value, expires_at, accessed_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or row[1] < now:
+                return default
+            if row[2] is None or row[2] < now - self.ACCESS_INTERVAL:
+                self.connection.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        super().set(key, value, ttl)
+        self.writes += 1
+        if self.writes % self.EVICTION_INTERVAL == 0:
+            self.evict()
+
+    def evict(self):
+        """remove the expired entries then the least recently read ones"""
+        self.purge_expired()
+        with self.lock, self.connection:
+            count = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+            if count[0] > self.max_entries:
+                self.connection.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM entries "
+                    "ORDER BY accessed_at LIMIT ?)",
+                    (count[0] - self.max_entries,),
+                )
+
+
+class MappingCache(LRUCache):
+    """Thread safe LRU cache of the STIX ids resolved during an import
+
+    The importer threads share the cache, every access holds a lock so the
+    LRU bookkeeping stays consistent. With a `persistent` store, a memory
+    miss is read from the store and every write goes to the store too,
+    outside of the lock; the store entries are namespaced by `namespace`.
+
+    Lookups (`in`, `get`) and evictions are counted per kind of entry (see
+    `KEY_NAMESPACES`) in `stats`, in OpenTelemetry and, when set, in the
+    `metric` handler.
+
+    :param maxsize: maximum number of entries in memory
+    :type maxsize: int
+    :param persistent: optional store shared between restarts
+    :type persistent: PersistentMappingCache, optional
+    :param namespace: prefix of the keys in the store
+    :type namespace: str, optional
+    :param maxbytes: maximum approximate size in bytes of the entries in
+        memory, replaces `maxsize` when set
+    :type maxbytes: int, optional
+    :param metric: optional metric handler receiving the counters
+    :type metric: OpenCTIMetricHandler, optional
+    """
+
+    def __init__(
+        self,
+        maxsize=math.inf,
+        persistent=None,
+        namespace="mapping",
+        maxbytes=None,
+        metric=None,
+    ):
+        if maxbytes is not None:
+            super().__init__(maxsize=maxbytes, getsizeof=entry_size)
+        else:
+            super().__init__(maxsize=maxsize)
+        self.lock = threading.RLock()
+        self.persistent = persistent
+        self.namespace = namespace
+        self.metric = metric
+        self.stats = Counter()
+        self.internal = False
+
+    def count(self, event, key):
+        namespace = key_namespace(key)
+        self.stats[(namespace, event)] += 1
+        attributes = {"cache": self.namespace, "namespace": namespace}
+        mapping_cache_counters[event].add(1, attributes)
+        if self.metric is not None:
+            self.metric.inc("mapping_cache_" + event, labels=attributes)
+
+    def statistics(self) -> dict:
+        """counters of the cache, per kind of entry
+
+        :return: the `hit`, `miss` and `eviction` counts per kind of entry,
+            with the current and maximum size of the cache
+        :rtype: dict
+        """
+        with self.lock:
+            namespaces = {}
+            for (namespace, event), value in self.stats.items():
+                namespaces.setdefault(
+                    namespace, {event: 0 for event in MAPPING_CACHE_EVENTS}
+                )[event] = value
+            return {
+                "namespaces": namespaces,
+                "currsize": self.currsize,
+                "maxsize": self.maxsize,
+            }
+
+    def load(self, key):
+        """read a memory miss from the store, None if not stored"""
+        if self.persistent is None:
+            return None
+        value = self.persistent.get(self.namespace + ":" + key)
+        if value is not None:
+            # Keep the entry in memory without writing it back
+            with self.lock:
+                self.keep(key, value)
+        return value
+
+    def __getitem__(self, key):
+        with self.lock:
+            internal, self.internal = self.internal, True
+            try:
+                return super().__getitem__(key)
+            except KeyError:
+                pass
+            finally:
+                self.internal = internal
+        value = self.load(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def keep(self, key, value):
+        try:
+            super().__setitem__(key, value)
+        except ValueError:
+            # Entry larger than the byte bound, never kept in memory
+            pass
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            self.keep(key, value)
+        if self.persistent is not None:
+            self.persistent.set(self.namespace + ":" + key, value)
+
+    def __delitem__(self, key):
+        # Evictions only free the memory, store entries expire with their ttl
+        with self.lock:
+            super().__delitem__(key)
+
+    def __contains__(self, key):
+        with self.lock:
+            if self.internal:
+                # Membership tests of the LRU bookkeeping are not lookups
+                return super().__contains__(key)
+            if super().__contains__(key):
+                self.count("hit", key)
+                return True
+        found = self.load(key) is not None
+        with self.lock:
+            self.count("hit" if found else "miss", key)
+        return found
+
+    def popitem(self):
+        with self.lock:
+            key, value = super().popitem()
+            self.count("eviction", key)
+            return key, value
+
+    def get(self, key, default=None):
+        if key in self:
+            try:
+                return self[key]
+            except KeyError:
+                # Evicted meanwhile and not stored
+                pass
+        return default
+
+    def pop(self, key, *args):
+        with self.lock:
+            internal, self.internal = self.internal, True
+            try:
+                return super().pop(key, *args)
+            finally:
+                self.internal = internal
+
+    def clear(self):
+        with self.lock:
+            super().clear()
@@ -1,13 +1,19 @@
 # coding: utf-8
 
-import base64
+import copy
 import datetime
+import heapq
 import json
 import os
 import random
+import re
+import threading
 import time
 import traceback
 import uuid
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, groupby
 from typing import Any, Dict, List, Optional, Union
 
 import datefinder
@@ -25,11 +31,16 @@ from pycti.utils.constants import (
     StixCyberObservableTypes,
     ThreatActorTypes,
 )
+from pycti.utils.opencti_mapping_cache import MappingCache, PersistentMappingCache
+from pycti.utils.opencti_stix2_identifier import StixIdGenerator
+from pycti.utils.opencti_stix2_profiler import ImportProfiler, profile_phase, profiled
 from pycti.utils.opencti_stix2_splitter import OpenCTIStix2Splitter
+from pycti.utils.opencti_stix2_stream import StixBundleReader, StixObjectIndex
 from pycti.utils.opencti_stix2_update import OpenCTIStix2Update
 from pycti.utils.opencti_stix2_utils import (
     OBSERVABLES_VALUE_INT,
     STIX_CYBER_OBSERVABLE_MAPPING,
+    OpenCTIStix2Utils,
 )
 
 datefinder.ValueError = ValueError, OverflowError
@@ -46,6 +57,54 @@ STIX_EXT_OCTI = "extension-definition--ea279b3e-5c71-4632-ac08-831c66a786ba"
 STIX_EXT_OCTI_SCO = "extension-definition--f93e2c80-4231-4f9a-af8b-95c9bd566a82"
 STIX_EXT_MITRE = "extension-definition--322b8f77-262a-4cb8-a915-1e441e00329b"
 PROCESSING_COUNT: int = 4
+BATCHED_OPERATIONS = ["delete", "merge"]
+OPERATIONS_MAX_WORKERS: int = 4
+
+# Report authors guessed from the titles keywords, by priority
+AUTHORS = [
+    (["fireeye", "mandiant"], "FireEye"),
+    (["eset"], "ESET"),
+    (["dragos"], "Dragos"),
+    (["us-cert"], "US-CERT"),
+    (["unit 42", "unit42", "palo alto"], "Palo Alto Networks"),
+    (["accenture"], "Accenture"),
+    (["symantec"], "Symantec"),
+    (["trendmicro", "trend micro"], "Trend Micro"),
+    (["mcafee"], "McAfee"),
+    (["crowdstrike"], "CrowdStrike"),
+    (["securelist", "kaspersky"], "Kaspersky"),
+    (["f-secure"], "F-Secure"),
+    (["checkpoint"], "CheckPoint"),
+    (["talos"], "Cisco Talos"),
+    (["secureworks"], "Dell SecureWorks"),
+    (["microsoft"], "Microsoft"),
+    (["mitre att&ck"], "The MITRE Corporation"),
+]
+AUTHOR_KEYWORDS = {
+    keyword: (priority, author)
+    for priority, (keywords, author) in enumerate(AUTHORS)
+    for keyword in keywords
+}
+# Lookahead to find the overlapping keywords too
+AUTHOR_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword in AUTHOR_KEYWORDS) + "))"
+)
+PUBLISHED_DATES_CACHE_SIZE: int = 10000
+# Fields read to resolve the endpoints of the sightings
+ENDPOINT_ATTRIBUTES = """
+    ... on StixObject {
+        id
+        standard_id
+        entity_type
+        x_opencti_stix_ids
+    }
+    ... on StixRelationship {
+        id
+        standard_id
+        entity_type
+        x_opencti_stix_ids
+    }
+"""
 
 meter = metrics.get_meter(__name__)
 bundles_timeout_error_counter = meter.create_counter(
@@ -73,18 +132,70 @@ bundles_success_counter = meter.create_counter(
     description="number of bundles successfully processed",
 )
 
+ERROR_CLASS_TIMEOUT = "timeout"
+ERROR_CLASS_LOCK = "lock_rejection"
+ERROR_CLASS_MISSING_REFERENCE = "missing_reference"
+ERROR_CLASS_BAD_GATEWAY = "bad_gateway"
+ERROR_CLASS_TECHNICAL = "technical"
+ERROR_CLASS_COUNTERS = {
+    ERROR_CLASS_TIMEOUT: bundles_timeout_error_counter,
+    ERROR_CLASS_LOCK: bundles_lock_error_counter,
+    ERROR_CLASS_MISSING_REFERENCE: bundles_missing_reference_error_counter,
+    ERROR_CLASS_BAD_GATEWAY: bundles_bad_gateway_error_counter,
+    ERROR_CLASS_TECHNICAL: bundles_technical_error_counter,
+}
+# Seconds range of the jittered delay before retrying each error class
+RETRY_DELAYS = {
+    ERROR_CLASS_TIMEOUT: (10, 30),
+    ERROR_CLASS_LOCK: (1, 3),
+    ERROR_CLASS_MISSING_REFERENCE: (1, 3),
+    ERROR_CLASS_BAD_GATEWAY: (60, 60),
+}
+
 
 class OpenCTIStix2:
     """Python API for Stix2 in OpenCTI
 
     :param opencti: OpenCTI instance
+    :param mapping_cache_max_size: maximum number of entries of the mapping cache
+    :param mapping_cache_max_bytes: maximum size in bytes of the mapping cache,
+        replaces `mapping_cache_max_size` when set
     """
 
-    def __init__(self, opencti):
+    def __init__(
+        self, opencti, mapping_cache_max_size=50000, mapping_cache_max_bytes=None
+    ):
         self.opencti = opencti
         self.stix2_update = OpenCTIStix2Update(opencti)
-        self.mapping_cache = LRUCache(maxsize=50000)
-        self.mapping_cache_permanent = {}
+        self.mapping_cache = MappingCache(
+            maxsize=mapping_cache_max_size, maxbytes=mapping_cache_max_bytes
+        )
+        self.mapping_cache_permanent = MappingCache(namespace="permanent")
+        self.retry_counts = Counter()
+        self.profiler = None
+        self.import_profile = None
+        self.published_dates = LRUCache(maxsize=PUBLISHED_DATES_CACHE_SIZE)
+        self.published_dates_lock = threading.Lock()
+        self.stix_helpers = None
+        self.id_generator = None
+
+    def set_persistent_cache(self, persistent: PersistentMappingCache):
+        """back the mapping caches with a store kept between restarts
+
+        :param persistent: the persistent store, None to disable it
+        :type persistent: PersistentMappingCache
+        """
+        self.mapping_cache.persistent = persistent
+        self.mapping_cache_permanent.persistent = persistent
+
+    def set_metric_handler(self, metric):
+        """report the mapping caches counters to a metric handler
+
+        :param metric: the metric handler, None to disable it
+        :type metric: OpenCTIMetricHandler
+        """
+        self.mapping_cache.metric = metric
+        self.mapping_cache_permanent.metric = metric
 
     ######### UTILS
     # region utils
@@ -171,7 +282,11 @@ class OpenCTIStix2:
         return None
 
     def import_bundle_from_file(
-        self, file_path: str, update: bool = False, types: List = None
+        self,
+        file_path: str,
+        update: bool = False,
+        types: List = None,
+        max_workers: int = 1,
     ) -> Optional[List]:
         """import a stix2 bundle from a file
 
@@ -181,6 +296,8 @@ class OpenCTIStix2:
         :type update: bool, optional
         :param types: list of stix2 types, defaults to None
         :type types: list, optional
+        :param max_workers: number of import threads, defaults to 1
+        :type max_workers: int, optional
         :return: list of imported stix2 objects
         :rtype: List
         """
@@ -189,7 +306,7 @@ class OpenCTIStix2:
             return None
         with open(os.path.join(file_path), encoding="utf-8") as file:
             data = json.load(file)
-        return self.import_bundle(data, update, types)
+        return self.import_bundle(data, update, types, max_workers=max_workers)
 
     def import_bundle_from_json(
         self,
@@ -197,6 +314,7 @@ class OpenCTIStix2:
         update: bool = False,
         types: List = None,
         work_id: str = None,
+        max_workers: int = 1,
     ) -> List:
         """import a stix2 bundle from JSON data
 
@@ -207,65 +325,307 @@ class OpenCTIStix2:
         :param types: list of stix2 types, defaults to None
         :type types: list, optional
         :param work_id work_id: str, optional
+        :param max_workers: number of import threads, defaults to 1
+        :type max_workers: int, optional
         :return: list of imported stix2 objects
         :rtype: List
         """
         data = json.loads(json_data)
-        return self.import_bundle(data, update, types, work_id)
+        return self.import_bundle(data, update, types, work_id, max_workers)
 
     def resolve_author(self, title: str) -> Optional[Identity]:
-        if "fireeye" in title.lower() or "mandiant" in title.lower():
-            return self.get_author("FireEye")
-        if "eset" in title.lower():
-            return self.get_author("ESET")
-        if "dragos" in title.lower():
-            return self.get_author("Dragos")
-        if "us-cert" in title.lower():
-            return self.get_author("US-CERT")
-        if (
-            "unit 42" in title.lower()
-            or "unit42" in title.lower()
-            or "palo alto" in title.lower()
-        ):
-            return self.get_author("Palo Alto Networks")
-        if "accenture" in title.lower():
-            return self.get_author("Accenture")
-        if "symantec" in title.lower():
-            return self.get_author("Symantec")
-        if "trendmicro" in title.lower() or "trend micro" in title.lower():
-            return self.get_author("Trend Micro")
-        if "mcafee" in title.lower():
-            return self.get_author("McAfee")
-        if "crowdstrike" in title.lower():
-            return self.get_author("CrowdStrike")
-        if "securelist" in title.lower() or "kaspersky" in title.lower():
-            return self.get_author("Kaspersky")
-        if "f-secure" in title.lower():
-            return self.get_author("F-Secure")
-        if "checkpoint" in title.lower():
-            return self.get_author("CheckPoint")
-        if "talos" in title.lower():
-            return self.get_author("Cisco Talos")
-        if "secureworks" in title.lower():
-            return self.get_author("Dell SecureWorks")
-        if "microsoft" in title.lower():
-            return self.get_author("Microsoft")
-        if "mitre att&ck" in title.lower():
-            return self.get_author("The MITRE Corporation")
-        return None
+        # Every keyword is searched in one pass, the first author listed wins
+        authors = [
+            AUTHOR_KEYWORDS[match.group(1)]
+            for match in AUTHOR_PATTERN.finditer(title.lower())
+        ]
+        if len(authors) == 0:
+            return None
+        return self.get_author(min(authors)[1])
+
+    @profiled("dates")
+    def external_reference_date(self, external_reference: Dict) -> Optional[str]:
+        """first past date of an external reference description or source name
+
+        The dates are memoized by source name and external id.
+
+        :param external_reference: the stix2 external reference
+        :type external_reference: dict
+        :return: the date in the stix2 format, None if not found
+        :rtype: str
+        """
+        text = (
+            external_reference["description"]
+            if "description" in external_reference
+            else external_reference.get("source_name")
+        )
+        if external_reference.get("external_id") is not None:
+            key = (
+                external_reference.get("source_name"),
+                external_reference["external_id"],
+            )
+        else:
+            key = (external_reference.get("source_name"), text)
+        with self.published_dates_lock:
+            if key in self.published_dates:
+                return self.published_dates[key]
+        yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
+        date = OpenCTIStix2Utils.find_date(text, yesterday)
+        published = date.strftime("%Y-%m-%dT%H:%M:%SZ") if date is not None else None
+        with self.published_dates_lock:
+            self.published_dates[key] = published
+        return published
+
+    def get_tlp_clear_marking(self) -> Dict:
+        if "marking_tlpclear" not in self.mapping_cache_permanent:
+            marking = self.opencti.marking_definition.read(
+                filters={
+                    "mode": "and",
+                    "filters": [
+                        {"key": "definition_type", "values": ["TLP"]},
+                        {"key": "definition", "values": ["TLP:CLEAR"]},
+                    ],
+                    "filterGroups": [],
+                }
+            )
+            self.mapping_cache_permanent["marking_tlpclear"] = {"id": marking["id"]}
+        return self.mapping_cache_permanent["marking_tlpclear"]
 
     def get_author(self, name: str) -> Identity:
-        if name in self.mapping_cache:
-            return self.mapping_cache[name]
+        if "author_" + name in self.mapping_cache:
+            return self.mapping_cache["author_" + name]
         else:
             author = self.opencti.identity.create(
                 type="Organization",
                 name=name,
                 description="",
             )
-            self.mapping_cache[name] = author
+            self.mapping_cache["author_" + name] = author
             return author
 
+    def collect_bundle_references(self, objects: List, types: List = None) -> Dict:
+        """collect the distinct labels, kill chain phases, external references
+        and the sighting endpoints which are not in the bundle
+
+        Operations and objects out of the `types` scope are not imported, so
+        their references are not collected.
+
+        :param objects: the bundle objects
+        :type objects: list
+        :param types: list of stix2 types, defaults to None
+        :type types: list, optional
+        :return: dicts of the labels colors, kill chain phases and external
+            references, keyed by their mapping cache key, and the list of the
+            endpoints ids
+        :rtype: dict
+        """
+        labels = {}
+        kill_chain_phases = {}
+        external_references = {}
+        bundle_ids = set(stix_object["id"] for stix_object in objects)
+        endpoints = {}
+        for stix_object in objects:
+            if "opencti_operation" in stix_object or not self.is_in_scope(
+                stix_object, types
+            ):
+                continue
+            if stix_object.get("type") == "sighting":
+                for ref in self.sighting_endpoints(stix_object):
+                    if ref not in bundle_ids:
+                        endpoints.setdefault(ref, None)
+            object_labels = (
+                stix_object.get("labels")
+                or self.opencti.get_attribute_in_extension("labels", stix_object)
+                or stix_object.get("x_opencti_labels")
+                or []
+            )
+            for label in object_labels:
+                labels.setdefault("label_" + label, (label, None))
+            if len(object_labels) == 0:
+                for tag in stix_object.get("x_opencti_tags", []):
+                    labels.setdefault(
+                        "label_" + tag["value"], (tag["value"], tag.get("color"))
+                    )
+            object_kill_chain_phases = (
+                stix_object.get("kill_chain_phases")
+                or self.opencti.get_attribute_in_extension(
+                    "kill_chain_phases", stix_object
+                )
+                or stix_object.get("x_opencti_kill_chain_phases")
+                or []
+            )
+            for kill_chain_phase in object_kill_chain_phases:
+                kill_chain_phases.setdefault(
+                    "kill_chain_phase_"
+                    + kill_chain_phase["kill_chain_name"]
+                    + kill_chain_phase["phase_name"],
+                    kill_chain_phase,
+                )
+            object_external_references = (
+                stix_object.get("external_references")
+                or self.opencti.get_attribute_in_extension(
+                    "external_references", stix_object
+                )
+                or stix_object.get("x_opencti_external_references")
+                or []
+            )
+            for external_reference in object_external_references:
+                generated_ref_id = (
+                    self.opencti.external_reference.generate_id_from_data(
+                        external_reference
+                    )
+                )
+                if generated_ref_id is not None:
+                    external_references.setdefault(
+                        "external_reference_" + generated_ref_id, external_reference
+                    )
+        return {
+            "labels": labels,
+            "kill_chain_phases": kill_chain_phases,
+            "external_references": external_references,
+            "endpoints": list(endpoints),
+        }
+
+    def sighting_endpoints(self, stix_sighting: Dict) -> List:
+        """ids a sighting is imported from and to, as in `import_item_content`"""
+        refs = list(stix_sighting.get("where_sighted_refs") or [])
+        for ref in [
+            stix_sighting.get("x_opencti_sighting_of_ref"),
+            self.opencti.get_attribute_in_extension("sighting_of_ref", stix_sighting),
+            stix_sighting.get("sighting_of_ref"),
+        ] + list(stix_sighting.get("observed_data_refs") or []):
+            if ref is not None:
+                refs.append(ref)
+        return refs
+
+    @profiled("pre_resolution")
+    def resolve_bundle_references(
+        self, objects: List, chunk_size: int = 100, types: List = None
+    ):
+        """resolve or create in bulk the shared references of a bundle
+
+        Labels are read by batches of values and the missing ones created
+        with aliased multi-mutation requests, as are kill chain phases and
+        external references. The sighting endpoints that are not in the
+        bundle are read by chunks of ids. The results warm `mapping_cache`
+        so the per object import does not resolve them again.
+
+        :param objects: the bundle objects
+        :type objects: list
+        :param chunk_size: number of values per request, defaults to 100
+        :type chunk_size: int, optional
+        :param types: list of stix2 types, defaults to None
+        :type types: list, optional
+        """
+        references = self.collect_bundle_references(objects, types)
+        labels = {
+            key: value
+            for key, value in references["labels"].items()
+            if key not in self.mapping_cache
+        }
+        values = [value for value, _ in labels.values()]
+        for start in range(0, len(values), chunk_size):
+            for label in self.opencti.label.list(
+                filters={
+                    "mode": "and",
+                    "filters": [
+                        {"key": "value", "values": values[start : start + chunk_size]}
+                    ],
+                    "filterGroups": [],
+                },
+                first=chunk_size,
+            ):
+                if "label_" + label["value"] in labels:
+                    self.mapping_cache["label_" + label["value"]] = label
+                    del labels["label_" + label["value"]]
+        missing_labels = [
+            {"value": value, "color": color} for value, color in labels.values()
+        ]
+        for outcome in self.opencti.label.create_many(
+            missing_labels, chunk_size=chunk_size
+        ):
+            # Fail in label creation is allowed
+            if outcome["result"] is not None:
+                self.mapping_cache["label_" + outcome["item"]["value"]] = outcome[
+                    "result"
+                ]
+
+        kill_chain_phases = [
+            (key, kill_chain_phase)
+            for key, kill_chain_phase in references["kill_chain_phases"].items()
+            if key not in self.mapping_cache
+        ]
+        outcomes = self.opencti.kill_chain_phase.create_many(
+            [
+                {
+                    "kill_chain_name": kill_chain_phase["kill_chain_name"],
+                    "phase_name": kill_chain_phase["phase_name"],
+                    "x_opencti_order": (
+                        kill_chain_phase.get("x_opencti_order")
+                        or self.opencti.get_attribute_in_extension(
+                            "order", kill_chain_phase
+                        )
+                        or 0
+                    ),
+                    "stix_id": kill_chain_phase.get("id"),
+                }
+                for _, kill_chain_phase in kill_chain_phases
+            ],
+            chunk_size=chunk_size,
+        )
+        for (key, _), outcome in zip(kill_chain_phases, outcomes):
+            if outcome["result"] is not None:
+                self.mapping_cache[key] = {
+                    "id": outcome["result"]["id"],
+                    "type": outcome["result"]["entity_type"],
+                }
+
+        external_references = [
+            (key, external_reference)
+            for key, external_reference in references["external_references"].items()
+            if key not in self.mapping_cache
+        ]
+        outcomes = self.opencti.external_reference.create_many(
+            [
+                {
+                    "source_name": external_reference.get("source_name"),
+                    "url": external_reference.get("url"),
+                    "external_id": external_reference.get("external_id"),
+                    "description": external_reference.get("description"),
+                }
+                for _, external_reference in external_references
+            ],
+            chunk_size=chunk_size,
+        )
+        for (key, _), outcome in zip(external_references, outcomes):
+            if outcome["result"] is not None:
+                self.mapping_cache[key] = {"id": outcome["result"]["id"]}
+
+        endpoints = [
+            ref for ref in references["endpoints"] if ref not in self.mapping_cache
+        ]
+        for start in range(0, len(endpoints), chunk_size):
+            chunk = set(endpoints[start : start + chunk_size])
+            for entity in self.opencti.opencti_stix_object_or_stix_relationship.list(
+                filters={
+                    "mode": "and",
+                    "filters": [{"key": "ids", "values": list(chunk)}],
+                    "filterGroups": [],
+                },
+                first=chunk_size,
+                customAttributes=ENDPOINT_ATTRIBUTES,
+            ):
+                # The refs may be any of the ids of the entity
+                for ref in [entity["id"], entity["standard_id"]] + (
+                    entity.get("x_opencti_stix_ids") or []
+                ):
+                    if ref in chunk:
+                        self.mapping_cache[ref] = {
+                            "id": entity["id"],
+                            "type": entity["entity_type"],
+                        }
+
+    @profiled("embedded_relationships")
     def extract_embedded_relationships(
         self, stix_object: Dict, types: List = None
     ) -> Dict:
@@ -302,7 +662,7 @@ class OpenCTIStix2:
         # Open vocabularies
         object_open_vocabularies = {}
         if self.mapping_cache_permanent.get("vocabularies_definition_fields") is None:
-            self.mapping_cache_permanent["vocabularies_definition_fields"] = []
+            vocabularies_definition_fields = []
             query = """
                     query getVocabCategories {
                       vocabularyCategories {
@@ -317,12 +677,13 @@ class OpenCTIStix2:
             result = self.opencti.query(query)
             for category in result["data"]["vocabularyCategories"]:
                 for field in category["fields"]:
-                    self.mapping_cache_permanent[
-                        "vocabularies_definition_fields"
-                    ].append(field)
+                    vocabularies_definition_fields.append(field)
                     self.mapping_cache_permanent["category_" + field["key"]] = category[
                         "key"
                     ]
+            self.mapping_cache_permanent["vocabularies_definition_fields"] = (
+                vocabularies_definition_fields
+            )
         if any(
             field["key"] in stix_object
             for field in self.mapping_cache_permanent["vocabularies_definition_fields"]
@@ -411,11 +772,14 @@ class OpenCTIStix2:
         if "kill_chain_phases" in stix_object:
             for kill_chain_phase in stix_object["kill_chain_phases"]:
                 if (
-                    kill_chain_phase["kill_chain_name"] + kill_chain_phase["phase_name"]
+                    "kill_chain_phase_"
+                    + kill_chain_phase["kill_chain_name"]
+                    + kill_chain_phase["phase_name"]
                     in self.mapping_cache
                 ):
                     kill_chain_phase = self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
+                        "kill_chain_phase_"
+                        + kill_chain_phase["kill_chain_name"]
                         + kill_chain_phase["phase_name"]
                     ]
                 else:
@@ -444,7 +808,8 @@ class OpenCTIStix2:
                         ),
                     )
                     self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
+                        "kill_chain_phase_"
+                        + kill_chain_phase["kill_chain_name"]
                         + kill_chain_phase["phase_name"]
                     ] = {
                         "id": kill_chain_phase["id"],
@@ -454,11 +819,14 @@ class OpenCTIStix2:
         elif "x_opencti_kill_chain_phases" in stix_object:
             for kill_chain_phase in stix_object["x_opencti_kill_chain_phases"]:
                 if (
-                    kill_chain_phase["kill_chain_name"] + kill_chain_phase["phase_name"]
+                    "kill_chain_phase_"
+                    + kill_chain_phase["kill_chain_name"]
+                    + kill_chain_phase["phase_name"]
                     in self.mapping_cache
                 ):
                     kill_chain_phase = self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
+                        "kill_chain_phase_"
+                        + kill_chain_phase["kill_chain_name"]
                         + kill_chain_phase["phase_name"]
                     ]
                 else:
@@ -487,7 +855,8 @@ class OpenCTIStix2:
                         ),
                     )
                     self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
+                        "kill_chain_phase_"
+                        + kill_chain_phase["kill_chain_name"]
                         + kill_chain_phase["phase_name"]
                     ] = {
                         "id": kill_chain_phase["id"],
@@ -536,6 +905,10 @@ class OpenCTIStix2:
                     )
                     if generated_ref_id is None:
                         continue
+                    elif "external_reference_" + generated_ref_id in self.mapping_cache:
+                        external_reference_id = self.mapping_cache[
+                            "external_reference_" + generated_ref_id
+                        ]["id"]
                     else:
                         external_reference_id = self.opencti.external_reference.create(
                             source_name=source_name,
@@ -547,39 +920,22 @@ class OpenCTIStix2:
                                 else None
                             ),
                         )["id"]
-                    if "x_opencti_files" in external_reference:
-                        for file in external_reference["x_opencti_files"]:
-                            if "data" in file:
-                                self.opencti.external_reference.add_file(
-                                    id=external_reference_id,
-                                    file_name=file["name"],
-                                    version=file.get("version", None),
-                                    data=base64.b64decode(file["data"]),
-                                    mime_type=file["mime_type"],
-                                    no_trigger_import=file.get(
-                                        "no_trigger_import", False
-                                    ),
-                                )
-                    if (
+                        self.mapping_cache["external_reference_" + generated_ref_id] = {
+                            "id": external_reference_id
+                        }
+                    self.upload_files(
+                        self.opencti.external_reference,
+                        external_reference_id,
+                        external_reference.get("x_opencti_files", []),
+                    )
+                    self.upload_files(
+                        self.opencti.external_reference,
+                        external_reference_id,
                         self.opencti.get_attribute_in_extension(
                             "files", external_reference
                         )
-                        is not None
-                    ):
-                        for file in self.opencti.get_attribute_in_extension(
-                            "files", external_reference
-                        ):
-                            if "data" in file:
-                                self.opencti.external_reference.add_file(
-                                    id=external_reference_id,
-                                    file_name=file["name"],
-                                    version=file.get("version", None),
-                                    data=base64.b64decode(file["data"]),
-                                    mime_type=file["mime_type"],
-                                    no_trigger_import=file.get(
-                                        "no_trigger_import", False
-                                    ),
-                                )
+                        or [],
+                    )
                     external_references_ids.append(external_reference_id)
                     if stix_object["type"] in [
                         "threat-actor",
@@ -593,35 +949,11 @@ class OpenCTIStix2:
                     ):
                         # Add a corresponding report
                         # Extract date
-                        try:
-                            if "description" in external_reference:
-                                matches = datefinder.find_dates(
-                                    external_reference["description"],
-                                    base_date=datetime.datetime.fromtimestamp(0),
-                                )
-                            else:
-                                matches = datefinder.find_dates(
-                                    source_name,
-                                    base_date=datetime.datetime.fromtimestamp(0),
-                                )
-                        except:
-                            matches = None
-                        published = None
-                        yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
-                        default_date = datetime.datetime.fromtimestamp(1)
-                        if matches is not None:
-                            try:
-                                for match in matches:
-                                    if (
-                                        match.timestamp() < yesterday.timestamp()
-                                        and len(str(match.year)) == 4
-                                    ):
-                                        published = match.strftime("%Y-%m-%dT%H:%M:%SZ")
-                                        break
-                            except:
-                                pass
+                        published = self.external_reference_date(external_reference)
                         if published is None:
-                            published = default_date.strftime("%Y-%m-%dT%H:%M:%SZ")
+                            published = datetime.datetime.fromtimestamp(1).strftime(
+                                "%Y-%m-%dT%H:%M:%SZ"
+                            )
 
                         if "mitre" in source_name and "name" in stix_object:
                             title = "[MITRE ATT&CK] " + stix_object["name"]
@@ -642,33 +974,7 @@ class OpenCTIStix2:
                                 + ")"
                             )
 
-                        if "marking_tlpclear" in self.mapping_cache:
-                            object_marking_ref_result = self.mapping_cache[
-                                "marking_tlpclear"
-                            ]
-                        else:
-                            object_marking_ref_result = (
-                                self.opencti.marking_definition.read(
-                                    filters={
-                                        "mode": "and",
-                                        "filters": [
-                                            {
-                                                "key": "definition_type",
-                                                "values": ["TLP"],
-                                            },
-                                            {
-                                                "key": "definition",
-                                                "values": ["TLP:CLEAR"],
-                                            },
-                                        ],
-                                        "filterGroups": [],
-                                    }
-                                )
-                            )
-                            self.mapping_cache["marking_tlpclear"] = {
-                                "id": object_marking_ref_result["id"]
-                            }
-
+                        object_marking_ref_result = self.get_tlp_clear_marking()
                         author = self.resolve_author(title)
                         report = self.opencti.report.create(
                             id=self.opencti.report.generate_fixed_fake_id(
@@ -710,6 +1016,10 @@ class OpenCTIStix2:
                 )
                 if generated_ref_id is None:
                     continue
+                elif "external_reference_" + generated_ref_id in self.mapping_cache:
+                    external_reference_id = self.mapping_cache[
+                        "external_reference_" + generated_ref_id
+                    ]["id"]
                 else:
                     external_reference_id = self.opencti.external_reference.create(
                         source_name=source_name,
@@ -721,33 +1031,20 @@ class OpenCTIStix2:
                             else None
                         ),
                     )["id"]
-                if "x_opencti_files" in external_reference:
-                    for file in external_reference["x_opencti_files"]:
-                        if "data" in file:
-                            self.opencti.external_reference.add_file(
-                                id=external_reference_id,
-                                file_name=file["name"],
-                                version=file.get("version", None),
-                                data=base64.b64decode(file["data"]),
-                                mime_type=file["mime_type"],
-                                no_trigger_import=file.get("no_trigger_import", False),
-                            )
-                if (
+                    self.mapping_cache["external_reference_" + generated_ref_id] = {
+                        "id": external_reference_id
+                    }
+                self.upload_files(
+                    self.opencti.external_reference,
+                    external_reference_id,
+                    external_reference.get("x_opencti_files", []),
+                )
+                self.upload_files(
+                    self.opencti.external_reference,
+                    external_reference_id,
                     self.opencti.get_attribute_in_extension("files", external_reference)
-                    is not None
-                ):
-                    for file in self.opencti.get_attribute_in_extension(
-                        "files", external_reference
-                    ):
-                        if "data" in file:
-                            self.opencti.external_reference.add_file(
-                                id=external_reference_id,
-                                file_name=file["name"],
-                                version=file.get("version", None),
-                                data=base64.b64decode(file["data"]),
-                                mime_type=file["mime_type"],
-                                no_trigger_import=file.get("no_trigger_import", False),
-                            )
+                    or [],
+                )
                 external_references_ids.append(external_reference_id)
         # Granted refs
         granted_refs_ids = []
@@ -848,8 +1145,10 @@ class OpenCTIStix2:
     # endregion
 
     def get_stix_helper(self):
-        # Import
-        return {
+        # The dispatch table is built once, the entities never change
+        if self.stix_helpers is not None:
+            return self.stix_helpers
+        self.stix_helpers = {
             # entities
             "attack-pattern": self.opencti.attack_pattern,
             "campaign": self.opencti.campaign,
@@ -894,6 +1193,12 @@ class OpenCTIStix2:
             "relationship": self.opencti.stix_core_relationship,
             "sighting": self.opencti.stix_sighting_relationship,
         }
+        return self.stix_helpers
+
+    def get_id_generator(self) -> StixIdGenerator:
+        if self.id_generator is None:
+            self.id_generator = StixIdGenerator(self.get_stix_helper())
+        return self.id_generator
 
     def generate_standard_id_from_stix(self, data):
         stix_helpers = self.get_stix_helper()
@@ -901,6 +1206,32 @@ class OpenCTIStix2:
         return helper.generate_id_from_data(data)
 
     # region import
+    def upload_files(self, entity, entity_id: str, files: List[Dict]) -> None:
+        """upload the embedded files of an entity
+
+        The base64 content of each file is decoded by chunks then streamed
+        to the platform, and removed from the file once uploaded.
+
+        :param entity: the entity class, with an `add_file` method
+        :param entity_id: id of the entity on the platform
+        :type entity_id: str
+        :param files: the `x_opencti_files` of the object
+        :type files: list
+        """
+        for file in files:
+            if "data" not in file:
+                continue
+            with OpenCTIStix2Utils.decode_file(file["data"]) as data:
+                entity.add_file(
+                    id=entity_id,
+                    file_name=file["name"],
+                    version=file.get("version", None),
+                    data=data,
+                    mime_type=file["mime_type"],
+                    no_trigger_import=file.get("no_trigger_import", False),
+                )
+            del file["data"]
+
     def import_object(
         self, stix_object: Dict, update: bool = False, types: List = None
     ) -> Optional[List]:
@@ -990,33 +1321,16 @@ class OpenCTIStix2:
                         stixObjectOrStixRelationshipId=stix_object_result["id"],
                     )
             # Add files
-            if "x_opencti_files" in stix_object:
-                for file in stix_object["x_opencti_files"]:
-                    if "data" in file:
-                        self.opencti.stix_domain_object.add_file(
-                            id=stix_object_result["id"],
-                            file_name=file["name"],
-                            version=file.get("version", None),
-                            data=base64.b64decode(file["data"]),
-                            mime_type=file["mime_type"],
-                            no_trigger_import=file.get("no_trigger_import", False),
-                        )
-            if (
-                self.opencti.get_attribute_in_extension("files", stix_object)
-                is not None
-            ):
-                for file in self.opencti.get_attribute_in_extension(
-                    "files", stix_object
-                ):
-                    if "data" in file:
-                        self.opencti.stix_domain_object.add_file(
-                            id=stix_object_result["id"],
-                            file_name=file["name"],
-                            version=file.get("version", None),
-                            data=base64.b64decode(file["data"]),
-                            mime_type=file["mime_type"],
-                            no_trigger_import=file.get("no_trigger_import", False),
-                        )
+            self.upload_files(
+                self.opencti.stix_domain_object,
+                stix_object_result["id"],
+                stix_object.get("x_opencti_files", []),
+            )
+            self.upload_files(
+                self.opencti.stix_domain_object,
+                stix_object_result["id"],
+                self.opencti.get_attribute_in_extension("files", stix_object) or [],
+            )
         return stix_object_results
 
     def import_observable(
@@ -1090,6 +1404,7 @@ class OpenCTIStix2:
                     extras["granted_refs_ids"] if "granted_refs_ids" in extras else []
                 ),
                 update=update,
+                returning="minimal",
             )
         else:
             stix_observable_result = self.opencti.stix_cyber_observable.create(
@@ -1114,36 +1429,20 @@ class OpenCTIStix2:
                     extras["granted_refs_ids"] if "granted_refs_ids" in extras else []
                 ),
                 update=update,
+                returning="minimal",
             )
         if stix_observable_result is not None:
             # Add files
-            if "x_opencti_files" in stix_object:
-                for file in stix_object["x_opencti_files"]:
-                    if "data" in file:
-                        self.opencti.stix_cyber_observable.add_file(
-                            id=stix_observable_result["id"],
-                            file_name=file["name"],
-                            version=file.get("version", None),
-                            data=base64.b64decode(file["data"]),
-                            mime_type=file["mime_type"],
-                            no_trigger_import=file.get("no_trigger_import", False),
-                        )
-            if (
-                self.opencti.get_attribute_in_extension("files", stix_object)
-                is not None
-            ):
-                for file in self.opencti.get_attribute_in_extension(
-                    "files", stix_object
-                ):
-                    if "data" in file:
-                        self.opencti.stix_cyber_observable.add_file(
-                            id=stix_observable_result["id"],
-                            file_name=file["name"],
-                            version=file.get("version", None),
-                            data=base64.b64decode(file["data"]),
-                            mime_type=file["mime_type"],
-                            no_trigger_import=file.get("no_trigger_import", False),
-                        )
+            self.upload_files(
+                self.opencti.stix_cyber_observable,
+                stix_observable_result["id"],
+                stix_object.get("x_opencti_files", []),
+            )
+            self.upload_files(
+                self.opencti.stix_cyber_observable,
+                stix_observable_result["id"],
+                self.opencti.get_attribute_in_extension("files", stix_object) or [],
+            )
             if "id" in stix_object:
                 self.mapping_cache[stix_object["id"]] = {
                     "id": stix_observable_result["id"],
@@ -1233,32 +1532,7 @@ class OpenCTIStix2:
         date = None
         if "external_references" in stix_relation:
             for external_reference in stix_relation["external_references"]:
-                try:
-                    if "description" in external_reference:
-                        matches = datefinder.find_dates(
-                            external_reference["description"],
-                            base_date=datetime.datetime.fromtimestamp(0),
-                        )
-                    else:
-                        matches = datefinder.find_dates(
-                            external_reference["source_name"],
-                            base_date=datetime.datetime.fromtimestamp(0),
-                        )
-                except:
-                    matches = None
-                date = None
-                yesterday = datetime.datetime.now() - datetime.timedelta(days=1)
-                if matches is not None:
-                    try:
-                        for match in matches:
-                            if (
-                                match.timestamp() < yesterday.timestamp()
-                                and len(str(match.year)) == 4
-                            ):
-                                date = match.strftime("%Y-%m-%dT%H:%M:%SZ")
-                                break
-                    except:
-                        date = None
+                date = self.external_reference_date(external_reference)
 
         stix_relation_result = self.opencti.stix_core_relationship.import_from_stix2(
             stixRelation=stix_relation, extras=extras, update=update, defaultDate=date
@@ -1335,6 +1609,10 @@ class OpenCTIStix2:
             )
             if stix_object_result is not None:
                 final_from_id = stix_object_result["id"]
+                self.mapping_cache[from_id] = {
+                    "id": stix_object_result["id"],
+                    "type": stix_object_result["entity_type"],
+                }
             else:
                 self.opencti.app_logger.error(
                     "From ref of the sighting not found, doing nothing..."
@@ -1352,6 +1630,10 @@ class OpenCTIStix2:
                 )
                 if stix_object_result is not None:
                     final_to_id = stix_object_result["id"]
+                    self.mapping_cache[to_id] = {
+                        "id": stix_object_result["id"],
+                        "type": stix_object_result["entity_type"],
+                    }
                 else:
                     self.opencti.app_logger.error(
                         "To ref of the sighting not found, doing nothing..."
@@ -1416,6 +1698,7 @@ class OpenCTIStix2:
                 else None
             ),
             update=update,
+            returning="minimal",
             ignore_dates=(
                 stix_sighting["x_opencti_ignore_dates"]
                 if "x_opencti_ignore_dates" in stix_sighting
@@ -2411,7 +2694,15 @@ class OpenCTIStix2:
 
         return bundle
 
-    def prepare_bundle_ids(self, bundle, use_json=True, keep_original_id=False):
+    def prepare_bundle_ids(
+        self, bundle, use_json=True, keep_original_id=False, granted_refs=None
+    ):
+        """rewrite the ids of a bundle to their standard ids
+
+        :param granted_refs: organizations every element is shared with,
+            added while the elements are remapped
+        :type granted_refs: list, optional
+        """
         if use_json:
             try:
                 bundle_data = json.loads(bundle)
@@ -2419,40 +2710,209 @@ class OpenCTIStix2:
                 raise Exception("File data is not a valid JSON")
         else:
             bundle_data = bundle
-        cache_ids = {}
-        # First iteration to cache all entity ids
-        stix_helpers = self.get_stix_helper()
-        for item in bundle_data["objects"]:
-            helper = stix_helpers.get(item["type"])
-            if hasattr(helper, "generate_id_from_data"):
-                standard_id = helper.generate_id_from_data(item)
-                cache_ids[item["id"]] = standard_id
+        # First iteration to cache all entity ids, memoized between bundles
+        cache_ids = self.get_id_generator().generate_ids(bundle_data["objects"])
         # Second iteration to replace and remap
         for item in bundle_data["objects"]:
-            # For entities, try to replace the main id
-            # Keep the current one if needed
-            if cache_ids.get(item["id"]):
-                original_id = item["id"]
-                item["id"] = cache_ids[original_id]
-                if keep_original_id:
-                    item["x_opencti_stix_ids"] = item.get("x_opencti_stix_ids", []) + [
-                        original_id
-                    ]
-            # For all elements, replace all refs (source_ref, object_refs, ...)
-            ref_keys = list(
-                filter(lambda i: i.endswith("_ref") or i.endswith("_refs"), item.keys())
-            )
-            for ref_key in ref_keys:
-                if ref_key.endswith("_refs"):
-                    item[ref_key] = list(
-                        map(lambda id_ref: cache_ids.get(id_ref, id_ref), item[ref_key])
-                    )
-                else:
-                    item[ref_key] = cache_ids.get(item[ref_key], item[ref_key])
+            self.remap_item_ids(item, cache_ids, keep_original_id)
+            if granted_refs is not None:
+                self.add_granted_refs(item, granted_refs)
 
         return json.dumps(bundle_data) if use_json else bundle_data
 
-    def import_item(
+    @staticmethod
+    def add_granted_refs(item, granted_refs):
+        """share an element with organizations, in its extension if any"""
+        if (
+            "extensions" in item
+            and "extension-definition--ea279b3e-5c71-4632-ac08-831c66a786ba"
+            in item["extensions"]
+        ):
+            octi_extensions = item["extensions"][
+                "extension-definition--ea279b3e-5c71-4632-ac08-831c66a786ba"
+            ]
+            if octi_extensions.get("granted_refs") is not None:
+                octi_extensions["granted_refs"] = list(
+                    set(octi_extensions["granted_refs"] + granted_refs)
+                )
+            else:
+                octi_extensions["granted_refs"] = granted_refs
+        else:
+            if item.get("x_opencti_granted_refs") is not None:
+                item["x_opencti_granted_refs"] = list(
+                    set(item["x_opencti_granted_refs"] + granted_refs)
+                )
+            else:
+                item["x_opencti_granted_refs"] = granted_refs
+
+    @staticmethod
+    def remap_item_ids(item, cache_ids, keep_original_id=False):
+        # For entities, try to replace the main id
+        # Keep the current one if needed
+        if cache_ids.get(item["id"]):
+            original_id = item["id"]
+            item["id"] = cache_ids[original_id]
+            if keep_original_id:
+                item["x_opencti_stix_ids"] = item.get("x_opencti_stix_ids", []) + [
+                    original_id
+                ]
+        # For all elements, replace all refs (source_ref, object_refs, ...)
+        ref_keys = list(
+            filter(lambda i: i.endswith("_ref") or i.endswith("_refs"), item.keys())
+        )
+        for ref_key in ref_keys:
+            if ref_key.endswith("_refs"):
+                item[ref_key] = list(
+                    map(lambda id_ref: cache_ids.get(id_ref, id_ref), item[ref_key])
+                )
+            else:
+                item[ref_key] = cache_ids.get(item[ref_key], item[ref_key])
+
+    def import_item_content(self, item, update: bool = False, types: List = None):
+        if "opencti_operation" in item:
+            if item["opencti_operation"] == "delete":
+                delete_id = item["id"]
+                self.opencti.stix.delete(id=delete_id)
+            elif item["opencti_operation"] == "merge":
+                target_id = item["merge_target_id"]
+                source_ids = item["merge_source_ids"]
+                self.opencti.stix.merge(id=target_id, object_ids=source_ids)
+            else:
+                raise ValueError("Not supported opencti_operation")
+        elif item["type"] == "relationship":
+            # Import relationship
+            self.import_relationship(item, update, types)
+        elif item["type"] == "sighting":
+            # Resolve the to
+            to_ids = []
+            if "where_sighted_refs" in item:
+                for where_sighted_ref in item["where_sighted_refs"]:
+                    to_ids.append(where_sighted_ref)
+            # Import sighting_of_ref
+            if "x_opencti_sighting_of_ref" in item:
+                from_id = item["x_opencti_sighting_of_ref"]
+                if len(to_ids) > 0:
+                    for to_id in to_ids:
+                        self.import_sighting(item, from_id, to_id, update)
+            if (
+                self.opencti.get_attribute_in_extension("sighting_of_ref", item)
+                is not None
+            ):
+                from_id = self.opencti.get_attribute_in_extension(
+                    "sighting_of_ref", item
+                )
+                if len(to_ids) > 0:
+                    for to_id in to_ids:
+                        self.import_sighting(item, from_id, to_id, update)
+            from_id = item["sighting_of_ref"]
+            if len(to_ids) > 0:
+                for to_id in to_ids:
+                    self.import_sighting(item, from_id, to_id, update)
+            # Import observed_data_refs
+            if "observed_data_refs" in item:
+                for observed_data_ref in item["observed_data_refs"]:
+                    if len(to_ids) > 0:
+                        for to_id in to_ids:
+                            self.import_sighting(item, observed_data_ref, to_id, update)
+        elif item["type"] == "label":
+            stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
+            self.opencti.label.create(
+                stix_id=item["id"],
+                value=item["value"],
+                color=item["color"],
+                x_opencti_stix_ids=stix_ids,
+                update=update,
+                returning="id",
+            )
+        elif item["type"] == "vocabulary":
+            stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
+            self.opencti.vocabulary.create(
+                stix_id=item["id"],
+                name=item["name"],
+                category=item["category"],
+                description=(item["description"] if "description" in item else None),
+                aliases=item["aliases"] if "aliases" in item else None,
+                x_opencti_stix_ids=stix_ids,
+                update=update,
+                returning="id",
+            )
+        elif item["type"] == "external-reference":
+            stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
+            self.opencti.external_reference.create(
+                stix_id=item["id"],
+                source_name=(item["source_name"] if "source_name" in item else None),
+                url=item["url"] if "url" in item else None,
+                external_id=(item["external_id"] if "external_id" in item else None),
+                description=(item["description"] if "description" in item else None),
+                x_opencti_stix_ids=stix_ids,
+                update=update,
+                returning="id",
+            )
+        elif item["type"] == "kill-chain-phase":
+            stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
+            self.opencti.kill_chain_phase.create(
+                stix_id=item["id"],
+                kill_chain_name=item["kill_chain_name"],
+                phase_name=item["phase_name"],
+                x_opencti_order=item["order"] if "order" in item else 0,
+                x_opencti_stix_ids=stix_ids,
+                update=update,
+                returning="id",
+            )
+        elif StixCyberObservableTypes.has_value(item["type"]):
+            if self.is_in_scope(item, types):
+                self.import_observable(item, update, types)
+        elif self.is_in_scope(item, types):
+            self.import_object(item, update, types)
+
+    def is_in_scope(self, item, types: List = None) -> bool:
+        """whether an item is imported with the `types` scope of an import"""
+        if types is None or len(types) == 0 or item["type"] in types:
+            return True
+        if item["type"] in [
+            "relationship",
+            "sighting",
+            "label",
+            "vocabulary",
+            "external-reference",
+            "kill-chain-phase",
+        ]:
+            return True
+        if StixCyberObservableTypes.has_value(item["type"]):
+            return "observable" in types
+        if item["type"] == "marking-definition":
+            return True
+        # Specific OpenCTI scopes
+        if item["type"] == "identity":
+            if "identity_class" in item:
+                if ("class" in types or "sector" in types) and item[
+                    "identity_class"
+                ] == "class":
+                    return True
+                return item["identity_class"] in types
+        elif item["type"] == "location":
+            if "x_opencti_location_type" in item:
+                return item["x_opencti_location_type"].lower() in types
+            location_type = self.opencti.get_attribute_in_extension(
+                "location_type", item
+            )
+            if location_type is not None:
+                return location_type.lower() in types
+        return False
+
+    def classify_import_error(self, ex: Exception) -> str:
+        if isinstance(ex, (RequestException, Timeout)):
+            return ERROR_CLASS_TIMEOUT
+        error_msg = traceback.format_exc()
+        if ERROR_TYPE_LOCK in error_msg:
+            return ERROR_CLASS_LOCK
+        elif ERROR_TYPE_MISSING_REFERENCE in error_msg:
+            return ERROR_CLASS_MISSING_REFERENCE
+        elif ERROR_TYPE_BAD_GATEWAY in error_msg:
+            return ERROR_CLASS_BAD_GATEWAY
+        return ERROR_CLASS_TECHNICAL
+
+    def try_import_item(
         self,
         item,
         update: bool = False,
@@ -2460,228 +2920,293 @@ class OpenCTIStix2:
         processing_count: int = 0,
         work_id: str = None,
     ):
-        worker_logger = self.opencti.logger_class("worker")
+        """import an item once, without retrying
+
+        :return: None on success, else the `(error_class, error)` tuple
+        :rtype: tuple
+        """
         try:
-            self.opencti.set_retry_number(processing_count)
-            if "opencti_operation" in item:
-                if item["opencti_operation"] == "delete":
-                    delete_id = item["id"]
-                    self.opencti.stix.delete(id=delete_id)
-                if item["opencti_operation"] == "merge":
-                    target_id = item["merge_target_id"]
-                    source_ids = item["merge_source_ids"]
-                    self.opencti.stix.merge(id=target_id, object_ids=source_ids)
-                else:
-                    raise ValueError("Not supported opencti_operation")
-            elif item["type"] == "relationship":
-                # Import relationship
-                self.import_relationship(item, update, types)
-            elif item["type"] == "sighting":
-                # Resolve the to
-                to_ids = []
-                if "where_sighted_refs" in item:
-                    for where_sighted_ref in item["where_sighted_refs"]:
-                        to_ids.append(where_sighted_ref)
-                # Import sighting_of_ref
-                if "x_opencti_sighting_of_ref" in item:
-                    from_id = item["x_opencti_sighting_of_ref"]
-                    if len(to_ids) > 0:
-                        for to_id in to_ids:
-                            self.import_sighting(item, from_id, to_id, update)
-                if (
-                    self.opencti.get_attribute_in_extension("sighting_of_ref", item)
-                    is not None
-                ):
-                    from_id = self.opencti.get_attribute_in_extension(
-                        "sighting_of_ref", item
-                    )
-                    if len(to_ids) > 0:
-                        for to_id in to_ids:
-                            self.import_sighting(item, from_id, to_id, update)
-                from_id = item["sighting_of_ref"]
-                if len(to_ids) > 0:
-                    for to_id in to_ids:
-                        self.import_sighting(item, from_id, to_id, update)
-                # Import observed_data_refs
-                if "observed_data_refs" in item:
-                    for observed_data_ref in item["observed_data_refs"]:
-                        if len(to_ids) > 0:
-                            for to_id in to_ids:
-                                self.import_sighting(
-                                    item, observed_data_ref, to_id, update
-                                )
-            elif item["type"] == "label":
-                stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
-                self.opencti.label.create(
-                    stix_id=item["id"],
-                    value=item["value"],
-                    color=item["color"],
-                    x_opencti_stix_ids=stix_ids,
-                    update=update,
-                )
-            elif item["type"] == "vocabulary":
-                stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
-                self.opencti.vocabulary.create(
-                    stix_id=item["id"],
-                    name=item["name"],
-                    category=item["category"],
-                    description=(
-                        item["description"] if "description" in item else None
-                    ),
-                    aliases=item["aliases"] if "aliases" in item else None,
-                    x_opencti_stix_ids=stix_ids,
-                    update=update,
-                )
-            elif item["type"] == "external-reference":
-                stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
-                self.opencti.external_reference.create(
-                    stix_id=item["id"],
-                    source_name=(
-                        item["source_name"] if "source_name" in item else None
-                    ),
-                    url=item["url"] if "url" in item else None,
-                    external_id=(
-                        item["external_id"] if "external_id" in item else None
-                    ),
-                    description=(
-                        item["description"] if "description" in item else None
-                    ),
-                    x_opencti_stix_ids=stix_ids,
-                    update=update,
-                )
-            elif item["type"] == "kill-chain-phase":
-                stix_ids = self.opencti.get_attribute_in_extension("stix_ids", item)
-                self.opencti.kill_chain_phase.create(
-                    stix_id=item["id"],
-                    kill_chain_name=item["kill_chain_name"],
-                    phase_name=item["phase_name"],
-                    x_opencti_order=item["order"] if "order" in item else 0,
-                    x_opencti_stix_ids=stix_ids,
-                    update=update,
-                )
-            elif StixCyberObservableTypes.has_value(item["type"]):
-                if types is None or len(types) == 0:
-                    self.import_observable(item, update, types)
-                elif item["type"] in types or "observable" in types:
-                    self.import_observable(item, update, types)
-            else:
-                # Check the scope
-                if (
-                    item["type"] == "marking-definition"
-                    or types is None
-                    or len(types) == 0
-                ):
-                    self.import_object(item, update, types)
-                # Handle identity & location if part of the scope
-                elif item["type"] in types:
-                    self.import_object(item, update, types)
-                else:
-                    # Specific OpenCTI scopes
-                    if item["type"] == "identity":
-                        if "identity_class" in item:
-                            if ("class" in types or "sector" in types) and item[
-                                "identity_class"
-                            ] == "class":
-                                self.import_object(item, update, types)
-                            elif item["identity_class"] in types:
-                                self.import_object(item, update, types)
-                    elif item["type"] == "location":
-                        if "x_opencti_location_type" in item:
-                            if item["x_opencti_location_type"].lower() in types:
-                                self.import_object(item, update, types)
-                        elif (
-                            self.opencti.get_attribute_in_extension(
-                                "location_type", item
-                            )
-                            is not None
-                        ):
-                            if (
-                                self.opencti.get_attribute_in_extension(
-                                    "location_type", item
-                                ).lower()
-                                in types
-                            ):
-                                self.import_object(item, update, types)
-            if work_id is not None:
-                self.opencti.work.report_expectation(work_id, None)
+            with self.opencti.retry_number(processing_count):
+                with profile_phase(self.profiler, "create", item.get("type")):
+                    self.import_item_content(item, update, types)
+                if work_id is not None:
+                    with profile_phase(self.profiler, "expectation", item.get("type")):
+                        self.opencti.work.report_expectation(work_id, None)
             bundles_success_counter.add(1)
-            return True
-        except (RequestException, Timeout):
-            bundles_timeout_error_counter.add(1)
-            worker_logger.warning("A connection error or timeout occurred")
-            # Platform is under heavy load: wait for unlock & retry almost indefinitely.
-            sleep_jitter = round(random.uniform(10, 30), 2)
-            time.sleep(sleep_jitter)
-            return self.import_item(item, update, types, processing_count + 1, work_id)
+            return None
         except Exception as ex:  # pylint: disable=broad-except
-            error = str(ex)
-            error_msg = traceback.format_exc()
-            in_retry = processing_count < PROCESSING_COUNT
-            # Platform is under heavy load, wait for unlock & retry indefinitely.
-            if ERROR_TYPE_LOCK in error_msg:
-                worker_logger.info(
-                    "Message reprocess for lock rejection", {"count": processing_count}
-                )
-                bundles_lock_error_counter.add(1)
-                sleep_jitter = round(random.uniform(1, 3), 2)
-                time.sleep(sleep_jitter)
-                return self.import_item(
-                    item, update, types, processing_count + 1, work_id
-                )
-            # Platform detects a missing reference and have to retry
-            elif ERROR_TYPE_MISSING_REFERENCE in error_msg and in_retry:
-                worker_logger.info(
-                    "Message reprocess for missing reference",
-                    {"count": processing_count},
-                )
-                bundles_missing_reference_error_counter.add(1)
-                sleep_jitter = round(random.uniform(1, 3), 2)
-                time.sleep(sleep_jitter)
-                return self.import_item(
-                    item, update, types, processing_count + 1, work_id
-                )
-            # A bad gateway error occurs
-            elif ERROR_TYPE_BAD_GATEWAY in error_msg:
-                worker_logger.error("A connection error occurred")
-                worker_logger.info(
-                    "Message reprocess for bad gateway",
-                    {"count": processing_count},
+            return self.classify_import_error(ex), str(ex)
+
+    def should_retry_import(self, error_class: str, processing_count: int) -> bool:
+        if error_class == ERROR_CLASS_MISSING_REFERENCE:
+            return processing_count < PROCESSING_COUNT
+        # Platform is under heavy load: wait for unlock & retry indefinitely
+        return error_class in RETRY_DELAYS
+
+    def count_import_retry(self, error_class: str, processing_count: int):
+        worker_logger = self.opencti.logger_class("worker")
+        if error_class == ERROR_CLASS_TIMEOUT:
+            worker_logger.warning("A connection error or timeout occurred")
+        elif error_class == ERROR_CLASS_BAD_GATEWAY:
+            worker_logger.error("A connection error occurred")
+        worker_logger.info(
+            "Message reprocess for " + error_class.replace("_", " "),
+            {"count": processing_count},
+        )
+        self.retry_counts[error_class] += 1
+        ERROR_CLASS_COUNTERS[error_class].add(1)
+
+    def report_import_error(self, item, error: str, processing_count: int, work_id):
+        # Platform does not know what to do and raises an error:
+        # That also works for missing reference with too much execution
+        worker_logger = self.opencti.logger_class("worker")
+        self.retry_counts[ERROR_CLASS_TECHNICAL] += 1
+        bundles_technical_error_counter.add(1)
+        worker_logger.error(
+            "Error executing import",
+            {"count": processing_count, "reason": error},
+        )
+        if work_id is not None:
+            item_str = json.dumps(item)
+            self.opencti.work.report_expectation(
+                work_id,
+                {
+                    "error": error,
+                    "source": (
+                        item_str if len(item_str) < 50000 else "Bundle too large"
+                    ),
+                },
+            )
+
+    @staticmethod
+    def retry_delay(error_class: str) -> float:
+        min_delay, max_delay = RETRY_DELAYS[error_class]
+        return round(random.uniform(min_delay, max_delay), 2)
+
+    def import_item(
+        self,
+        item,
+        update: bool = False,
+        types: List = None,
+        processing_count: int = 0,
+        work_id: str = None,
+    ):
+        while True:
+            failure = self.try_import_item(
+                item, update, types, processing_count, work_id
+            )
+            if failure is None:
+                return True
+            error_class, error = failure
+            if not self.should_retry_import(error_class, processing_count):
+                self.report_import_error(item, error, processing_count, work_id)
+                return False
+            self.count_import_retry(error_class, processing_count)
+            if self.profiler is not None:
+                self.profiler.count_retry(item.get("type"))
+            time.sleep(self.retry_delay(error_class))
+            processing_count += 1
+
+    def import_items(
+        self,
+        items: List,
+        update: bool = False,
+        types: List = None,
+        work_id: str = None,
+    ):
+        """import items with a retry scheduler instead of blocking retries
+
+        A failed item waits in a delay queue while the next items keep
+        flowing. Items missing a reference are deferred after the rest of
+        the items, as the reference may come later in the bundle. The items
+        referencing a waiting item are held until it is done, so they do not
+        spend their retries on a missing reference.
+
+        :param items: the stix2 elements, in import order
+        :type items: list
+        :return: the number of items in error
+        :rtype: int
+        """
+        stix2_splitter = OpenCTIStix2Splitter()
+        queue = deque((item, 0) for item in items)
+        delayed = []
+        deferred = []
+        # Ids of the waiting items, the held ones by the id they wait for
+        waiting = set()
+        held_by = {}
+        held = {}
+        sequence = count()
+        errors = 0
+
+        def blocking_ref(item):
+            for ref in stix2_splitter.element_refs(item):
+                if ref not in waiting:
+                    continue
+                # Do not wait for an item waiting for this one (a cycle)
+                blocker = ref
+                while blocker in held_by and blocker != item["id"]:
+                    blocker = held_by[blocker]
+                if blocker != item["id"]:
+                    return ref
+            return None
+
+        def release(item_id):
+            waiting.discard(item_id)
+            for dependent in held.pop(item_id, []):
+                del held_by[dependent[0]["id"]]
+                queue.append(dependent)
+
+        while len(queue) > 0 or len(delayed) > 0 or len(deferred) > 0:
+            if len(queue) == 0:
+                if len(deferred) > 0 and (
+                    len(delayed) == 0 or delayed[0][0] > time.monotonic()
+                ):
+                    # The rest of the items is done or waiting
+                    for item, processing_count in deferred:
+                        heapq.heappush(
+                            delayed,
+                            (
+                                time.monotonic()
+                                + self.retry_delay(ERROR_CLASS_MISSING_REFERENCE),
+                                next(sequence),
+                                item,
+                                processing_count,
+                            ),
+                        )
+                    deferred = []
+                wait = delayed[0][0] - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                _, _, item, processing_count = heapq.heappop(delayed)
+                queue.append((item, processing_count))
+            while len(delayed) > 0 and delayed[0][0] <= time.monotonic():
+                _, _, item, processing_count = heapq.heappop(delayed)
+                queue.append((item, processing_count))
+            item, processing_count = queue.popleft()
+            ref = blocking_ref(item) if len(waiting) > 0 else None
+            if ref is not None:
+                waiting.add(item["id"])
+                held_by[item["id"]] = ref
+                held.setdefault(ref, []).append((item, processing_count))
+                continue
+            failure = self.try_import_item(
+                item, update, types, processing_count, work_id
+            )
+            if failure is None:
+                release(item["id"])
+                continue
+            error_class, error = failure
+            if not self.should_retry_import(error_class, processing_count):
+                self.report_import_error(item, error, processing_count, work_id)
+                errors += 1
+                release(item["id"])
+                continue
+            self.count_import_retry(error_class, processing_count)
+            if self.profiler is not None:
+                self.profiler.count_retry(item.get("type"))
+            waiting.add(item["id"])
+            if error_class == ERROR_CLASS_MISSING_REFERENCE:
+                deferred.append((item, processing_count + 1))
+            else:
+                heapq.heappush(
+                    delayed,
+                    (
+                        time.monotonic() + self.retry_delay(error_class),
+                        next(sequence),
+                        item,
+                        processing_count + 1,
+                    ),
                 )
-                bundles_bad_gateway_error_counter.add(1)
-                time.sleep(60)
-                return self.import_item(
-                    item, update, types, processing_count + 1, work_id
+        return errors
+
+    def import_operations(
+        self,
+        items: List,
+        update: bool = False,
+        types: List = None,
+        work_id: str = None,
+    ):
+        """apply delete and merge operations with aliased multi-mutation requests
+
+        Consecutive operations of the same kind are sent together. A failed
+        operation goes through `import_items` again to be retried or reported.
+
+        :param items: the bundle items with an `opencti_operation`
+        :type items: list
+        """
+        for operation, group in groupby(items, lambda item: item["opencti_operation"]):
+            group = list(group)
+            if operation == "delete":
+                outcomes = self.opencti.stix.delete_many(
+                    ids=[item["id"] for item in group],
+                    max_workers=OPERATIONS_MAX_WORKERS,
                 )
-            # Platform does not know what to do and raises an error:
-            # That also works for missing reference with too much execution
             else:
-                bundles_technical_error_counter.add(1)
-                worker_logger.error(
-                    "Error executing import",
-                    {"count": processing_count, "reason": error},
+                outcomes = self.opencti.stix.merge_many(
+                    merges=[
+                        (item["merge_target_id"], item["merge_source_ids"])
+                        for item in group
+                    ]
                 )
-                if work_id is not None:
-                    item_str = json.dumps(item)
-                    self.opencti.work.report_expectation(
-                        work_id,
-                        {
-                            "error": error,
-                            "source": (
-                                item_str
-                                if len(item_str) < 50000
-                                else "Bundle too large"
-                            ),
-                        },
-                    )
-                return False
+            failed = []
+            for item, outcome in zip(group, outcomes):
+                if outcome["error"] is not None:
+                    failed.append(item)
+                else:
+                    if work_id is not None:
+                        self.opencti.work.report_expectation(work_id, None)
+                    bundles_success_counter.add(1)
+            self.import_items(failed, update, types, work_id)
 
-    def import_bundle(
+    def import_levels(
         self,
-        stix_bundle: Dict,
+        levels: List,
         update: bool = False,
         types: List = None,
         work_id: str = None,
+        max_workers: int = 1,
     ) -> List:
+        """import dependency levels, the elements of a level concurrently
+
+        A level starts once every element of the previous levels is imported,
+        so the dependencies of an element are always done before it.
+
+        :param levels: lists of stix2 elements, as split by the splitter
+        :type levels: list
+        :param max_workers: size of the thread pool
+        :type max_workers: int
+        :return: the imported elements
+        :rtype: list
+        """
+        imported_elements = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for level in levels:
+                operations = [
+                    item
+                    for item in level
+                    if item.get("opencti_operation") in BATCHED_OPERATIONS
+                ]
+                items = [
+                    item
+                    for item in level
+                    if item.get("opencti_operation") not in BATCHED_OPERATIONS
+                ]
+                if len(operations) > 0:
+                    self.import_operations(operations, update, types, work_id)
+                # Items are taken one by one by the idle workers, an item
+                # waiting for a retry only holds its own worker, then the
+                # whole level is awaited before the next one
+                list(
+                    executor.map(
+                        lambda item: self.import_item(item, update, types, 0, work_id),
+                        items,
+                    )
+                )
+                for item in operations + items:
+                    imported_elements.append({"id": item["id"], "type": item["type"]})
+        return imported_elements
+
+    def prepare_import_bundle(self, stix_bundle: Dict, types: List = None):
         # Check if the bundle is correctly formatted
         if "type" not in stix_bundle or stix_bundle["type"] != "bundle":
             raise ValueError("JSON data type is not a STIX2 bundle")
@@ -2697,20 +3222,258 @@ class OpenCTIStix2:
         stix_bundle = self.prepare_bundle_ids(
             bundle=stix_bundle, use_json=False, keep_original_id=False
         )
+        # Shared references are resolved once for the whole bundle
+        try:
+            self.resolve_bundle_references(stix_bundle["objects"], types=types)
+        except Exception as err:  # pylint: disable=broad-except
+            self.opencti.app_logger.warning(
+                "Cannot resolve the bundle references", {"error": str(err)}
+            )
+        return stix_bundle, event_version
 
+    def import_bundle(
+        self,
+        stix_bundle: Dict,
+        update: bool = False,
+        types: List = None,
+        work_id: str = None,
+        max_workers: int = 1,
+        profile: bool = False,
+    ) -> List:
+        """import a stix2 bundle
+
+        :param stix_bundle: valid stix2 bundle
+        :type stix_bundle: dict
+        :param max_workers: number of import threads, defaults to 1
+        :type max_workers: int, optional
+        :param profile: record the time, API calls and bytes per stix type
+            and phase in `import_profile`, defaults to False
+        :type profile: bool, optional
+        :return: list of imported stix2 objects
+        :rtype: List
+        """
+        if profile:
+            self.profiler = ImportProfiler()
+            self.opencti.profiler = self.profiler
+            try:
+                return self.import_bundle(
+                    stix_bundle, update, types, work_id, max_workers
+                )
+            finally:
+                self.import_profile = self.profiler.report()
+                self.opencti.app_logger.info("Import profile", self.import_profile)
+                self.profiler = None
+                self.opencti.profiler = None
+        stix_bundle, _ = self.prepare_import_bundle(stix_bundle, types)
+        stix2_splitter = OpenCTIStix2Splitter()
+        levels = stix2_splitter.split_bundle_in_levels(stix_bundle, False)
+        if max_workers > 1:
+            return self.import_levels(levels, update, types, work_id, max_workers)
+        # Import every element in a specific order, the whole ordered list at
+        # once so consecutive operations are batched together
+        items = [item for level in levels for item in level]
+        self.import_ordered_items(items, update, types, work_id)
+        return [{"id": item["id"], "type": item["type"]} for item in items]
+
+    def import_ordered_items(
+        self,
+        items: List,
+        update: bool = False,
+        types: List = None,
+        work_id: str = None,
+    ):
+        # Consecutive delete and merge operations are applied in batches
+        for is_operation, group in groupby(
+            items,
+            lambda item: item.get("opencti_operation") in BATCHED_OPERATIONS,
+        ):
+            group = list(group)
+            if is_operation:
+                self.import_operations(group, update, types, work_id)
+            else:
+                self.import_items(group, update, types, work_id)
+
+    def import_bundle_from_file_stream(
+        self,
+        file_path: str,
+        update: bool = False,
+        types: List = None,
+        work_id: str = None,
+        max_workers: int = 1,
+        use_mmap: bool = False,
+        index_path: str = None,
+        batch_size: int = 1000,
+    ) -> Optional[int]:
+        """import a large stix2 bundle file without loading it in memory
+
+        The objects are read one at a time and spilled to an on-disk index
+        (a temporary SQLite file by default) where their ids are remapped
+        and their dependency levels computed. The levels are then imported
+        by batches of `batch_size` objects, so the memory used depends on
+        the batch size and not on the bundle size.
+
+        :param file_path: valid path to the file
+        :type file_path: str
+        :param update: whether to updated data in the database, defaults to False
+        :type update: bool, optional
+        :param types: list of stix2 types, defaults to None
+        :type types: list, optional
+        :param max_workers: number of import threads, defaults to 1
+        :type max_workers: int, optional
+        :param use_mmap: read the file through a memory map, defaults to False
+        :type use_mmap: bool, optional
+        :param index_path: path of the on-disk index, defaults to a temporary file
+        :type index_path: str, optional
+        :param batch_size: number of objects imported at once, defaults to 1000
+        :type batch_size: int, optional
+        :return: number of imported stix2 objects
+        :rtype: int
+        """
+        if not os.path.isfile(file_path):
+            self.opencti.app_logger.error("The bundle file does not exists")
+            return None
+        reader = StixBundleReader(file_path, use_mmap=use_mmap)
+        index = StixObjectIndex(index_path, batch_size=batch_size)
+        id_generator = self.get_id_generator()
         stix2_splitter = OpenCTIStix2Splitter()
         try:
-            bundles = stix2_splitter.split_bundle(stix_bundle, False, event_version)
-        except RecursionError:
-            bundles = [stix_bundle]
-        # Import every element in a specific order
-        imported_elements = []
-        for bundle in bundles:
-            for item in bundle["objects"]:
-                self.import_item(item, update, types, 0, work_id)
-                imported_elements.append({"id": item["id"], "type": item["type"]})
+            for item in reader:
+                index.add(item, id_generator.generate_id(item))
+            if reader.header.get("type") != "bundle":
+                raise ValueError("JSON data type is not a STIX2 bundle")
+            if index.size == 0:
+                raise ValueError("JSON data objects is empty")
+            index.remap(self.remap_item_ids, stix2_splitter.element_refs)
+            imported = 0
+            for level in range(index.compute_levels()):
+                for items in index.iter_level(level):
+                    # Shared references are resolved once per batch
+                    try:
+                        self.resolve_bundle_references(items, types=types)
+                    except Exception as err:  # pylint: disable=broad-except
+                        self.opencti.app_logger.warning(
+                            "Cannot resolve the bundle references",
+                            {"error": str(err)},
+                        )
+                    if max_workers > 1:
+                        self.import_levels([items], update, types, work_id, max_workers)
+                    else:
+                        self.import_ordered_items(items, update, types, work_id)
+                    imported += len(items)
+            return imported
+        finally:
+            index.close()
 
-        return imported_elements
+    @staticmethod
+    def operation_kind(query: str, variables: Dict) -> str:
+        """kind of a GraphQL operation issued by the import
+
+        :return: one of `upload`, `label`, `read`, `relationship`, `create`
+            and `update`
+        :rtype: str
+        """
+        from pycti.api.opencti_api_client import File
+
+        if any(
+            isinstance(value, File)
+            or isinstance(value, list)
+            and any(isinstance(v, File) for v in value)
+            for value in (variables or {}).values()
+        ):
+            return "upload"
+        root_field = re.search(r"{\s*(\w+)", query)
+        root_field = root_field.group(1) if root_field is not None else ""
+        if root_field.startswith("label"):
+            return "label"
+        if not query.strip().startswith("mutation"):
+            return "read"
+        if root_field in [
+            "stixCoreRelationshipAdd",
+            "stixSightingRelationshipAdd",
+            "stixRefRelationshipAdd",
+        ]:
+            return "relationship"
+        if root_field.endswith("Add"):
+            return "create"
+        return "update"
+
+    def plan_import(
+        self,
+        stix_bundle: Dict,
+        update: bool = False,
+        types: List = None,
+        latency: float = 0.05,
+        max_workers: int = 1,
+    ) -> Dict:
+        """estimate the API calls of an import without reaching the platform
+
+        The bundle goes through the same steps as `import_bundle`, with cold
+        caches, while the client captures the queries instead of sending
+        them. Every created entity is answered as new, so the estimate is an
+        upper bound of an import where some entities already exist. Aliased
+        multi-mutation requests are counted per operation.
+
+        :param stix_bundle: valid stix2 bundle
+        :type stix_bundle: dict
+        :param latency: estimated seconds per API call, defaults to 0.05
+        :type latency: float, optional
+        :param max_workers: number of import threads, defaults to 1
+        :type max_workers: int, optional
+        :return: the calls by kind, by stix2 type and by root field, the
+            dependency levels sizes and the estimated duration in seconds
+        :rtype: dict
+        """
+        planner = OpenCTIStix2(self.opencti)
+        stix2_splitter = OpenCTIStix2Splitter()
+        by_type = {}
+        errors = 0
+        with self.opencti.capture_queries() as operations:
+            stix_bundle, _ = planner.prepare_import_bundle(
+                copy.deepcopy(stix_bundle), types
+            )
+            preparation_calls = len(operations)
+            levels = stix2_splitter.split_bundle_in_levels(stix_bundle, False)
+            estimated_duration = preparation_calls * latency
+            for level in levels:
+                level_start = len(operations)
+                for item in level:
+                    start = len(operations)
+                    try:
+                        planner.import_item_content(item, update, types)
+                    except Exception:  # pylint: disable=broad-except
+                        errors += 1
+                    by_type.setdefault(item["type"], Counter()).update(
+                        self.operation_kind(query, variables)
+                        for query, variables in operations[start:]
+                    )
+                # Elements of a level are imported concurrently
+                estimated_duration += (
+                    (len(operations) - level_start)
+                    * latency
+                    / max(1, min(max_workers, len(level)))
+                )
+        by_kind = Counter(
+            self.operation_kind(query, variables) for query, variables in operations
+        )
+        by_field = Counter(
+            match.group(1)
+            for match in (re.search(r"{\s*(\w+)", query) for query, _ in operations)
+            if match is not None
+        )
+        return {
+            "objects": len(stix_bundle["objects"]),
+            "calls": len(operations),
+            "preparation_calls": preparation_calls,
+            "kinds": dict(by_kind),
+            "types": {
+                stix_type: dict(counter) for stix_type, counter in by_type.items()
+            },
+            "fields": dict(by_field),
+            "depth": len(levels),
+            "levels": [len(level) for level in levels],
+            "errors": errors,
+            "estimated_duration": round(estimated_duration, 3),
+        }
 
     @staticmethod
     def put_attribute_in_extension(
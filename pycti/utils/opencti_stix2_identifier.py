@@ -0,0 +1,144 @@
+import json
+import threading
+from typing import Dict, List, Optional
+
+from cachetools import LRUCache
+from stix2.canonicalization.Canonicalize import canonicalize
+
+# Fields read by the `generate_id_from_data` of every stix type
+ID_FIELDS = {
+    "attack-pattern": ["name", "x_mitre_id"],
+    "campaign": ["name"],
+    "note": ["created", "content"],
+    "observed-data": ["object_refs"],
+    "opinion": ["created", "opinion"],
+    "report": ["name", "published"],
+    "course-of-action": ["name", "x_mitre_id"],
+    "identity": ["name", "identity_class"],
+    "infrastructure": ["name"],
+    "intrusion-set": ["name"],
+    "location": ["name", "x_opencti_location_type", "latitude", "longitude"],
+    "malware": ["name"],
+    # The type may also be read from the OpenCTI extension
+    "threat-actor": ["name", "x_opencti_type", "extensions"],
+    "tool": ["name"],
+    "vulnerability": ["name"],
+    "incident": ["name", "created"],
+    "marking-definition": ["definition", "definition_type"],
+    "case-rfi": ["name", "created"],
+    "x-opencti-case-rfi": ["name", "created"],
+    "case-rft": ["name", "created"],
+    "x-opencti-case-rft": ["name", "created"],
+    "case-incident": ["name", "created"],
+    "x-opencti-case-incident": ["name", "created"],
+    "feedback": ["name"],
+    "x-opencti-feedback": ["name"],
+    "channel": ["name"],
+    "data-component": ["name"],
+    "x-mitre-data-component": ["name"],
+    "data-source": ["name"],
+    "x-mitre-data-source": ["name"],
+    "event": ["name"],
+    "grouping": ["name", "context"],
+    "indicator": ["pattern"],
+    "language": ["name"],
+    "malware-analysis": ["result_name", "product", "submitted"],
+    "narrative": ["name"],
+    "task": ["name", "created"],
+    "x-opencti-task": ["name", "created"],
+    "vocabulary": ["name", "category"],
+    "relationship": [
+        "relationship_type",
+        "source_ref",
+        "target_ref",
+        "start_time",
+        "stop_time",
+    ],
+    "sighting": ["sighting_of_ref", "where_sighted_refs", "first_seen", "last_seen"],
+}
+# Number of generated ids kept in memory
+ID_MEMO_SIZE = 100000
+# Key of the identifying fields absent from an object
+MISSING = ("missing",)
+
+
+def canonicalize_data(data: Dict) -> str:
+    """canonical JSON of the identifying data of an object, as `canonicalize`
+
+    Data made of strings and lists of strings, the usual identifying data,
+    are serialized by the json module, which writes them the same way.
+    """
+    for value in data.values():
+        if not isinstance(value, str) and not (
+            isinstance(value, list) and all(isinstance(item, str) for item in value)
+        ):
+            return canonicalize(data, utf8=False)
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def freeze(value):
+    """hashable form of a field value, distinct for distinct JSON values"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ("list",) + tuple(freeze(item) for item in value)
+    return (type(value).__name__, json.dumps(value, sort_keys=True, default=str))
+
+
+class StixIdGenerator:
+    """Memoized generator of the standard ids of STIX2 objects
+
+    The ids are computed by the `generate_id_from_data` of the helper of
+    every type, then kept in a LRU memo keyed by the identifying fields of
+    the type (see `ID_FIELDS`), so objects sent again are not hashed again.
+
+    :param helpers: the helper of every stix type, as
+        `OpenCTIStix2.get_stix_helper`
+    :type helpers: dict
+    :param maxsize: maximum number of ids in memory, defaults to 100000
+    :type maxsize: int, optional
+    """
+
+    def __init__(self, helpers: Dict, maxsize: int = ID_MEMO_SIZE):
+        self.helpers = {
+            stix_type: helper
+            for stix_type, helper in helpers.items()
+            if hasattr(helper, "generate_id_from_data")
+        }
+        self.memo = LRUCache(maxsize=maxsize)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def memo_key(item: Dict) -> Optional[tuple]:
+        fields = ID_FIELDS.get(item["type"])
+        if fields is None:
+            return None
+        return (item["type"],) + tuple(
+            freeze(item[field]) if field in item else MISSING for field in fields
+        )
+
+    def generate_id(self, item: Dict) -> Optional[str]:
+        """standard id of an object, None for the types without one"""
+        helper = self.helpers.get(item["type"])
+        if helper is None:
+            return None
+        key = self.memo_key(item)
+        if key is not None:
+            with self.lock:
+                standard_id = self.memo.get(key)
+            if standard_id is not None:
+                return standard_id
+        standard_id = helper.generate_id_from_data(item)
+        if key is not None:
+            with self.lock:
+                self.memo[key] = standard_id
+        return standard_id
+
+    def generate_ids(self, items: List[Dict]) -> Dict[str, str]:
+        """standard ids of a batch of objects, by id of the objects"""
+        cache_ids = {}
+        for item in items:
+            standard_id = self.generate_id(item)
+            if standard_id is not None:
+                cache_ids[item["id"]] = standard_id
+        return cache_ids
@@ -0,0 +1,141 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+PROFILE_FIELDS = ["count", "time", "calls", "bytes", "retries"]
+
+
+class ImportProfiler:
+    """Wall time, API calls and bytes of an import, per stix type and phase
+
+    Phases nest: the time of a phase excludes the time of the phases started
+    inside it, so the times of a report add up to the measured time. The API
+    calls and bytes go to the innermost phase of the calling thread, uploads
+    to a `files` phase of their own.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stats = {}
+        self.started_at = time.perf_counter()
+
+    def stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def entry(self, stix_type: str, phase: str) -> Dict:
+        return self.stats.setdefault(
+            (stix_type, phase), {field: 0 for field in PROFILE_FIELDS}
+        )
+
+    @contextmanager
+    def measure(self, phase: str, stix_type: Optional[str] = None):
+        """measure a phase, of the stix type of the enclosing phase by default"""
+        stack = self.stack()
+        if stix_type is None:
+            stix_type = stack[-1]["type"] if len(stack) > 0 else "bundle"
+        frame = {"type": stix_type, "phase": phase, "children": 0.0}
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if len(stack) > 0:
+                stack[-1]["children"] += elapsed
+            with self.lock:
+                entry = self.entry(stix_type, phase)
+                entry["count"] += 1
+                entry["time"] += elapsed - frame["children"]
+
+    def count_call(self, elapsed: float, size: int, upload: bool = False):
+        """record an API call of the current thread"""
+        stack = self.stack()
+        stix_type = stack[-1]["type"] if len(stack) > 0 else "bundle"
+        phase = stack[-1]["phase"] if len(stack) > 0 else "other"
+        with self.lock:
+            if upload:
+                if len(stack) > 0:
+                    stack[-1]["children"] += elapsed
+                entry = self.entry(stix_type, "files")
+                entry["count"] += 1
+                entry["time"] += elapsed
+            else:
+                entry = self.entry(stix_type, phase)
+            entry["calls"] += 1
+            entry["bytes"] += size
+
+    def count_retry(self, stix_type: str):
+        with self.lock:
+            self.entry(stix_type, "create")["retries"] += 1
+
+    def report(self) -> Dict:
+        """the profile as a JSON serializable dict
+
+        :return: the total time and the `count`, `time`, `calls`, `bytes`
+            and `retries` per stix type and phase
+        :rtype: dict
+        """
+        with self.lock:
+            types = {}
+            for (stix_type, phase), entry in sorted(self.stats.items()):
+                types.setdefault(stix_type, {})[phase] = dict(
+                    entry, time=round(entry["time"], 6)
+                )
+            return {
+                "time": round(time.perf_counter() - self.started_at, 6),
+                "types": types,
+            }
+
+    def table(self) -> str:
+        """the profile as a text table, the slowest phases first"""
+        with self.lock:
+            rows = sorted(
+                self.stats.items(), key=lambda row: row[1]["time"], reverse=True
+            )
+        lines = [
+            "{:<32} {:<24} {:>8} {:>10} {:>8} {:>12} {:>8}".format(
+                "type", "phase", "count", "time", "calls", "bytes", "retries"
+            )
+        ]
+        for (stix_type, phase), entry in rows:
+            lines.append(
+                "{:<32} {:<24} {:>8} {:>10.3f} {:>8} {:>12} {:>8}".format(
+                    stix_type,
+                    phase,
+                    entry["count"],
+                    entry["time"],
+                    entry["calls"],
+                    entry["bytes"],
+                    entry["retries"],
+                )
+            )
+        return "\n".join(lines)
+
+
+def profiled(phase: str):
+    """measure a method of an object with a `profiler` as a phase"""
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.profiler is None:
+                return method(self, *args, **kwargs)
+            with self.profiler.measure(phase):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def profile_phase(profiler: Optional[ImportProfiler], phase: str, stix_type=None):
+    """measure a phase when profiling, a no-op context otherwise"""
+    if profiler is None:
+        return nullcontext()
+    return profiler.measure(phase, stix_type)
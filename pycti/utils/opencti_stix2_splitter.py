@@ -1,6 +1,7 @@
 import json
 import re
 import uuid
+from itertools import groupby
 from typing import Tuple
 
 from typing_extensions import deprecated
@@ -15,6 +16,9 @@ class OpenCTIStix2Splitter:
     def __init__(self):
         self.cache_index = {}
         self.elements = []
+        self.levels = {}
+        self.nb_deps = {}
+        self.ref_keys = {}
         self.unsupported_patterns = list(
             map(lambda pattern: re.compile(pattern), unsupported_ref_patterns)
         )
@@ -25,46 +29,154 @@ class OpenCTIStix2Splitter:
                 return False
         return True
 
-    def enlist_element(self, item_id, raw_data):
-        nb_deps = 1
-        if item_id not in raw_data:
-            return 0
-        existing_item = self.cache_index.get(item_id)
-        if existing_item is not None:
-            return existing_item["nb_deps"]
-        # Recursive enlist for every refs
-        item = raw_data[item_id]
-        for key in list(item.keys()):
-            value = item[key]
+    def ref_key_kind(self, key):
+        """`refs` or `ref` for the supported reference keys, None otherwise"""
+        kind = self.ref_keys.get(key, False)
+        if kind is False:
+            kind = None
             if key.endswith("_refs") and self.is_ref_key_supported(key):
-                to_keep = []
-                for element_ref in item[key]:
-                    if element_ref != item_id:
-                        nb_deps += self.enlist_element(element_ref, raw_data)
-                        to_keep.append(element_ref)
-                    item[key] = to_keep
+                kind = "refs"
             elif key.endswith("_ref") and self.is_ref_key_supported(key):
-                if item[key] == item_id:
-                    item[key] = None
-                else:
-                    # Need to handle the special case of recursive ref for created by ref
-                    is_created_by_ref = key == "created_by_ref"
-                    if is_created_by_ref:
-                        is_marking = item["id"].startswith("marking-definition--")
-                        if is_marking is False:
-                            nb_deps += self.enlist_element(value, raw_data)
+                kind = "ref"
+            self.ref_keys[key] = kind
+        return kind
+
+    def remove_self_refs(self, item) -> bool:
+        """remove the references of an element to itself
+
+        :return: True if the element was modified
+        :rtype: bool
+        """
+        item_id = item["id"]
+        modified = False
+        for key, value in item.items():
+            kind = self.ref_key_kind(key)
+            if kind == "refs" and isinstance(value, list) and item_id in value:
+                item[key] = [ref for ref in value if ref != item_id]
+                modified = True
+            elif kind == "ref" and value == item_id:
+                item[key] = None
+                modified = True
+        return modified
+
+    def compute_levels(self, raw_data) -> dict:
+        """dependency level of every element of the bundle
+
+        An element gets the first level following the levels of every element
+        it references. A reference cycle is broken at one of its elements,
+        at a `created_by_ref` when the cycle goes through one, so every
+        element gets a level.
+
+        :param raw_data: the elements of the bundle, by id
+        :type raw_data: dict
+        :return: the level of every element, by id, in the level order
+        :rtype: dict
+        """
+        pending_deps = {}
+        dependents = {}
+        for item_id, item in raw_data.items():
+            refs = self.item_refs(item)
+            if item_id in refs:
+                self.remove_self_refs(item)
+                refs = [ref for ref in refs if ref != item_id]
+            # Only the elements of the bundle are waited for, a repeated
+            # reference is counted and released as many times
+            count = 0
+            for ref in refs:
+                if ref in raw_data:
+                    count += 1
+                    if ref in dependents:
+                        dependents[ref].append(item_id)
                     else:
-                        nb_deps += self.enlist_element(value, raw_data)
-        # Get the final dep counting and add in cache
-        item["nb_deps"] = nb_deps
-        self.elements.append(item)
-        self.cache_index[item_id] = item  # Put in cache
-        return nb_deps
+                        dependents[ref] = [item_id]
+            pending_deps[item_id] = count
+        # One Kahn pass, level by level: the elements released by a level
+        # get the following one, with the dependency counts of the elements
+        # releasing them
+        self.nb_deps = nb_deps = dict.fromkeys(raw_data, 1)
+        levels = {}
+        level = 0
+        # Elements before the ones left all have a level
+        left = iter(raw_data)
+        current = [item_id for item_id, count in pending_deps.items() if count == 0]
+        while len(levels) < len(raw_data):
+            if len(current) == 0:
+                item_id = next(left)
+                while item_id in levels:
+                    item_id = next(left)
+                current = [self.break_cycle(raw_data, pending_deps, levels, item_id)]
+            following = []
+            for item_id in current:
+                levels[item_id] = level
+                if item_id not in dependents:
+                    continue
+                item_deps = nb_deps[item_id]
+                for dependent in dependents[item_id]:
+                    count = pending_deps[dependent] - 1
+                    pending_deps[dependent] = count
+                    # Below zero, the reference closed a broken cycle
+                    if count >= 0:
+                        nb_deps[dependent] += item_deps
+                        if count == 0:
+                            following.append(dependent)
+            current = following
+            level += 1
+        return levels
+
+    def break_cycle(self, raw_data, pending_deps, levels, item_id) -> str:
+        """release an element of a reference cycle, return its id
+
+        Every pending element references a pending element, so following
+        these references from the pending `item_id` ends in a cycle. Authors
+        are followed first, to break the cycle at a `created_by_ref`.
+        """
+        path = {}
+        while item_id not in path:
+            refs = [
+                ref
+                for ref in self.element_refs(raw_data[item_id])
+                if ref in raw_data and ref not in levels
+            ]
+            author = raw_data[item_id].get("created_by_ref")
+            path[item_id] = author if author in refs else refs[0]
+            item_id = path[item_id]
+        cycle = [item_id]
+        while path[cycle[-1]] != item_id:
+            cycle.append(path[cycle[-1]])
+        # Broken at an author if any, the element is imported before it
+        for cycle_id in cycle:
+            if path[cycle_id] == raw_data[cycle_id].get("created_by_ref"):
+                item_id = cycle_id
+                break
+        pending_deps[item_id] = 0
+        return item_id
 
     def split_bundle_with_expectations(
-        self, bundle, use_json=True, event_version=None
+        self,
+        bundle,
+        use_json=True,
+        event_version=None,
+        max_objects=1,
+        max_bytes=None,
     ) -> Tuple[int, list]:
-        """splits a valid stix2 bundle into a list of bundles"""
+        """splits a valid stix2 bundle into a list of bundles
+
+        Every bundle holds elements of a same dependency level, at most
+        `max_objects` of them and, when `max_bytes` is set, at most
+        `max_bytes` bytes of serialized elements (a larger element gets a
+        bundle of its own). The expectations count every element.
+
+        The elements of a JSON bundle are serialized once, for their size
+        and their bundle.
+
+        :param max_objects: maximum number of elements of a bundle, defaults
+            to 1
+        :type max_objects: int, optional
+        :param max_bytes: maximum JSON size of the elements of a bundle
+        :type max_bytes: int, optional
+        :return: the number of expectations and the bundles
+        :rtype: tuple
+        """
         if use_json:
             try:
                 bundle_data = json.loads(bundle)
@@ -83,35 +195,153 @@ class OpenCTIStix2Splitter:
         # Build flat list of elements
         for item in bundle_data["objects"]:
             raw_data[item["id"]] = item
-        for item in bundle_data["objects"]:
-            self.enlist_element(item["id"], raw_data)
+        self.levels = self.compute_levels(raw_data)
+        # Dependencies come first in the level order, the references closing
+        # a cycle are not counted
+        cache_index = self.cache_index
+        nb_deps = self.nb_deps
+        for item_id in self.levels:
+            item = raw_data[item_id]
+            item["nb_deps"] = nb_deps[item_id]
+            self.elements.append(item)
+            cache_index[item_id] = item
 
-        # Build the bundles
+        # Build the bundles, level by level
         bundles = []
+        encoded = None
+        if use_json:
+            encoded = {element["id"]: json.dumps(element) for element in self.elements}
+            prefix = '{"type": "bundle", "id": ' + json.dumps(bundle_data["id"])
+            suffix = ""
+            if event_version is not None:
+                suffix = ', "x_opencti_event_version": ' + json.dumps(event_version)
+        for level, elements in self.pack_elements(max_objects, max_bytes, encoded):
+            bundle_seq = (
+                elements[0]["nb_deps"]
+                if len(elements) == 1
+                else max(element["nb_deps"] for element in elements)
+            )
+            if use_json:
+                # Same fields as stix2_create_bundle, the objects last
+                bundles.append(
+                    prefix
+                    + ', "spec_version": "2.1", "x_opencti_seq": '
+                    + str(bundle_seq)
+                    + suffix
+                    + ', "x_opencti_level": '
+                    + str(level)
+                    + ', "objects": ['
+                    + ", ".join(encoded[element["id"]] for element in elements)
+                    + "]}"
+                )
+            else:
+                bundles.append(
+                    self.stix2_create_bundle(
+                        bundle_data["id"],
+                        bundle_seq,
+                        elements,
+                        use_json,
+                        event_version,
+                        level,
+                    )
+                )
 
-        def by_dep_size(elem):
-            return elem["nb_deps"]
-
-        self.elements.sort(key=by_dep_size)
+        return len(self.elements), bundles
 
-        elements_with_deps = list(
-            map(lambda e: {"nb_deps": e["nb_deps"], "elements": [e]}, self.elements)
-        )
+    def pack_elements(self, max_objects=1, max_bytes=None, encoded=None):
+        """group the consecutive elements of a level, within the bounds
 
-        number_expectations = 0
-        for entity in elements_with_deps:
-            number_expectations += len(entity["elements"])
-            bundles.append(
-                self.stix2_create_bundle(
-                    bundle_data["id"],
-                    entity["nb_deps"],
-                    entity["elements"],
-                    use_json,
-                    event_version,
-                )
+        :param encoded: JSON of the elements by id, serialized when missing
+        :type encoded: dict, optional
+        :return: the `(level, elements)` groups, in the elements order
+        :rtype: iterator
+        """
+        if max_bytes is None:
+            # Only the number of elements bounds the groups, the elements
+            # are in the level order
+            start = 0
+            for level, level_group in groupby(self.levels.values()):
+                end = start + sum(1 for _ in level_group)
+                for group_start in range(start, end, max_objects):
+                    yield level, self.elements[
+                        group_start : min(group_start + max_objects, end)
+                    ]
+                start = end
+            return
+        elements = []
+        size = 0
+        current_level = None
+        for element in self.elements:
+            level = self.levels[element["id"]]
+            element_size = len(
+                encoded[element["id"]] if encoded is not None else json.dumps(element)
             )
+            if len(elements) > 0 and (
+                level != current_level
+                or len(elements) >= max_objects
+                or size + element_size > max_bytes
+            ):
+                yield current_level, elements
+                elements = []
+                size = 0
+            current_level = level
+            elements.append(element)
+            size += element_size
+        if len(elements) > 0:
+            yield current_level, elements
+
+    def item_refs(self, item):
+        """list the ids an element references, itself included"""
+        ref_keys = self.ref_keys
+        refs = []
+        for key, value in item.items():
+            kind = ref_keys.get(key, False)
+            if kind is False:
+                kind = self.ref_key_kind(key)
+            if kind == "refs":
+                refs.extend(value or [])
+            elif kind == "ref" and value is not None:
+                if key == "created_by_ref" and item["id"].startswith(
+                    "marking-definition--"
+                ):
+                    continue
+                refs.append(value)
+        return refs
+
+    def element_refs(self, item):
+        """list the ids a stix2 element depends on, as ordered by `compute_levels`"""
+        return [ref for ref in self.item_refs(item) if ref != item["id"]]
+
+    def split_bundle_in_levels(self, bundle, use_json=True) -> list:
+        """splits a valid stix2 bundle into dependency levels
+
+        Elements of a level only reference elements of the previous levels,
+        so every level can be imported concurrently once the previous ones
+        are done. Reference cycles are broken as by `compute_levels`.
+
+        :param bundle: valid stix2 bundle
+        :return: list of lists of stix2 elements
+        :rtype: list
+        """
+        if use_json:
+            try:
+                bundle_data = json.loads(bundle)
+            except:
+                raise Exception("File data is not a valid JSON")
+        else:
+            bundle_data = bundle
+        if "objects" not in bundle_data:
+            raise Exception("File data is not a valid bundle")
 
-        return number_expectations, bundles
+        raw_data = {}
+        for item in bundle_data["objects"]:
+            raw_data[item["id"]] = item
+        levels = []
+        for item_id, level in self.compute_levels(raw_data).items():
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(raw_data[item_id])
+        return levels
 
     @deprecated("Use split_bundle_with_expectations instead")
     def split_bundle(self, bundle, use_json=True, event_version=None) -> list:
@@ -121,13 +351,18 @@ class OpenCTIStix2Splitter:
         return bundles
 
     @staticmethod
-    def stix2_create_bundle(bundle_id, bundle_seq, items, use_json, event_version=None):
+    def stix2_create_bundle(
+        bundle_id, bundle_seq, items, use_json, event_version=None, level=None
+    ):
         """create a stix2 bundle with items
 
         :param items: valid stix2 items
         :type items:
         :param use_json: use JSON?
         :type use_json:
+        :param level: dependency level of the items, bundles of a same level
+            can be imported in parallel
+        :type level: int, optional
         :return: JSON of the stix2 bundle
         :rtype:
         """
@@ -141,4 +376,6 @@ class OpenCTIStix2Splitter:
         }
         if event_version is not None:
             bundle["x_opencti_event_version"] = event_version
+        if level is not None:
+            bundle["x_opencti_level"] = level
         return json.dumps(bundle) if use_json else bundle
@@ -0,0 +1,359 @@
+import codecs
+import json
+import mmap
+import os
+import re
+import sqlite3
+import tempfile
+from typing import Callable, Dict, Iterator, List, Optional
+
+NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+# Number of values per "IN (...)" lookup, below the SQLite variables limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+class StixBundleReader:
+    """Incremental reader of the objects of a STIX2 bundle file
+
+    The objects are decoded one at a time while the file is read by chunks,
+    so a bundle is never loaded as a whole. The other fields of the bundle
+    are available in `header` once the objects are read.
+
+    :param file_path: path of the bundle file
+    :type file_path: str
+    :param use_mmap: read the file through a memory map, defaults to False
+    :type use_mmap: bool, optional
+    :param chunk_size: number of bytes read at once, defaults to 1 MiB
+    :type chunk_size: int, optional
+    """
+
+    def __init__(
+        self, file_path: str, use_mmap: bool = False, chunk_size: int = 1 << 20
+    ):
+        self.file_path = file_path
+        self.use_mmap = use_mmap
+        self.chunk_size = chunk_size
+        self.header = {}
+        self.decoder = json.JSONDecoder()
+        self.source = None
+        self.text_decoder = None
+        self.buffer = ""
+        self.offset = 0
+        self.eof = False
+
+    def __iter__(self) -> Iterator[Dict]:
+        with open(self.file_path, "rb") as file:
+            if self.use_mmap and os.path.getsize(self.file_path) > 0:
+                self.source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.source = file
+            self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+            self.buffer = ""
+            self.offset = 0
+            self.eof = False
+            try:
+                yield from self.read_objects()
+            finally:
+                if self.source is not file:
+                    self.source.close()
+                self.source = None
+
+    def fill(self, size: int) -> bool:
+        """append at least `size` bytes of the file to the buffer
+
+        :return: False at the end of the file
+        :rtype: bool
+        """
+        if self.eof:
+            return False
+        if self.offset > 0:
+            self.buffer = self.buffer[self.offset :]
+            self.offset = 0
+        data = self.source.read(max(size, self.chunk_size))
+        if len(data) == 0:
+            self.eof = True
+            self.buffer += self.text_decoder.decode(b"", final=True)
+            return False
+        self.buffer += self.text_decoder.decode(data)
+        return True
+
+    def next_char(self) -> str:
+        """skip the whitespaces, return the next character or "" at the end"""
+        while True:
+            match = NON_WHITESPACE.search(self.buffer, self.offset)
+            if match is not None:
+                self.offset = match.start()
+                return self.buffer[self.offset]
+            self.offset = len(self.buffer)
+            if not self.fill(self.chunk_size):
+                return ""
+
+    def expect(self, char: str):
+        if self.next_char() != char:
+            raise ValueError("JSON data is not a valid STIX2 bundle")
+        self.offset += 1
+
+    def decode_value(self):
+        self.next_char()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.offset)
+            except json.JSONDecodeError:
+                # Value truncated by the end of the buffer, double the buffer
+                if not self.fill(len(self.buffer) - self.offset):
+                    raise
+                continue
+            # A number could continue in the next chunk
+            if end == len(self.buffer) and self.fill(self.chunk_size):
+                continue
+            self.offset = end
+            return value
+
+    def read_objects(self) -> Iterator[Dict]:
+        self.expect("{")
+        while True:
+            char = self.next_char()
+            if char == "}":
+                self.offset += 1
+                return
+            if char == ",":
+                self.offset += 1
+                continue
+            if char == "":
+                raise ValueError("JSON data is not a valid STIX2 bundle")
+            key = self.decode_value()
+            self.expect(":")
+            if key != "objects":
+                self.header[key] = self.decode_value()
+                continue
+            self.expect("[")
+            while True:
+                char = self.next_char()
+                if char == "]":
+                    self.offset += 1
+                    break
+                if char == ",":
+                    self.offset += 1
+                    continue
+                if char == "":
+                    raise ValueError("JSON data is not a valid STIX2 bundle")
+                yield self.decode_value()
+
+
+class StixObjectIndex:
+    """On-disk index of the objects of a bundle, keyed by id
+
+    Objects are spilled to a SQLite file as they are read, their ids are
+    remapped and their dependency levels computed by SQL queries, so only a
+    batch of objects is held in memory at a time.
+
+    :param path: path of the SQLite file, a temporary file by default
+    :type path: str, optional
+    :param batch_size: number of objects written or read at once
+    :type batch_size: int, optional
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: int = 1000):
+        self.temporary = path is None
+        if self.temporary:
+            handle, path = tempfile.mkstemp(prefix="opencti-bundle-", suffix=".db")
+            os.close(handle)
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []
+        self.pending_ids = []
+        self.size = 0
+        self.connection = sqlite3.connect(path)
+        # The index only lives during the import, durability is not needed
+        self.connection.execute("PRAGMA journal_mode=OFF")
+        self.connection.execute("PRAGMA synchronous=OFF")
+        with self.connection:
+            for table in ["raw", "ids", "objects", "refs", "frontier", "touched"]:
+                self.connection.execute("DROP TABLE IF EXISTS " + table)
+            self.connection.execute(
+                "CREATE TABLE raw (position INTEGER PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE ids (original TEXT PRIMARY KEY, standard TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE objects (id TEXT PRIMARY KEY, "
+                "position INTEGER NOT NULL, data TEXT NOT NULL, level INTEGER, "
+                "pending INTEGER)"
+            )
+            self.connection.execute("CREATE TABLE refs (source TEXT, target TEXT)")
+            self.connection.execute("CREATE INDEX refs_source ON refs (source)")
+            self.connection.execute("CREATE INDEX refs_target ON refs (target)")
+            # Objects of the last assigned level, and their dependents; the
+            # queries walk them first (CROSS JOIN) to never scan the objects
+            self.connection.execute("CREATE TABLE frontier (id TEXT PRIMARY KEY)")
+            self.connection.execute(
+                "CREATE TABLE touched (id TEXT PRIMARY KEY, refs INTEGER)"
+            )
+            self.connection.execute(
+                "CREATE INDEX objects_level ON objects (level, position)"
+            )
+
+    def add(self, item: Dict, standard_id: Optional[str] = None):
+        """spill an object, with the standard id replacing its id if any"""
+        self.pending.append((self.size, json.dumps(item)))
+        if standard_id is not None:
+            self.pending_ids.append((item["id"], standard_id))
+        self.size += 1
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO raw (position, data) VALUES (?, ?)", self.pending
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO ids (original, standard) VALUES (?, ?)",
+                self.pending_ids,
+            )
+        self.pending = []
+        self.pending_ids = []
+
+    def lookup_ids(self, values: List[str]) -> Dict[str, str]:
+        cache_ids = {}
+        values = list(set(values))
+        for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+            chunk = values[start : start + LOOKUP_CHUNK_SIZE]
+            cache_ids.update(
+                self.connection.execute(
+                    "SELECT original, standard FROM ids WHERE original IN ("
+                    + ",".join("?" * len(chunk))
+                    + ")",
+                    chunk,
+                ).fetchall()
+            )
+        return cache_ids
+
+    def remap(
+        self,
+        remap_item: Callable[[Dict, Dict], None],
+        item_refs: Callable[[Dict], List[str]],
+    ):
+        """rewrite the ids of the spilled objects and index their references
+
+        :param remap_item: rewrites the ids of an object from a dict of the
+            standard ids, as `OpenCTIStix2.remap_item_ids`
+        :type remap_item: callable
+        :param item_refs: lists the ids an object depends on
+        :type item_refs: callable
+        """
+        self.flush()
+        position = -1
+        while True:
+            rows = self.connection.execute(
+                "SELECT position, data FROM raw WHERE position > ? "
+                "ORDER BY position LIMIT ?",
+                (position, self.batch_size),
+            ).fetchall()
+            if len(rows) == 0:
+                break
+            position = rows[-1][0]
+            items = [(row_position, json.loads(data)) for row_position, data in rows]
+            values = []
+            for _, item in items:
+                values.append(item["id"])
+                for key, value in item.items():
+                    if key.endswith("_refs") and isinstance(value, list):
+                        values.extend(ref for ref in value if isinstance(ref, str))
+                    elif key.endswith("_ref") and isinstance(value, str):
+                        values.append(value)
+            cache_ids = self.lookup_ids(values)
+            with self.connection:
+                for item_position, item in items:
+                    remap_item(item, cache_ids)
+                    # The last duplicate of an id wins, as in the splitter
+                    self.connection.execute(
+                        "DELETE FROM refs WHERE source = ?", (item["id"],)
+                    )
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO objects (id, position, data) "
+                        "VALUES (?, ?, ?)",
+                        (item["id"], item_position, json.dumps(item)),
+                    )
+                    self.connection.executemany(
+                        "INSERT INTO refs (source, target) VALUES (?, ?)",
+                        [(item["id"], ref) for ref in set(item_refs(item))],
+                    )
+        with self.connection:
+            self.connection.execute("DELETE FROM raw")
+            self.connection.execute("DELETE FROM ids")
+
+    def compute_levels(self) -> int:
+        """assign the dependency levels of the objects
+
+        An object gets the first level where every object it references is
+        in a previous level. Objects of a reference cycle share a last level.
+        Every object counts its pending references, and each level only
+        visits the dependents of the previous one.
+
+        :return: the number of levels
+        :rtype: int
+        """
+        level = 0
+        with self.connection:
+            self.connection.execute(
+                "UPDATE objects SET pending = (SELECT COUNT(*) FROM refs "
+                "JOIN objects AS target ON target.id = refs.target "
+                "WHERE refs.source = objects.id)"
+            )
+            self.connection.execute("DELETE FROM frontier")
+            self.connection.execute(
+                "INSERT INTO frontier (id) SELECT id FROM objects WHERE pending = 0"
+            )
+            while True:
+                cursor = self.connection.execute(
+                    "UPDATE objects SET level = ? "
+                    "WHERE id IN (SELECT id FROM frontier)",
+                    (level,),
+                )
+                if cursor.rowcount == 0:
+                    break
+                level += 1
+                self.connection.execute("DELETE FROM touched")
+                self.connection.execute(
+                    "INSERT INTO touched (id, refs) SELECT refs.source, COUNT(*) "
+                    "FROM frontier CROSS JOIN refs ON refs.target = frontier.id "
+                    "GROUP BY refs.source"
+                )
+                self.connection.execute(
+                    "UPDATE objects SET pending = pending - (SELECT refs "
+                    "FROM touched WHERE touched.id = objects.id) "
+                    "WHERE id IN (SELECT id FROM touched)"
+                )
+                self.connection.execute("DELETE FROM frontier")
+                self.connection.execute(
+                    "INSERT INTO frontier (id) SELECT objects.id FROM touched "
+                    "CROSS JOIN objects ON objects.id = touched.id "
+                    "WHERE objects.pending = 0 AND objects.level IS NULL"
+                )
+            cursor = self.connection.execute(
+                "UPDATE objects SET level = ? WHERE level IS NULL", (level,)
+            )
+            if cursor.rowcount > 0:
+                level += 1
+        return level
+
+    def iter_level(self, level: int) -> Iterator[List[Dict]]:
+        """yield the objects of a level by batches, in the bundle order"""
+        position = -1
+        while True:
+            rows = self.connection.execute(
+                "SELECT position, data FROM objects WHERE level = ? "
+                "AND position > ? ORDER BY position LIMIT ?",
+                (level, position, self.batch_size),
+            ).fetchall()
+            if len(rows) == 0:
+                return
+            position = rows[-1][0]
+            yield [json.loads(data) for _, data in rows]
+
+    def close(self):
+        self.connection.close()
+        if self.temporary and os.path.exists(self.path):
+            os.remove(self.path)
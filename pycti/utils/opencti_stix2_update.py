@@ -1,7 +1,15 @@
 # coding: utf-8
 
+import json
+import threading
+import time
+from contextlib import contextmanager
+
 from pycti.utils.constants import StixCyberObservableTypes
 
+# Number of flushes a failed coalesced patch is tried by before being dropped
+PATCH_MAX_ATTEMPTS = 3
+
 
 class OpenCTIStix2Update:
     """Python API for Stix2 Update in OpenCTI
@@ -12,52 +20,67 @@ class OpenCTIStix2Update:
     def __init__(self, opencti):
         self.opencti = opencti
         self.mapping_cache = {}
+        self.coalesce_window = None
+        self.pending_updates = {}
+        self.pending_count = 0
+        self.pending_since = None
+        self.pending_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        # Stream positions: last processed event, and the event preceding the
+        # oldest pending or flushing patch
+        self.last_position = None
+        self.pending_position = None
+        self.flushing_position = None
+
+    def edit_api(self, entity_type):
+        if entity_type == "relationship":
+            return self.opencti.stix_core_relationship
+        elif entity_type == "sighting":
+            return self.opencti.stix_sighting_relationship
+        elif StixCyberObservableTypes.has_value(entity_type):
+            return self.opencti.stix_cyber_observable
+        else:
+            return self.opencti.stix_domain_object
+
+    def edit_relations(self, entity_type, **kwargs):
+        # Failed edits are raised as the single relation edits did
+        if not self.edit_api(entity_type).edit_relations(**kwargs):
+            raise ValueError(
+                {
+                    "name": "Edit relations error",
+                    "error_message": "Cannot edit the ref relations of "
+                    + str(kwargs.get("id")),
+                }
+            )
 
     def add_object_marking_refs(self, entity_type, id, object_marking_refs, version=2):
-        for object_marking_ref in object_marking_refs:
-            if version == 2:
-                object_marking_ref = object_marking_ref["value"]
-            if entity_type == "relationship":
-                self.opencti.stix_core_relationship.add_marking_definition(
-                    id=id, marking_definition_id=object_marking_ref
-                )
-            elif entity_type == "sighting":
-                self.opencti.stix_sighting_relationship.add_marking_definition(
-                    id=id, marking_definition_id=object_marking_ref
-                )
-            elif StixCyberObservableTypes.has_value(entity_type):
-                self.opencti.stix_cyber_observable.add_marking_definition(
-                    id=id, marking_definition_id=object_marking_ref
-                )
-            else:
-                self.opencti.stix_domain_object.add_marking_definition(
-                    id=id, marking_definition_id=object_marking_ref
-                )
+        if version == 2:
+            object_marking_refs = [ref["value"] for ref in object_marking_refs]
+        self.edit_relations(
+            entity_type,
+            id=id,
+            add=[
+                {"toId": object_marking_ref, "relationship_type": "object-marking"}
+                for object_marking_ref in object_marking_refs
+            ],
+        )
 
     def remove_object_marking_refs(
         self, entity_type, id, object_marking_refs, version=2
     ):
-        for object_marking_ref in object_marking_refs:
-            if version == 2:
-                object_marking_ref = object_marking_ref["value"]
-            if entity_type == "relationship":
-                self.opencti.stix_core_relationship.remove_marking_definition(
-                    id=id, marking_definition_id=object_marking_ref
-                )
-            elif entity_type == "sighting":
-                self.opencti.stix_sighting_relationship.remove_marking_definition(
-                    id=id, marking_definition_id=object_marking_ref
-                )
-            elif StixCyberObservableTypes.has_value(entity_type):
-                self.opencti.stix_cyber_observable.remove_marking_definition(
-                    id=id, marking_definition_id=object_marking_ref
-                )
-            else:
-                self.opencti.stix_domain_object.remove_marking_definition(
-                    id=id, marking_definition_id=object_marking_ref
-                )
+        if version == 2:
+            object_marking_refs = [ref["value"] for ref in object_marking_refs]
+        self.edit_relations(
+            entity_type,
+            id=id,
+            remove=[
+                {"toId": object_marking_ref, "relationship_type": "object-marking"}
+                for object_marking_ref in object_marking_refs
+            ],
+        )
 
     def add_external_references(self, entity_type, id, external_references, version=2):
+        external_reference_ids = []
         for external_reference in external_references:
             if version == 2:
                 external_reference = external_reference["value"]
@@ -80,35 +103,34 @@ class OpenCTIStix2Update:
                     else None
                 ),
             )["id"]
-            if entity_type == "relationship":
-                self.opencti.stix_core_relationship.add_external_reference(
-                    id=id, external_reference_id=external_reference_id
-                )
-            elif StixCyberObservableTypes.has_value(entity_type):
-                self.opencti.stix_cyber_observable.add_external_reference(
-                    id=id, external_reference_id=external_reference_id
-                )
-            else:
-                self.opencti.stix_domain_object.add_external_reference(
-                    id=id, external_reference_id=external_reference_id
-                )
+            external_reference_ids.append(external_reference_id)
+        self.edit_relations(
+            entity_type,
+            id=id,
+            add=[
+                {
+                    "toId": external_reference_id,
+                    "relationship_type": "external-reference",
+                }
+                for external_reference_id in external_reference_ids
+            ],
+        )
 
     def remove_external_references(self, entity_type, id, external_references):
-        for external_reference in external_references:
-            if entity_type == "relationship":
-                self.opencti.stix_core_relationship.remove_external_reference(
-                    id=id, external_reference_id=external_reference["id"]
-                )
-            elif StixCyberObservableTypes.has_value(entity_type):
-                self.opencti.stix_cyber_observable.remove_external_reference(
-                    id=id, external_reference_id=external_reference["id"]
-                )
-            else:
-                self.opencti.stix_domain_object.remove_external_reference(
-                    id=id, external_reference_id=external_reference["id"]
-                )
+        self.edit_relations(
+            entity_type,
+            id=id,
+            remove=[
+                {
+                    "toId": external_reference["id"],
+                    "relationship_type": "external-reference",
+                }
+                for external_reference in external_references
+            ],
+        )
 
     def add_kill_chain_phases(self, entity_type, id, kill_chain_phases, version=2):
+        kill_chain_phase_ids = []
         for kill_chain_phase in kill_chain_phases:
             if version == 2:
                 kill_chain_phase = kill_chain_phase["value"]
@@ -122,33 +144,28 @@ class OpenCTIStix2Update:
                 ),
                 stix_id=kill_chain_phase["id"] if "id" in kill_chain_phase else None,
             )["id"]
-            if entity_type == "relationship":
-                self.opencti.stix_core_relationship.add_kill_chain_phase(
-                    id=id, kill_chain_phase_id=kill_chain_phase_id
-                )
-            elif StixCyberObservableTypes.has_value(entity_type):
-                self.opencti.stix_cyber_observable.add_kill_chain_phase(
-                    id=id, kill_chain_phase_id=kill_chain_phase_id
-                )
-            else:
-                self.opencti.stix_domain_object.add_kill_chain_phase(
-                    id=id, kill_chain_phase_id=kill_chain_phase_id
-                )
+            kill_chain_phase_ids.append(kill_chain_phase_id)
+        self.edit_relations(
+            entity_type,
+            id=id,
+            add=[
+                {"toId": kill_chain_phase_id, "relationship_type": "kill-chain-phase"}
+                for kill_chain_phase_id in kill_chain_phase_ids
+            ],
+        )
 
     def remove_kill_chain_phases(self, entity_type, id, kill_chain_phases):
-        for kill_chain_phase in kill_chain_phases:
-            if entity_type == "relationship":
-                self.opencti.stix_core_relationship.remove_kill_chain_phase(
-                    id=id, kill_chain_phase_id=kill_chain_phase["id"]
-                )
-            elif StixCyberObservableTypes.has_value(entity_type):
-                self.opencti.stix_cyber_observable.remove_kill_chain_phase(
-                    id=id, kill_chain_phase_id=kill_chain_phase["id"]
-                )
-            else:
-                self.opencti.stix_domain_object.remove_kill_chain_phase(
-                    id=id, kill_chain_phase_id=kill_chain_phase["id"]
-                )
+        self.edit_relations(
+            entity_type,
+            id=id,
+            remove=[
+                {
+                    "toId": kill_chain_phase["id"],
+                    "relationship_type": "kill-chain-phase",
+                }
+                for kill_chain_phase in kill_chain_phases
+            ],
+        )
 
     def add_object_refs(self, entity_type, id, object_refs, version=2):
         for object_ref in object_refs:
@@ -193,28 +210,44 @@ class OpenCTIStix2Update:
                 )
 
     def add_labels(self, entity_type, id, labels, version=2):
+        label_ids = []
         for label in labels:
             if version == 2:
                 label = label["value"]
-            if entity_type == "relationship":
-                self.opencti.stix_core_relationship.add_label(id=id, label_name=label)
-            elif StixCyberObservableTypes.has_value(entity_type):
-                self.opencti.stix_cyber_observable.add_label(id=id, label_name=label)
-            else:
-                self.opencti.stix_domain_object.add_label(id=id, label_name=label)
+            label = self.opencti.label.read_or_create_unchecked(value=label)
+            if label is not None:
+                label_ids.append(label["id"])
+        self.edit_relations(
+            entity_type,
+            id=id,
+            add=[
+                {"toId": label_id, "relationship_type": "object-label"}
+                for label_id in label_ids
+            ],
+        )
 
     def remove_labels(self, entity_type, id, labels, version=2):
+        label_ids = []
         for label in labels:
             if version == 2:
                 label = label["value"]
-            if entity_type == "relationship":
-                self.opencti.stix_core_relationship.remove_label(
-                    id=id, label_name=label
-                )
-            elif StixCyberObservableTypes.has_value(entity_type):
-                self.opencti.stix_cyber_observable.remove_label(id=id, label_name=label)
-            else:
-                self.opencti.stix_domain_object.remove_label(id=id, label_name=label)
+            label = self.opencti.label.read(
+                filters={
+                    "mode": "and",
+                    "filters": [{"key": "value", "values": [label]}],
+                    "filterGroups": [],
+                }
+            )
+            if label is not None:
+                label_ids.append(label["id"])
+        self.edit_relations(
+            entity_type,
+            id=id,
+            remove=[
+                {"toId": label_id, "relationship_type": "object-label"}
+                for label_id in label_ids
+            ],
+        )
 
     def replace_created_by_ref(self, entity_type, id, created_by_ref, version=2):
         if version == 2:
@@ -262,48 +295,233 @@ class OpenCTIStix2Update:
         else:
             self.opencti.stix_domain_object.update_field(id=id, input=input)
 
+    @staticmethod
+    def patch_inputs(patch):
+        # Build the inputs fo update api
+        inputs = []
+        if "add" in patch:
+            for key in patch["add"].keys():
+                val = patch["add"][key]
+                values = list(map(lambda x: x["value"] if "value" in x else x, val))
+                inputs.append({"key": key, "value": values, "operation": "add"})
+        if "remove" in patch:
+            for key in patch["remove"].keys():
+                val = patch["remove"][key]
+                values = list(map(lambda x: x["value"] if "value" in x else x, val))
+                inputs.append({"key": key, "value": values, "operation": "remove"})
+        if "replace" in patch:
+            for key in patch["replace"].keys():
+                if key != "id":  # ID replace is a side effect handled by the platform
+                    val = patch["replace"][key]
+                    current_val = val["current"]
+                    if type(current_val) is list:
+                        values = list(
+                            map(
+                                lambda x: (
+                                    x["value"]
+                                    if (type(current_val) is dict and "value" in x)
+                                    else x
+                                ),
+                                str(current_val),
+                            )
+                        )
+                        inputs.append({"key": key, "value": values})
+                    else:
+                        values = (
+                            current_val["value"]
+                            if (type(current_val) is dict and "value" in current_val)
+                            else str(current_val)
+                        )
+                        inputs.append({"key": key, "value": values})
+        return inputs
+
+    @contextmanager
+    def coalescing(self, max_patches=500, max_delay=1.0):
+        """coalesce the patches processed inside the context
+
+        Patches of the same entity are merged into their net delta and
+        applied with one `fieldPatch` per entity, when `max_patches` patches
+        are pending, when the oldest one waits for `max_delay` seconds (a
+        timer checks it while no patch arrives) and when leaving the context.
+        Other events must call `flush_updates` first to keep their order
+        with the patches, and the stream position must be saved from
+        `stream_position`, as `ListenStream` does.
+
+        :param max_patches: number of pending patches triggering a flush
+        :type max_patches: int, optional
+        :param max_delay: seconds after which pending patches are flushed
+        :type max_delay: float, optional
+        """
+        self.coalesce_window = {"max_patches": max_patches, "max_delay": max_delay}
+        stop_timer = threading.Event()
+        timer = threading.Thread(
+            target=self.flush_timer, args=(stop_timer, max_delay), daemon=True
+        )
+        timer.start()
+        try:
+            yield self
+        finally:
+            stop_timer.set()
+            timer.join()
+            self.coalesce_window = None
+            self.flush_updates()
+            with self.pending_lock:
+                for id in self.pending_updates:
+                    self.opencti.app_logger.error(
+                        "Dropping a coalesced patch", {"id": id}
+                    )
+                self.pending_updates = {}
+                self.pending_count = 0
+
+    def flush_timer(self, stop_timer, max_delay):
+        while not stop_timer.wait(max_delay / 2):
+            self.flush_expired_updates()
+
+    def flush_expired_updates(self):
+        with self.pending_lock:
+            expired = (
+                self.coalesce_window is not None
+                and len(self.pending_updates) > 0
+                and time.monotonic() - self.pending_since
+                >= self.coalesce_window["max_delay"]
+            )
+        if expired:
+            self.flush_updates()
+
+    def stream_position(self, position):
+        """record the position of the last processed stream event
+
+        :param position: id of the last processed event
+        :type position: str
+        :return: the position the stream can resume from, before the patches
+            not applied yet
+        :rtype: str
+        """
+        with self.pending_lock:
+            self.last_position = position
+            if self.flushing_position is not None:
+                return self.flushing_position
+            if len(self.pending_updates) > 0:
+                return self.pending_position
+            return position
+
+    def coalesce_update(self, data):
+        with self.pending_lock:
+            if len(self.pending_updates) == 0:
+                self.pending_since = time.monotonic()
+                self.pending_position = self.last_position
+            pending = self.pending_updates.setdefault(
+                data["id"],
+                {"type": data["type"], "replace": {}, "values": {}, "attempts": 0},
+            )
+            for input in self.patch_inputs(data["x_opencti_patch"]):
+                key = input["key"]
+                if "operation" not in input:
+                    # A replace supersedes the previous operations of the key
+                    pending["replace"][key] = input["value"]
+                    pending["values"].pop(key, None)
+                    continue
+                values = pending["values"].setdefault(key, {})
+                for value in input["value"]:
+                    # The last operation on a value wins
+                    value_key = json.dumps(value, sort_keys=True, default=str)
+                    values.pop(value_key, None)
+                    values[value_key] = (input["operation"], value)
+            self.pending_count += 1
+            full = (
+                self.pending_count >= self.coalesce_window["max_patches"]
+                or time.monotonic() - self.pending_since
+                >= self.coalesce_window["max_delay"]
+            )
+        if full:
+            self.flush_updates()
+
+    @staticmethod
+    def merge_pending(older, newer):
+        # The newer patches of an entity win over the older ones
+        for key, value in older["replace"].items():
+            if key not in newer["replace"]:
+                newer["replace"][key] = value
+        for key, values in older["values"].items():
+            if key in newer["replace"]:
+                continue
+            newer_values = newer["values"].get(key, {})
+            merged = dict(values)
+            for value_key, operation in newer_values.items():
+                merged.pop(value_key, None)
+                merged[value_key] = operation
+            newer["values"][key] = merged
+        newer["attempts"] = older["attempts"]
+        return newer
+
+    @staticmethod
+    def pending_inputs(pending):
+        inputs = [
+            {"key": key, "value": value} for key, value in pending["replace"].items()
+        ]
+        for key, values in pending["values"].items():
+            for operation in ["add", "remove"]:
+                operation_values = [
+                    value for op, value in values.values() if op == operation
+                ]
+                if len(operation_values) > 0:
+                    inputs.append(
+                        {"key": key, "value": operation_values, "operation": operation}
+                    )
+        return inputs
+
+    def flush_updates(self):
+        """apply the pending patches, one `fieldPatch` per entity
+
+        Flushes run one at a time and send their requests outside of
+        `pending_lock`, so the patches keep being coalesced meanwhile. A
+        failed patch stays pending for the next flush, and is dropped after
+        `PATCH_MAX_ATTEMPTS` flushes.
+        """
+        with self.flush_lock:
+            with self.pending_lock:
+                pending_updates = self.pending_updates
+                self.flushing_position = self.pending_position
+                self.pending_updates = {}
+                self.pending_count = 0
+            failed = {}
+            for id, pending in pending_updates.items():
+                inputs = self.pending_inputs(pending)
+                if len(inputs) == 0:
+                    continue
+                try:
+                    self.update_attribute(pending["type"], id, inputs)
+                except Exception as err:
+                    pending["attempts"] += 1
+                    if pending["attempts"] < PATCH_MAX_ATTEMPTS:
+                        self.opencti.app_logger.warning(
+                            "Cannot apply a coalesced patch, retrying",
+                            {"id": id, "reason": str(err)},
+                        )
+                        failed[id] = pending
+                    else:
+                        self.opencti.app_logger.error(str(err))
+            with self.pending_lock:
+                if len(failed) > 0:
+                    # Failed patches are older than the ones arrived meanwhile
+                    for id, newer in self.pending_updates.items():
+                        failed[id] = (
+                            self.merge_pending(failed[id], newer)
+                            if id in failed
+                            else newer
+                        )
+                    self.pending_updates = failed
+                    self.pending_count = len(failed)
+                    self.pending_since = time.monotonic()
+                    self.pending_position = self.flushing_position
+                self.flushing_position = None
+
     def process_update(self, data):
         try:
-            # Build the inputs fo update api
-            inputs = []
-            if "add" in data["x_opencti_patch"]:
-                for key in data["x_opencti_patch"]["add"].keys():
-                    val = data["x_opencti_patch"]["add"][key]
-                    values = list(map(lambda x: x["value"] if "value" in x else x, val))
-                    inputs.append({"key": key, "value": values, "operation": "add"})
-            if "remove" in data["x_opencti_patch"]:
-                for key in data["x_opencti_patch"]["remove"].keys():
-                    val = data["x_opencti_patch"]["remove"][key]
-                    values = list(map(lambda x: x["value"] if "value" in x else x, val))
-                    inputs.append({"key": key, "value": values, "operation": "remove"})
-            if "replace" in data["x_opencti_patch"]:
-                for key in data["x_opencti_patch"]["replace"].keys():
-                    if (
-                        key != "id"
-                    ):  # ID replace is a side effect handled by the platform
-                        val = data["x_opencti_patch"]["replace"][key]
-                        current_val = val["current"]
-                        if type(current_val) is list:
-                            values = list(
-                                map(
-                                    lambda x: (
-                                        x["value"]
-                                        if (type(current_val) is dict and "value" in x)
-                                        else x
-                                    ),
-                                    str(current_val),
-                                )
-                            )
-                            inputs.append({"key": key, "value": values})
-                        else:
-                            values = (
-                                current_val["value"]
-                                if (
-                                    type(current_val) is dict and "value" in current_val
-                                )
-                                else str(current_val)
-                            )
-                            inputs.append({"key": key, "value": values})
-            self.update_attribute(data["type"], data["id"], inputs)
+            if self.coalesce_window is not None:
+                self.coalesce_update(data)
+            else:
+                inputs = self.patch_inputs(data["x_opencti_patch"])
+                self.update_attribute(data["type"], data["id"], inputs)
         except Exception as err:
             self.opencti.app_logger.error(str(err))
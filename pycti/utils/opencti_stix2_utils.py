@@ -1,5 +1,10 @@
-from typing import Any, Dict
+import base64
+import datetime
+import re
+import tempfile
+from typing import Any, Dict, Optional
 
+import datefinder
 from stix2 import EqualityComparisonExpression, ObjectPath, ObservationExpression
 
 STIX_CYBER_OBSERVABLE_MAPPING = {
@@ -74,8 +79,136 @@ OBSERVABLES_VALUE_INT = [
     "Process.pid",
 ]
 
+MONTHS = {
+    "january": 1,
+    "february": 2,
+    "march": 3,
+    "april": 4,
+    "may": 5,
+    "june": 6,
+    "july": 7,
+    "august": 8,
+    "september": 9,
+    "october": 10,
+    "november": 11,
+    "december": 12,
+}
+MONTH_NAMES = dict(
+    list(MONTHS.items())
+    + [(name[:3], month) for name, month in MONTHS.items()]
+    + [("sept", 9)]
+)
+MONTH_PATTERN = "|".join(sorted(MONTH_NAMES, key=len, reverse=True))
+# The usual dates of the references descriptions, in a single pass
+DATE_PATTERN = re.compile(
+    r"\b(?:"
+    r"(?P<iso_year>\d{4})[-/](?P<iso_month>\d{1,2})[-/](?P<iso_day>\d{1,2})"
+    r"|(?P<ymd_year>\d{4}),?\s+(?P<ymd_month>"
+    + MONTH_PATTERN
+    + r")\.?\s+(?P<ymd_day>\d{1,2})"
+    r"|(?P<dmy_day>\d{1,2})(?:st|nd|rd|th)?\s+(?P<dmy_month>"
+    + MONTH_PATTERN
+    + r")\.?,?\s+(?P<dmy_year>\d{4})"
+    r"|(?P<mdy_month>"
+    + MONTH_PATTERN
+    + r")\.?\s+(?P<mdy_day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<mdy_year>\d{4})"
+    r"|(?P<my_month>" + MONTH_PATTERN + r")\.?,?\s+(?P<my_year>\d{4})"
+    r")\b",
+    re.IGNORECASE,
+)
+# Number of characters of a text searched for a date
+DATE_SCAN_WINDOW = 2000
+# Characters outside of the base64 alphabet, discarded as by b64decode
+BASE64_IGNORED = re.compile(r"[^A-Za-z0-9+/=]")
+# Number of base64 characters decoded at once
+FILE_DECODE_CHUNK_SIZE = 1 << 20
+# Size in bytes of a decoded file kept in memory before spilling to disk
+FILE_SPOOL_SIZE = 1 << 22
+
 
 class OpenCTIStix2Utils:
+    @staticmethod
+    def find_date(
+        text: str, before: datetime.datetime, window: int = DATE_SCAN_WINDOW
+    ) -> Optional[datetime.datetime]:
+        """first date of a text prior to `before`
+
+        Only the first `window` characters are searched, with a precompiled
+        pattern of the usual formats first, then with datefinder.
+
+        :param text: the text to search
+        :type text: str
+        :param before: dates from this one on are ignored
+        :type before: datetime.datetime
+        :param window: number of characters searched, defaults to 2000
+        :type window: int, optional
+        :return: the date, None if not found
+        :rtype: datetime.datetime
+        """
+        if not text:
+            return None
+        text = text[:window]
+        for match in DATE_PATTERN.finditer(text):
+            for form in ["iso", "ymd", "dmy", "mdy", "my"]:
+                if match.group(form + "_year") is not None:
+                    month = match.group(form + "_month")
+                    day = match.group(form + "_day") if form != "my" else 1
+                    break
+            try:
+                date = datetime.datetime(
+                    int(match.group(form + "_year")),
+                    int(month) if month.isdigit() else MONTH_NAMES[month.lower()],
+                    int(day),
+                )
+            except ValueError:
+                continue
+            if date < before:
+                return date
+        try:
+            for date in datefinder.find_dates(
+                text, base_date=datetime.datetime.fromtimestamp(0)
+            ):
+                if date.timestamp() < before.timestamp() and len(str(date.year)) == 4:
+                    return date
+        except Exception:  # pylint: disable=broad-except
+            pass
+        return None
+
+    @staticmethod
+    def decode_file(
+        data: str,
+        chunk_size: int = FILE_DECODE_CHUNK_SIZE,
+        spool_size: int = FILE_SPOOL_SIZE,
+    ) -> tempfile.SpooledTemporaryFile:
+        """decode the base64 content of an embedded file by chunks
+
+        The decoded bytes go to a temporary file, held in memory up to
+        `spool_size` bytes then on disk, so a large file is never decoded
+        as a whole.
+
+        :param data: the base64 content
+        :type data: str
+        :param chunk_size: number of characters decoded at once
+        :type chunk_size: int, optional
+        :param spool_size: bytes kept in memory, defaults to 4 MiB
+        :type spool_size: int, optional
+        :return: the decoded file, at its start
+        :rtype: tempfile.SpooledTemporaryFile
+        """
+        file = tempfile.SpooledTemporaryFile(max_size=spool_size)
+        remainder = ""
+        for start in range(0, len(data), chunk_size):
+            chunk = remainder + BASE64_IGNORED.sub("", data[start : start + chunk_size])
+            # Only whole groups of 4 characters decode on their own
+            end = len(chunk) - len(chunk) % 4
+            file.write(base64.b64decode(chunk[:end]))
+            remainder = chunk[end:]
+        if len(remainder) > 0:
+            # Incomplete last group, rejected as by b64decode on the whole content
+            file.write(base64.b64decode(remainder))
+        file.seek(0)
+        return file
+
     @staticmethod
     def stix_observable_opencti_type(observable_type):
         if observable_type in STIX_CYBER_OBSERVABLE_MAPPING:
@@ -0,0 +1,73 @@
+"""Benchmark of the standard id generation of the bundles sent by connectors
+
+Usage: python scripts/benchmark_stix2_ids.py [--objects 100000] [--runs 3]
+
+A synthetic bundle of entities and relationships is prepared `--runs` times
+by the same client, as a connector sending the same entities every run.
+"""
+
+import argparse
+import copy
+import time
+
+from pycti import OpenCTIApiClient, OpenCTIStix2
+
+
+def synthetic_bundle(objects):
+    items = []
+    index = 0
+    while len(items) < objects:
+        items.append(
+            {
+                "id": "malware--" + str(index),
+                "type": "malware",
+                "name": "Malware " + str(index),
+            }
+        )
+        items.append(
+            {
+                "id": "identity--" + str(index),
+                "type": "identity",
+                "name": "Organization " + str(index % 100),
+                "identity_class": "organization",
+            }
+        )
+        items.append(
+            {
+                "id": "relationship--" + str(index),
+                "type": "relationship",
+                "relationship_type": "targets",
+                "source_ref": "malware--" + str(index),
+                "target_ref": "identity--" + str(index),
+                "start_time": "2024-01-01T00:00:00.000Z",
+            }
+        )
+        index += 1
+    return {"type": "bundle", "id": "bundle--benchmark", "objects": items[:objects]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=3)
+    arguments = parser.parse_args()
+
+    client = OpenCTIApiClient(
+        "http://localhost:4000", "benchmark", perform_health_check=False
+    )
+    helper = OpenCTIStix2(client)
+    bundle = synthetic_bundle(arguments.objects)
+    for run in range(1, arguments.runs + 1):
+        run_bundle = copy.deepcopy(bundle)
+        start = time.perf_counter()
+        helper.prepare_bundle_ids(run_bundle, use_json=False)
+        elapsed = time.perf_counter() - start
+        print(
+            "run {}: {} objects prepared in {:.2f}s ({:.0f} objects/s)".format(
+                run, arguments.objects, elapsed, arguments.objects / elapsed
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
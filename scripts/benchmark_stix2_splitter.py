@@ -0,0 +1,98 @@
+"""Benchmark of the STIX2 bundle splitter on synthetic bundles
+
+Usage: python scripts/benchmark_stix2_splitter.py [--objects 1000000] [--json]
+
+The bundles mix authors, markings, entities, relationships between entities
+and reports referencing them, with an author chain as deep as `--depth`.
+"""
+
+import argparse
+import json
+import time
+
+from pycti.utils.opencti_stix2_splitter import OpenCTIStix2Splitter
+
+
+def synthetic_bundle(objects, depth):
+    items = [
+        {
+            "id": "marking-definition--0",
+            "type": "marking-definition",
+            "created_by_ref": "identity--0",
+        }
+    ]
+    authors = min(depth, max(objects // 100, 1))
+    for index in range(authors):
+        item = {"id": "identity--" + str(index), "type": "identity"}
+        if index > 0:
+            item["created_by_ref"] = "identity--" + str(index - 1)
+        items.append(item)
+    index = 0
+    while len(items) < objects:
+        author = "identity--" + str(index % authors)
+        malware = "malware--" + str(index)
+        items.append(
+            {
+                "id": malware,
+                "type": "malware",
+                "created_by_ref": author,
+                "object_marking_refs": ["marking-definition--0"],
+            }
+        )
+        if index > 0:
+            items.append(
+                {
+                    "id": "relationship--" + str(index),
+                    "type": "relationship",
+                    "source_ref": malware,
+                    "target_ref": "malware--" + str(index - 1),
+                    "created_by_ref": author,
+                }
+            )
+        if index % 10 == 9:
+            items.append(
+                {
+                    "id": "report--" + str(index),
+                    "type": "report",
+                    "created_by_ref": author,
+                    "object_refs": [
+                        "malware--" + str(ref) for ref in range(index - 9, index + 1)
+                    ],
+                }
+            )
+        index += 1
+    # Dependents first, the worst order for the splitter
+    items.reverse()
+    return {"type": "bundle", "id": "bundle--benchmark", "objects": items[:objects]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=1000000)
+    parser.add_argument("--depth", type=int, default=10000)
+    parser.add_argument(
+        "--json", action="store_true", help="split the bundle JSON into JSON bundles"
+    )
+    arguments = parser.parse_args()
+
+    bundle = synthetic_bundle(arguments.objects, arguments.depth)
+    if arguments.json:
+        bundle = json.dumps(bundle)
+    splitter = OpenCTIStix2Splitter()
+    start = time.perf_counter()
+    expectations, bundles = splitter.split_bundle_with_expectations(
+        bundle, arguments.json
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        "{} objects, {} levels: split in {:.2f}s ({:.0f} objects/s)".format(
+            expectations,
+            max(splitter.levels.values()) + 1,
+            elapsed,
+            expectations / elapsed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
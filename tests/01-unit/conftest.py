@@ -0,0 +1,34 @@
+import pytest
+
+from pycti import OpenCTIApiClient, OpenCTIStix2
+
+
+class FakeResponse:
+    status_code = 200
+    request = None
+    content = b""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def fake_response():
+    """response of the API, built from its JSON payload"""
+    return FakeResponse
+
+
+@pytest.fixture
+def fake_client():
+    """client of an unreachable platform, for the tests sending no request"""
+    return OpenCTIApiClient(
+        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
+    )
+
+
+@pytest.fixture
+def fake_stix2(fake_client):
+    return OpenCTIStix2(fake_client)
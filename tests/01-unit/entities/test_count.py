@@ -0,0 +1,34 @@
+from pycti import DistributionFields
+
+
+def test_count_requests_only_global_count(fake_client, monkeypatch):
+    calls = []
+
+    def fake_query(query, variables=None):
+        calls.append((query, variables))
+        return {"data": {"indicators": {"pageInfo": {"globalCount": 42}}}}
+
+    monkeypatch.setattr(fake_client, "query", fake_query)
+    assert fake_client.indicator.count(search="evil") == 42
+    query, variables = calls[0]
+    assert "globalCount" in query
+    assert "edges" not in query
+    assert variables == {"filters": None, "search": "evil"}
+
+
+def test_count_by_resolves_distribution_field(fake_client, monkeypatch):
+    calls = []
+
+    def fake_query(query, variables=None):
+        calls.append((query, variables))
+        return {
+            "data": {"stixCoreObjectsDistribution": [{"label": "Malware", "value": 3}]}
+        }
+
+    monkeypatch.setattr(fake_client, "query", fake_query)
+    groups = fake_client.stix_core_object.count_by(
+        field=DistributionFields.OBJECT_MARKING, types=["Malware"]
+    )
+    assert groups == [{"label": "Malware", "value": 3}]
+    assert calls[0][1]["field"] == "object-marking.internal_id"
+    assert calls[0][1]["types"] == ["Malware"]
@@ -0,0 +1,47 @@
+from pycti import OpenCTIApiClient
+
+
+def test_build_multiple_query_aliases_operations():
+    query, variables = OpenCTIApiClient.build_multiple_query(
+        [
+            (
+                "mutation LabelAdd($input: LabelAddInput!) { labelAdd(input: $input) { id } }",
+                {"input": {"value": "a"}},
+            ),
+            (
+                "mutation LabelAdd($input: LabelAddInput!) { labelAdd(input: $input) { id } }",
+                {"input": {"value": "b"}},
+            ),
+        ]
+    )
+    assert query.startswith(
+        "mutation Multiple($o0_input: LabelAddInput!, $o1_input: LabelAddInput!)"
+    )
+    assert "o0: labelAdd(input: $o0_input)" in query
+    assert "o1: labelAdd(input: $o1_input)" in query
+    assert variables == {"o0_input": {"value": "a"}, "o1_input": {"value": "b"}}
+
+
+def test_create_many_retries_only_failed_items(fake_client, fake_response, monkeypatch):
+    requests = []
+    responses = [
+        {
+            "data": {"o0": {"id": "label-a", "entity_type": "Label"}, "o1": None},
+            "errors": [{"message": "Lock", "name": "LOCK_ERROR", "path": ["o1"]}],
+        },
+        {"data": {"o0": {"id": "label-b", "entity_type": "Label"}}},
+    ]
+
+    def fake_post(url, json=None, **kwargs):
+        requests.append(json)
+        return fake_response(responses[len(requests) - 1])
+
+    monkeypatch.setattr(fake_client.session, "post", fake_post)
+    outcomes = fake_client.label.create_many([{"value": "a"}, {"value": "b"}, {}])
+    assert len(requests) == 2
+    assert requests[1]["variables"]["o0_input"]["value"] == "b"
+    assert outcomes[0]["result"]["id"] == "label-a"
+    assert outcomes[1]["result"]["id"] == "label-b"
+    assert outcomes[1]["error"] is None
+    assert outcomes[2]["result"] is None
+    assert outcomes[2]["error"]["name"] == "Invalid item"
@@ -0,0 +1,55 @@
+def test_delete_many_reports_each_id(fake_stix2, monkeypatch):
+    documents = []
+
+    def fake_query_multiple(operations):
+        documents.append(operations)
+        return [
+            (
+                {"data": None, "error": {"name": "Not found"}}
+                if variables["id"] == "bad"
+                else {"data": {"delete": variables["id"]}, "error": None}
+            )
+            for _, variables in operations
+        ]
+
+    monkeypatch.setattr(fake_stix2.opencti, "query_multiple", fake_query_multiple)
+    outcomes = fake_stix2.opencti.stix.delete_many(
+        ids=["a", "bad", "c"], chunk_size=2, max_workers=2
+    )
+    assert len(documents) == 2
+    assert [outcome["id"] for outcome in outcomes] == ["a", "bad", "c"]
+    assert [outcome["error"] is None for outcome in outcomes] == [True, False, True]
+
+
+def test_delete_many_reports_ids_without_mutation(fake_stix2, monkeypatch):
+    monkeypatch.setattr(
+        fake_stix2.opencti,
+        "query_multiple",
+        lambda operations: [
+            {"data": {"delete": variables["id"]}, "error": None}
+            for _, variables in operations
+        ],
+    )
+    outcomes = fake_stix2.opencti.stix.delete_many(ids=["a", None, "c"])
+    assert [outcome["id"] for outcome in outcomes] == ["a", None, "c"]
+    assert outcomes[0]["error"] is None
+    assert outcomes[1]["error"]["name"] == "Invalid item"
+    assert outcomes[2]["error"] is None
+
+
+def test_merge_many_reports_merges_without_mutation(fake_stix2, monkeypatch):
+    monkeypatch.setattr(
+        fake_stix2.opencti,
+        "query_multiple",
+        lambda operations: [
+            {"data": {"merge": {"id": variables["id"]}}, "error": None}
+            for _, variables in operations
+        ],
+    )
+    outcomes = fake_stix2.opencti.stix.merge_many(
+        merges=[("a", ["s1"]), ("b", None), ("c", ["s2"])]
+    )
+    assert outcomes[0]["result"]["id"] == "a"
+    assert outcomes[1]["result"] is None
+    assert outcomes[2]["result"]["id"] == "c"
+    assert outcomes[1]["error"]["name"] == "Invalid item"
@@ -0,0 +1,79 @@
+import pytest
+
+from pycti.utils.opencti_stix2_update import OpenCTIStix2Update
+
+
+def test_edit_relations_sends_one_request_per_chunk(
+    fake_client, fake_response, monkeypatch
+):
+    requests = []
+
+    def fake_post(url, json=None, **kwargs):
+        requests.append(json)
+        return fake_response({"data": {"o0": {"id": "x"}, "o1": {"id": "x"}}})
+
+    monkeypatch.setattr(fake_client.session, "post", fake_post)
+    assert fake_client.stix_domain_object.edit_relations(
+        id="report-id",
+        add=[
+            {"toId": "marking-" + str(i), "relationship_type": "object-marking"}
+            for i in range(3)
+        ],
+        remove=[{"toId": "label-id", "relationship_type": "object-label"}],
+        chunk_size=2,
+    )
+    assert len(requests) == 2
+    assert "o0: stixDomainObjectEdit(id: $o0_id)" in requests[0]["query"]
+    assert requests[0]["variables"]["o1_input"] == {
+        "toId": "marking-1",
+        "relationship_type": "object-marking",
+    }
+    assert "relationDelete" in requests[1]["query"]
+    assert requests[1]["variables"]["o1_toId"] == "label-id"
+
+
+def test_edit_relations_reports_failures(fake_client, fake_response, monkeypatch):
+
+    def fake_post(url, json=None, **kwargs):
+        return fake_response(
+            {
+                "data": {"o0": {"id": "x"}, "o1": None},
+                "errors": [{"message": "Not found", "path": ["o1"]}],
+            }
+        )
+
+    monkeypatch.setattr(fake_client.session, "post", fake_post)
+    assert not fake_client.stix_core_relationship.edit_relations(
+        id="relationship-id",
+        add=[
+            {"toId": "marking-a", "relationship_type": "object-marking"},
+            {"toId": "marking-b", "relationship_type": "object-marking"},
+        ],
+    )
+
+
+def test_add_marking_definition_without_pre_read(fake_client, monkeypatch):
+    queries = []
+    monkeypatch.setattr(
+        fake_client, "query", lambda query, variables=None: queries.append(query) or {}
+    )
+    fake_client.stix_cyber_observable.add_marking_definition(
+        id="observable-id", marking_definition_id="marking-id", check_existing=False
+    )
+    assert len(queries) == 1
+    assert "relationAdd" in queries[0]
+
+
+def test_stix2_update_raises_failed_edits(fake_client, fake_response, monkeypatch):
+    monkeypatch.setattr(
+        fake_client.session,
+        "post",
+        lambda url, json=None, **kwargs: fake_response(
+            {"data": {"o0": None}, "errors": [{"message": "Lock", "path": ["o0"]}]}
+        ),
+    )
+    stix2_update = OpenCTIStix2Update(fake_client)
+    with pytest.raises(ValueError):
+        stix2_update.add_object_marking_refs(
+            "malware", "malware-id", [{"value": "marking-a"}]
+        )
@@ -0,0 +1,85 @@
+import datetime
+
+
+def fake_list_method(rows, page_size):
+    calls = []
+
+    def list_method(**kwargs):
+        calls.append(kwargs)
+        start = int(kwargs["after"] or 0)
+        page = rows[start : start + page_size]
+        return {
+            "entities": page,
+            "pagination": {
+                "endCursor": str(start + len(page)),
+                "hasNextPage": start + len(page) < len(rows),
+            },
+        }
+
+    return list_method, calls
+
+
+def test_iter_changed_pages_and_returns_watermark(fake_client):
+    rows = [
+        {"id": "a", "updated_at": "2024-01-01T00:00:00.000Z"},
+        {"id": "b", "updated_at": "2024-01-01T00:00:01.000Z"},
+        {"id": "c", "updated_at": "2024-01-01T00:00:01.000Z"},
+    ]
+    list_method, calls = fake_list_method(rows, 2)
+    watermark = {}
+    ids = [
+        entity["id"]
+        for entity in fake_client.iter_changed(
+            list_method, watermark=watermark, first=2
+        )
+    ]
+    assert ids == ["a", "b", "c"]
+    assert len(calls) == 2
+    assert calls[0]["orderBy"] == "updated_at"
+    assert calls[0]["orderMode"] == "asc"
+    assert watermark["updated_at"] == "2024-01-01T00:00:01.000Z"
+    assert sorted(watermark["ids"]) == ["b", "c"]
+
+
+def test_iter_changed_skips_rows_already_seen_at_watermark(fake_client):
+    rows = [
+        {"id": "b", "updated_at": "2024-01-01T00:00:01.000Z"},
+        {"id": "c", "updated_at": "2024-01-01T00:00:01.000Z"},
+        {"id": "d", "updated_at": "2024-01-01T00:00:01.000Z"},
+    ]
+    list_method, calls = fake_list_method(rows, 10)
+    previous = {
+        "updated_at": "2024-01-01T00:00:01.000Z",
+        "ids": {
+            "b": "2024-01-01T00:00:01.000Z",
+            "c": "2024-01-01T00:00:01.000Z",
+        },
+    }
+    ids = [
+        entity["id"] for entity in fake_client.iter_changed(list_method, since=previous)
+    ]
+    assert ids == ["d"]
+    updated_at_filter = calls[0]["filters"]["filters"][0]
+    assert updated_at_filter["key"] == "updated_at"
+    assert updated_at_filter["operator"] == "gte"
+
+
+def test_iter_changed_accepts_naive_since(fake_client):
+    rows = [
+        {"id": "a", "updated_at": "2024-01-01T00:00:05.000Z"},
+        {"id": "b", "updated_at": "2024-01-01T02:00:10.000+02:00"},
+    ]
+    for since in [datetime.datetime(2024, 1, 1), "2024-01-01"]:
+        list_method, calls = fake_list_method(rows, 10)
+        watermark = {}
+        ids = [
+            entity["id"]
+            for entity in fake_client.iter_changed(
+                list_method, since=since, watermark=watermark
+            )
+        ]
+        assert ids == ["a", "b"]
+        assert calls[0]["filters"]["filters"][0]["values"] == [
+            "2024-01-01T00:00:00+00:00"
+        ]
+        assert watermark["updated_at"] == "2024-01-01T02:00:10.000+02:00"
@@ -0,0 +1,42 @@
+import pytest
+
+from pycti import OpenCTIApiClient
+
+
+def test_returning_query_replaces_root_selection():
+    query = """
+        mutation StixDomainObjectEdit($id: ID!, $input: [EditInput]!) {
+            stixDomainObjectEdit(id: $id) {
+                fieldPatch(input: $input) {
+                    id
+                    createdBy {
+                        id
+                    }
+                }
+            }
+        }
+    """
+    assert OpenCTIApiClient.returning_query(query, "full") == query
+    minimal = OpenCTIApiClient.returning_query(query, "minimal")
+    assert "createdBy" not in minimal
+    assert (
+        "fieldPatch(input: $input) {\nid standard_id entity_type parent_types\n}"
+        in minimal
+    )
+    assert "stixDomainObjectEdit(id: $id)" in minimal
+    with pytest.raises(ValueError):
+        OpenCTIApiClient.returning_query(query, "unknown")
+
+
+def test_create_with_returning_id(fake_client, monkeypatch):
+    queries = []
+
+    def fake_query(query, variables=None):
+        queries.append(query)
+        return {"data": {"malwareAdd": {"id": "malware-id"}}}
+
+    monkeypatch.setattr(fake_client, "query", fake_query)
+    result = fake_client.malware.create(name="Emotet", returning="id")
+    assert result == {"id": "malware-id"}
+    selection = queries[0][queries[0].index("malwareAdd(input: $input)") :]
+    assert "standard_id" not in selection
@@ -1,14 +1,5 @@
 import json
 
-from pycti import OpenCTIApiClient, OpenCTIStix2
-
-
-def get_cti_helper():
-    client = OpenCTIApiClient(
-        "http://fake:4000", "fake", ssl_verify=False, perform_health_check=False
-    )
-    return OpenCTIStix2(client)
-
 
 def load_test_file():
     with open("tests/data/bundle_ids_sample.json", "r") as content_file:
@@ -19,8 +10,8 @@ def load_test_file():
 
 # !! WARNING !!, this need to be changed along with 01-unit/domain/identifier-test.js
 # fmt: off
-def test_ids_generation():
-    gen_id = get_cti_helper().generate_standard_id_from_stix
+def test_ids_generation(fake_stix2):
+    gen_id = fake_stix2.generate_standard_id_from_stix
     # attack-pattern
     assert gen_id({"type": "attack-pattern", "name": "attack"}) =='attack-pattern--25f21617-8de8-5d5e-8cd4-b7e88547ba76'
     assert gen_id({"type": "attack-pattern", "name": "attack", "x_mitre_id": 'MITREID'}) == 'attack-pattern--b74cfee2-7b14-585e-862f-fea45e802da9'
@@ -109,13 +100,12 @@ def test_ids_generation():
 # fmt: on
 
 
-def test_prepare_bundle_ids_keep_original():
-    helper = get_cti_helper()
+def test_prepare_bundle_ids_keep_original(fake_stix2):
     bundle_data = load_test_file()
     malware_source = bundle_data["objects"][0]
     assert malware_source["id"] == "malware--d650c5b9-4b43-5781-8576-ea52bd6c7ce5"
     assert malware_source.get("x_opencti_stix_ids") is None
-    prepared_bundle = helper.prepare_bundle_ids(
+    prepared_bundle = fake_stix2.prepare_bundle_ids(
         bundle=bundle_data, use_json=False, keep_original_id=True
     )
     print(json.dumps(prepared_bundle))
@@ -126,16 +116,36 @@ def test_prepare_bundle_ids_keep_original():
     ]
 
 
-def test_prepare_bundle_ids():
-    helper = get_cti_helper()
+def test_prepare_bundle_ids(fake_stix2):
     bundle_data = load_test_file()
     malware_source = bundle_data["objects"][0]
     assert malware_source["id"] == "malware--d650c5b9-4b43-5781-8576-ea52bd6c7ce5"
     assert malware_source.get("x_opencti_stix_ids") is None
-    prepared_bundle = helper.prepare_bundle_ids(
+    prepared_bundle = fake_stix2.prepare_bundle_ids(
         bundle=bundle_data, use_json=False, keep_original_id=False
     )
     print(json.dumps(prepared_bundle))
     malware_target = prepared_bundle["objects"][0]
     assert malware_target["id"] == "malware--d650c5b9-4b43-5781-8576-ea52bd6c7ce0"
     assert malware_target.get("x_opencti_stix_ids") is None
+
+
+def test_prepare_bundle_ids_granted_refs(fake_stix2):
+    bundle_data = load_test_file()
+    bundle_data["objects"][1]["x_opencti_granted_refs"] = ["identity--a"]
+    bundle_data["objects"][2]["extensions"] = {
+        "extension-definition--ea279b3e-5c71-4632-ac08-831c66a786ba": {}
+    }
+    prepared_bundle = fake_stix2.prepare_bundle_ids(
+        bundle=bundle_data, use_json=False, granted_refs=["identity--b"]
+    )
+    objects = prepared_bundle["objects"]
+    assert objects[0]["x_opencti_granted_refs"] == ["identity--b"]
+    assert sorted(objects[1]["x_opencti_granted_refs"]) == [
+        "identity--a",
+        "identity--b",
+    ]
+    assert "x_opencti_granted_refs" not in objects[2]
+    assert objects[2]["extensions"][
+        "extension-definition--ea279b3e-5c71-4632-ac08-831c66a786ba"
+    ]["granted_refs"] == ["identity--b"]
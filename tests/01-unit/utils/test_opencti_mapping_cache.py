@@ -0,0 +1,122 @@
+import threading
+
+from pycti.utils.opencti_mapping_cache import (
+    MappingCache,
+    PersistentMappingCache,
+    SharedMappingCache,
+)
+
+
+def test_mapping_cache_reads_persistent_store_after_restart(tmp_path):
+    path = str(tmp_path / "mapping.db")
+    cache = MappingCache(maxsize=10, persistent=PersistentMappingCache(path))
+    cache["label_malicious"] = {"id": "label-id", "value": "malicious"}
+    restarted = MappingCache(maxsize=10, persistent=PersistentMappingCache(path))
+    assert "label_malicious" in restarted
+    assert restarted["label_malicious"]["id"] == "label-id"
+    assert "label_unknown" not in restarted
+    assert restarted.get("label_unknown") is None
+
+
+def test_mapping_cache_eviction_keeps_persistent_entries(tmp_path):
+    path = str(tmp_path / "mapping.db")
+    cache = MappingCache(maxsize=1, persistent=PersistentMappingCache(path))
+    cache["a"] = {"id": "a-id"}
+    cache["b"] = {"id": "b-id"}
+    assert cache.currsize == 1
+    assert cache["a"] == {"id": "a-id"}
+
+
+def test_persistent_store_version_and_ttl(tmp_path):
+    path = str(tmp_path / "mapping.db")
+    store = PersistentMappingCache(path, version="6.0.0")
+    store.set("mapping:a", {"id": "a-id"})
+    assert PersistentMappingCache(path, version="6.0.0").get("mapping:a") == {
+        "id": "a-id"
+    }
+    assert PersistentMappingCache(path, version="6.1.0").get("mapping:a") is None
+    expired = PersistentMappingCache(path, ttl=-1, version="6.1.0")
+    expired.set("mapping:b", {"id": "b-id"})
+    assert expired.get("mapping:b") is None
+
+
+def test_shared_store_between_workers(tmp_path):
+    path = str(tmp_path / "mapping.db")
+    first = MappingCache(maxsize=10, persistent=SharedMappingCache(path))
+    second = MappingCache(maxsize=10, persistent=SharedMappingCache(path))
+    first["label_malicious"] = {"id": "label-id"}
+    assert second["label_malicious"] == {"id": "label-id"}
+
+
+def test_shared_store_bound_and_entry_ttl(tmp_path):
+    store = SharedMappingCache(str(tmp_path / "mapping.db"), max_entries=2)
+    store.set("mapping:a", {"id": "a-id"})
+    store.set("mapping:b", {"id": "b-id"})
+    store.set("mapping:c", {"id": "c-id"})
+    store.connection.execute(
+        "UPDATE entries SET accessed_at = 0 WHERE key = ?", ("mapping:a",)
+    )
+    store.evict()
+    assert store.get("mapping:a") is None
+    assert store.get("mapping:c") == {"id": "c-id"}
+    store.set("mapping:d", {"id": "d-id"}, ttl=-1)
+    assert store.get("mapping:d") is None
+
+
+def test_mapping_cache_statistics_per_namespace():
+    class FakeMetric:
+        def __init__(self):
+            self.calls = []
+
+        def inc(self, name, n=1, labels=None):
+            self.calls.append((name, labels["namespace"]))
+
+    metric = FakeMetric()
+    cache = MappingCache(maxsize=1, metric=metric)
+    cache["label_malicious"] = {"id": "label-id"}
+    assert "label_malicious" in cache
+    assert cache.get("author_MITRE") is None
+    cache["indicator--1"] = {"id": "indicator-id"}
+    statistics = cache.statistics()["namespaces"]
+    assert statistics["label"] == {"hit": 1, "miss": 0, "eviction": 1}
+    assert statistics["author"] == {"hit": 0, "miss": 1, "eviction": 0}
+    assert metric.calls == [
+        ("mapping_cache_hit", "label"),
+        ("mapping_cache_miss", "author"),
+        ("mapping_cache_eviction", "label"),
+    ]
+
+
+def test_mapping_cache_byte_bound():
+    cache = MappingCache(maxbytes=30)
+    cache["a"] = {"id": "a" * 10}
+    cache["b"] = {"id": "b" * 10}
+    assert "a" not in cache
+    assert cache.currsize <= 30
+    cache["c"] = {"id": "c" * 100}
+    assert "c" not in cache
+    assert "b" in cache
+
+
+def test_mapping_cache_writes_the_store_outside_of_the_lock(tmp_path):
+    store = PersistentMappingCache(str(tmp_path / "mapping.db"))
+    assert store.connection.execute("PRAGMA synchronous").fetchone() == (1,)
+    cache = MappingCache(maxsize=10, persistent=store)
+    locked = []
+
+    def try_lock():
+        if cache.lock.acquire(timeout=1):
+            locked.append(True)
+            cache.lock.release()
+
+    def set(key, value, ttl=None):
+        # Another importer thread can use the memory cache meanwhile
+        thread = threading.Thread(target=try_lock)
+        thread.start()
+        thread.join()
+        PersistentMappingCache.set(store, key, value, ttl)
+
+    store.set = set
+    cache["label_malicious"] = {"id": "label-id"}
+    assert locked == [True]
+    assert store.get("mapping:label_malicious") == {"id": "label-id"}
@@ -1,8 +1,15 @@
+import copy
 import datetime
+import time
 
 import pytest
 
-from pycti.utils.opencti_stix2 import OpenCTIStix2
+from pycti.utils.opencti_stix2 import (
+    ERROR_CLASS_LOCK,
+    ERROR_CLASS_MISSING_REFERENCE,
+    OpenCTIStix2,
+)
+from pycti.utils.opencti_stix2_utils import OpenCTIStix2Utils
 
 
 @pytest.fixture
@@ -104,3 +111,461 @@ def test_import_bundle_from_file(opencti_stix2: OpenCTIStix2, caplog) -> None:
     for record in caplog.records:
         assert record.levelname == "ERROR"
     assert "The bundle file does not exists" in caplog.text
+
+
+def test_resolve_author_keeps_keywords_priority(fake_stix2, monkeypatch):
+    monkeypatch.setattr(fake_stix2, "get_author", lambda name: {"name": name})
+    assert (
+        fake_stix2.resolve_author("Microsoft and FireEye report")["name"] == "FireEye"
+    )
+    assert fake_stix2.resolve_author("UNIT 42 blog")["name"] == "Palo Alto Networks"
+    assert fake_stix2.resolve_author("Unknown vendor") is None
+
+
+def test_external_reference_date_is_memoized(fake_stix2, monkeypatch):
+    calls = []
+    find_date = OpenCTIStix2Utils.find_date
+
+    def counting_find_date(text, before):
+        calls.append(text)
+        return find_date(text, before)
+
+    monkeypatch.setattr(
+        OpenCTIStix2Utils, "find_date", staticmethod(counting_find_date)
+    )
+    reference = {
+        "source_name": "mitre-attack",
+        "external_id": "T1059",
+        "description": "Retrieved March 5, 2019.",
+    }
+    assert fake_stix2.external_reference_date(reference) == "2019-03-05T00:00:00Z"
+    assert fake_stix2.external_reference_date(dict(reference)) == "2019-03-05T00:00:00Z"
+    assert len(calls) == 1
+
+
+def test_resolve_bundle_references_warms_mapping_cache(fake_stix2, monkeypatch):
+    documents = []
+    monkeypatch.setattr(
+        fake_stix2.opencti.label,
+        "list",
+        lambda **kwargs: [{"id": "label-known", "value": "known"}],
+    )
+
+    def fake_query_multiple(operations):
+        documents.append(operations)
+        return [
+            {
+                "data": {"id": "created-" + str(index), "entity_type": "Stix"},
+                "error": None,
+            }
+            for index in range(len(operations))
+        ]
+
+    monkeypatch.setattr(fake_stix2.opencti, "query_multiple", fake_query_multiple)
+    reference = {"source_name": "mitre-attack", "url": "https://attack.mitre.org"}
+    phase = {"kill_chain_name": "mitre-attack", "phase_name": "execution"}
+    objects = [
+        {
+            "id": "malware--1",
+            "labels": ["known", "new"],
+            "kill_chain_phases": [phase],
+            "external_references": [reference],
+        },
+        {
+            "id": "malware--2",
+            "labels": ["new"],
+            "kill_chain_phases": [phase],
+            "external_references": [reference],
+        },
+    ]
+    fake_stix2.resolve_bundle_references(objects)
+    assert [len(operations) for operations in documents] == [1, 1, 1]
+    assert fake_stix2.mapping_cache["label_known"]["id"] == "label-known"
+    assert "label_new" in fake_stix2.mapping_cache
+    assert "kill_chain_phase_mitre-attackexecution" in fake_stix2.mapping_cache
+    generated_id = fake_stix2.opencti.external_reference.generate_id_from_data(
+        reference
+    )
+    assert "external_reference_" + generated_id in fake_stix2.mapping_cache
+
+
+def test_resolve_bundle_references_skips_unimported_objects(fake_stix2, monkeypatch):
+    documents = []
+    monkeypatch.setattr(fake_stix2.opencti.label, "list", lambda **kwargs: [])
+
+    def fake_query_multiple(operations):
+        documents.append(operations)
+        return [
+            {
+                "data": {"id": variables["input"]["value"], "entity_type": "Label"},
+                "error": None,
+            }
+            for _, variables in operations
+        ]
+
+    monkeypatch.setattr(fake_stix2.opencti, "query_multiple", fake_query_multiple)
+    reference = {"source_name": "mitre-attack", "url": "https://attack.mitre.org"}
+    phase = {"kill_chain_name": "mitre-attack", "phase_name": "execution"}
+    objects = [
+        {
+            "id": "malware--1",
+            "type": "malware",
+            "labels": ["scoped-out"],
+            "kill_chain_phases": [phase],
+            "external_references": [reference],
+        },
+        {
+            "id": "report--1",
+            "type": "report",
+            "labels": ["deleted"],
+            "external_references": [reference],
+            "opencti_operation": "delete",
+        },
+        {"id": "report--2", "type": "report", "labels": ["kept"]},
+    ]
+    fake_stix2.resolve_bundle_references(objects, types=["report"])
+    assert len(documents) == 1
+    assert [variables["input"]["value"] for _, variables in documents[0]] == ["kept"]
+
+
+def test_resolve_bundle_references_reads_sighting_endpoints_by_chunks(
+    fake_stix2, monkeypatch
+):
+    requests = []
+
+    def fake_list(**kwargs):
+        values = kwargs["filters"]["filters"][0]["values"]
+        requests.append(sorted(values))
+        return [
+            {
+                "id": "internal-" + value,
+                "standard_id": value,
+                "entity_type": "Identity",
+                "x_opencti_stix_ids": [],
+            }
+            for value in values
+            if value != "identity--unknown"
+        ]
+
+    monkeypatch.setattr(
+        fake_stix2.opencti.opencti_stix_object_or_stix_relationship, "list", fake_list
+    )
+    objects = [
+        {"type": "indicator", "id": "indicator--1"},
+        {
+            "type": "sighting",
+            "id": "sighting--1",
+            "sighting_of_ref": "indicator--1",
+            "where_sighted_refs": ["identity--1", "identity--2", "identity--unknown"],
+        },
+        {
+            "type": "sighting",
+            "id": "sighting--2",
+            "sighting_of_ref": "indicator--1",
+            "where_sighted_refs": ["identity--1"],
+        },
+    ]
+    fake_stix2.resolve_bundle_references(objects, chunk_size=2)
+    # Refs of the bundle are created by the import itself
+    assert requests == [["identity--1", "identity--2"], ["identity--unknown"]]
+    assert fake_stix2.mapping_cache["identity--2"]["id"] == "internal-identity--2"
+    assert "identity--unknown" not in fake_stix2.mapping_cache
+
+
+def test_import_operations_batches_and_retries_failures(fake_stix2, monkeypatch):
+    documents = []
+    retried = []
+
+    def fake_query_multiple(operations):
+        documents.append(operations)
+        return [
+            (
+                {"data": None, "error": {"name": "Lock"}}
+                if variables["id"] == "bad"
+                else {"data": {"merge": {"id": variables["id"]}}, "error": None}
+            )
+            for _, variables in operations
+        ]
+
+    monkeypatch.setattr(fake_stix2.opencti, "query_multiple", fake_query_multiple)
+    monkeypatch.setattr(
+        fake_stix2,
+        "import_items",
+        lambda items, *args: retried.extend(i["id"] for i in items),
+    )
+    fake_stix2.import_operations(
+        [
+            {"id": "a", "opencti_operation": "delete"},
+            {"id": "bad", "opencti_operation": "delete"},
+            {
+                "id": "m",
+                "opencti_operation": "merge",
+                "merge_target_id": "target",
+                "merge_source_ids": ["source"],
+            },
+        ]
+    )
+    assert len(documents) == 2
+    assert len(documents[0]) == 2
+    assert documents[1][0][1] == {"id": "target", "stixObjectsIds": ["source"]}
+    assert retried == ["bad"]
+
+
+def test_import_bundle_batches_operations_of_the_bundle(fake_stix2, monkeypatch):
+    documents = []
+
+    def fake_query_multiple(operations):
+        documents.append(operations)
+        return [
+            {"data": {"delete": variables["id"]}, "error": None}
+            for _, variables in operations
+        ]
+
+    monkeypatch.setattr(fake_stix2.opencti, "query_multiple", fake_query_multiple)
+    monkeypatch.setattr(
+        fake_stix2,
+        "prepare_bundle_ids",
+        lambda bundle, use_json, keep_original_id: bundle,
+    )
+    monkeypatch.setattr(
+        fake_stix2, "resolve_bundle_references", lambda objects, types=None: None
+    )
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--1",
+        "objects": [
+            {
+                "id": "malware--" + str(index),
+                "type": "malware",
+                "opencti_operation": "delete",
+            }
+            for index in range(5)
+        ],
+    }
+    elements = fake_stix2.import_bundle(bundle)
+    assert [len(operations) for operations in documents] == [5]
+    assert len(elements) == 5
+
+
+def test_import_levels_waits_for_previous_level(fake_stix2, monkeypatch):
+    imported = []
+    monkeypatch.setattr(
+        fake_stix2,
+        "import_item_content",
+        lambda item, *args: imported.append(item["id"]),
+    )
+    levels = [
+        [{"id": "identity--1", "type": "identity"}, {"id": "tool--1", "type": "tool"}],
+        [{"id": "malware--1", "type": "malware"}],
+    ]
+    elements = fake_stix2.import_levels(levels, max_workers=4)
+    assert sorted(imported[:2]) == ["identity--1", "tool--1"]
+    assert imported[2] == "malware--1"
+    assert [element["id"] for element in elements] == [
+        "identity--1",
+        "tool--1",
+        "malware--1",
+    ]
+
+
+def test_import_levels_shares_the_items_between_idle_workers(fake_stix2, monkeypatch):
+    imported = []
+    retry_numbers = []
+
+    def fake_import_item_content(item, update, types):
+        retry_numbers.append(
+            fake_stix2.opencti.get_request_headers()["opencti-retry-number"]
+        )
+        if item["id"] == "tool--slow":
+            time.sleep(0.2)
+        imported.append(item["id"])
+
+    monkeypatch.setattr(fake_stix2, "import_item_content", fake_import_item_content)
+    fake_stix2.import_levels(
+        [[{"id": "tool--" + name, "type": "tool"} for name in ["slow", "a", "b"]]],
+        max_workers=2,
+    )
+    # The other worker takes every item while the slow one is imported
+    assert imported == ["tool--a", "tool--b", "tool--slow"]
+    assert retry_numbers == ["0", "0", "0"]
+    # The retry number is not set on the headers shared by the threads
+    assert "opencti-retry-number" not in fake_stix2.opencti.request_headers
+
+
+def test_import_items_keeps_flowing_while_retrying(fake_stix2, monkeypatch):
+    monkeypatch.setattr(
+        "pycti.utils.opencti_stix2.RETRY_DELAYS",
+        {
+            ERROR_CLASS_LOCK: (0.01, 0.01),
+            ERROR_CLASS_MISSING_REFERENCE: (0, 0),
+        },
+    )
+    imported = []
+    failures = {"locked": ["LOCK_ERROR"], "orphan": ["MISSING_REFERENCE_ERROR"]}
+
+    def fake_import_item_content(item, update, types):
+        if len(failures.get(item["id"], [])) > 0:
+            raise ValueError(failures[item["id"]].pop())
+        imported.append(item["id"])
+
+    monkeypatch.setattr(fake_stix2, "import_item_content", fake_import_item_content)
+    errors = fake_stix2.import_items(
+        [{"id": "locked"}, {"id": "orphan"}, {"id": "other"}, {"id": "last"}]
+    )
+    assert errors == 0
+    assert imported[:2] == ["other", "last"]
+    assert sorted(imported[2:]) == ["locked", "orphan"]
+    assert fake_stix2.retry_counts == {"lock_rejection": 1, "missing_reference": 1}
+
+
+def test_import_bundle_schedules_retries_over_the_bundle(fake_stix2, monkeypatch):
+    monkeypatch.setattr(
+        "pycti.utils.opencti_stix2.RETRY_DELAYS",
+        {
+            ERROR_CLASS_LOCK: (0.05, 0.05),
+            ERROR_CLASS_MISSING_REFERENCE: (0, 0),
+        },
+    )
+    monkeypatch.setattr(
+        fake_stix2,
+        "prepare_bundle_ids",
+        lambda bundle, use_json, keep_original_id: bundle,
+    )
+    monkeypatch.setattr(
+        fake_stix2, "resolve_bundle_references", lambda objects, types=None: None
+    )
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--1",
+        "objects": [
+            {"id": "tool--" + name, "type": "tool"}
+            for name in ["locked", "orphan", "other", "last"]
+        ],
+    }
+    imported = []
+    failures = {
+        "tool--locked": ["LOCK_ERROR"],
+        "tool--orphan": ["MISSING_REFERENCE_ERROR"],
+    }
+
+    def fake_import_item_content(item, update, types):
+        if len(failures.get(item["id"], [])) > 0:
+            raise ValueError(failures[item["id"]].pop())
+        imported.append(item["id"])
+
+    monkeypatch.setattr(fake_stix2, "import_item_content", fake_import_item_content)
+    fake_stix2.import_bundle(copy.deepcopy(bundle))
+    # The failed items wait behind the next ones
+    assert imported == ["tool--other", "tool--last", "tool--orphan", "tool--locked"]
+
+
+def test_import_items_reports_technical_errors(fake_stix2, monkeypatch):
+
+    def fake_import_item_content(item, update, types):
+        raise ValueError("Unexpected")
+
+    monkeypatch.setattr(fake_stix2, "import_item_content", fake_import_item_content)
+    assert fake_stix2.import_items([{"id": "broken"}]) == 1
+    assert fake_stix2.retry_counts == {"technical": 1}
+
+
+def test_import_items_holds_the_dependents_of_a_waiting_item(fake_stix2, monkeypatch):
+    monkeypatch.setattr(
+        "pycti.utils.opencti_stix2.RETRY_DELAYS",
+        {ERROR_CLASS_LOCK: (0.01, 0.01), ERROR_CLASS_MISSING_REFERENCE: (0, 0)},
+    )
+    imported = []
+    failures = {"identity--1": ["LOCK_ERROR", "LOCK_ERROR"]}
+
+    def fake_import_item_content(item, update, types):
+        if len(failures.get(item["id"], [])) > 0:
+            raise ValueError(failures[item["id"]].pop())
+        missing = [ref for ref in item.get("object_refs", []) if ref not in imported]
+        if item.get("created_by_ref") not in imported + [None] or len(missing) > 0:
+            raise ValueError("MISSING_REFERENCE_ERROR")
+        imported.append(item["id"])
+
+    monkeypatch.setattr(fake_stix2, "import_item_content", fake_import_item_content)
+    errors = fake_stix2.import_items(
+        [
+            {"id": "identity--1", "type": "identity"},
+            {"id": "tool--1", "type": "tool"},
+            {"id": "report--1", "type": "report", "created_by_ref": "identity--1"},
+            {"id": "note--1", "type": "note", "object_refs": ["report--1"]},
+            {"id": "tool--2", "type": "tool"},
+        ]
+    )
+    assert errors == 0
+    assert imported == ["tool--1", "tool--2", "identity--1", "report--1", "note--1"]
+    # The dependents were never tried before the author was imported
+    assert fake_stix2.retry_counts == {"lock_rejection": 2}
+
+
+def test_import_items_does_not_hold_a_cycle(fake_stix2, monkeypatch):
+    monkeypatch.setattr(
+        "pycti.utils.opencti_stix2.RETRY_DELAYS",
+        {ERROR_CLASS_LOCK: (0.01, 0.01), ERROR_CLASS_MISSING_REFERENCE: (0, 0)},
+    )
+    imported = []
+    failures = {"report--1": ["LOCK_ERROR"]}
+
+    def fake_import_item_content(item, update, types):
+        if len(failures.get(item["id"], [])) > 0:
+            raise ValueError(failures[item["id"]].pop())
+        imported.append(item["id"])
+
+    monkeypatch.setattr(fake_stix2, "import_item_content", fake_import_item_content)
+    errors = fake_stix2.import_items(
+        [
+            {"id": "report--1", "type": "report", "object_refs": ["note--1"]},
+            {"id": "note--1", "type": "note", "object_refs": ["report--1"]},
+        ]
+    )
+    assert errors == 0
+    assert imported == ["report--1", "note--1"]
+
+
+def test_plan_import_counts_calls_without_network(fake_stix2):
+    identity_id = "identity--72de07e8-e6ed-4dfe-b906-1e82fae1d132"
+    malware_id = "malware--faa5b705-cf44-4e50-8472-29e5fec43c3c"
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--1",
+        "objects": [
+            {
+                "type": "malware",
+                "spec_version": "2.1",
+                "id": malware_id,
+                "name": "Evil",
+                "is_family": True,
+                "labels": ["evil"],
+                "created_by_ref": identity_id,
+            },
+            {
+                "type": "identity",
+                "spec_version": "2.1",
+                "id": identity_id,
+                "name": "ACME",
+                "identity_class": "organization",
+            },
+            {
+                "type": "relationship",
+                "spec_version": "2.1",
+                "id": "relationship--7b8e2b7b-0a8c-4a3d-9c47-0c1f1e0b3c11",
+                "relationship_type": "related-to",
+                "source_ref": malware_id,
+                "target_ref": identity_id,
+            },
+        ],
+    }
+    plan = fake_stix2.plan_import(bundle, latency=1)
+    assert plan["objects"] == 3
+    assert plan["errors"] == 0
+    assert plan["depth"] == 3
+    assert plan["levels"] == [1, 1, 1]
+    assert plan["kinds"]["label"] >= 1
+    assert plan["types"]["relationship"] == {"relationship": 1}
+    assert plan["estimated_duration"] == plan["calls"]
+    # The bundle and the mapping caches are left untouched
+    assert bundle["objects"][0]["id"] == malware_id
+    assert len(fake_stix2.mapping_cache) == 0
@@ -0,0 +1,57 @@
+from stix2.canonicalization.Canonicalize import canonicalize
+
+from pycti.utils.opencti_stix2_identifier import StixIdGenerator, canonicalize_data
+
+
+def test_canonicalize_data_as_canonicalize():
+    for data in [
+        {"relationship_type": "uses", "source_ref": 'a \n"é', "target_ref": "t"},
+        {"sighting_of_ref": "x", "where_sighted_refs": ["b", "a\U0001f600"]},
+        {"name": "position", "latitude": 5.12, "longitude": 1.0},
+    ]:
+        assert canonicalize_data(data) == canonicalize(data, utf8=False)
+
+
+def test_generate_ids_memoized(fake_stix2):
+    items = [
+        {"id": "malware--1", "type": "malware", "name": "Emotet"},
+        {
+            "id": "relationship--1",
+            "type": "relationship",
+            "relationship_type": "uses",
+            "source_ref": "malware--1",
+            "target_ref": "tool--1",
+        },
+        {"id": "threat-actor--1", "type": "threat-actor", "name": "APT"},
+        {
+            "id": "threat-actor--2",
+            "type": "threat-actor",
+            "name": "APT",
+            "x_opencti_type": "Threat-Actor-Individual",
+        },
+        {"id": "x-unknown--1", "type": "x-unknown"},
+    ]
+    expected = {
+        item["id"]: fake_stix2.generate_standard_id_from_stix(item)
+        for item in items[:-1]
+    }
+    generator = StixIdGenerator(fake_stix2.get_stix_helper())
+    assert generator.generate_ids(items) == expected
+    assert expected["threat-actor--1"] != expected["threat-actor--2"]
+
+    calls = []
+    malware = generator.helpers["malware"]
+
+    class CountingHelper:
+        def generate_id_from_data(self, data):
+            calls.append(data["id"])
+            return malware.generate_id_from_data(data)
+
+    generator.helpers["malware"] = CountingHelper()
+    # Same identifying fields, the id is not computed again
+    assert (
+        generator.generate_id({"id": "malware--2", "type": "malware", "name": "Emotet"})
+        == expected["malware--1"]
+    )
+    generator.generate_id({"id": "malware--3", "type": "malware", "name": "Other"})
+    assert calls == ["malware--3"]
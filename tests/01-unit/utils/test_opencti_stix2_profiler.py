@@ -0,0 +1,54 @@
+import time
+
+from pycti.utils.opencti_stix2_profiler import ImportProfiler
+
+
+def test_profiler_excludes_nested_phases_and_counts_calls():
+    profiler = ImportProfiler()
+    with profiler.measure("create", "malware"):
+        profiler.count_call(0.0, 100)
+        with profiler.measure("embedded_relationships"):
+            time.sleep(0.02)
+            profiler.count_call(0.0, 10)
+        profiler.count_call(0.01, 1000, upload=True)
+    profiler.count_retry("malware")
+    report = profiler.report()["types"]["malware"]
+    assert report["create"]["calls"] == 1
+    assert report["create"]["bytes"] == 100
+    assert report["create"]["retries"] == 1
+    assert report["create"]["time"] < 0.02
+    assert report["embedded_relationships"]["time"] >= 0.02
+    assert report["embedded_relationships"]["calls"] == 1
+    assert report["files"] == {
+        "count": 1,
+        "time": 0.01,
+        "calls": 1,
+        "bytes": 1000,
+        "retries": 0,
+    }
+    assert profiler.table().splitlines()[1].split()[:2] == [
+        "malware",
+        "embedded_relationships",
+    ]
+
+
+def test_import_bundle_profile_per_type(fake_stix2, monkeypatch):
+    monkeypatch.setattr(
+        fake_stix2, "resolve_bundle_references", lambda objects, types=None: None
+    )
+    monkeypatch.setattr(
+        fake_stix2, "import_item_content", lambda item, *args: time.sleep(0.01)
+    )
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--1",
+        "objects": [
+            {"type": "x-test", "id": "x-test--1"},
+            {"type": "x-test", "id": "x-test--2"},
+        ],
+    }
+    fake_stix2.import_bundle(bundle, profile=True)
+    assert fake_stix2.profiler is None
+    create = fake_stix2.import_profile["types"]["x-test"]["create"]
+    assert create["count"] == 2
+    assert create["time"] >= 0.02
@@ -1,3 +1,4 @@
+import json
 import uuid
 
 from stix2 import Report
@@ -21,6 +22,37 @@ def test_split_cyclic_bundle():
     assert expectations == 3
 
 
+def test_split_bundle_in_levels():
+    stix_splitter = OpenCTIStix2Splitter()
+    bundle = {
+        "objects": [
+            {
+                "id": "relationship--1",
+                "type": "relationship",
+                "source_ref": "malware--1",
+                "target_ref": "tool--1",
+            },
+            {"id": "malware--1", "type": "malware", "created_by_ref": "identity--1"},
+            {"id": "tool--1", "type": "tool", "object_marking_refs": ["unknown"]},
+            {"id": "identity--1", "type": "identity"},
+        ]
+    }
+    levels = stix_splitter.split_bundle_in_levels(bundle, False)
+    assert [[item["id"] for item in level] for level in levels] == [
+        ["tool--1", "identity--1"],
+        ["malware--1"],
+        ["relationship--1"],
+    ]
+
+
+def test_split_cyclic_bundle_in_levels():
+    stix_splitter = OpenCTIStix2Splitter()
+    with open("./tests/data/cyclic-bundle.json") as file:
+        content = file.read()
+    levels = stix_splitter.split_bundle_in_levels(content)
+    assert sum(len(level) for level in levels) == 3
+
+
 def test_create_bundle():
     stix_splitter = OpenCTIStix2Splitter()
     report = Report(
@@ -56,3 +88,87 @@ def test_create_bundle():
     ]:
         assert key in bundle
     assert len(bundle.keys()) == 6
+
+
+def test_split_deep_bundle_without_recursion():
+    stix_splitter = OpenCTIStix2Splitter()
+    depth = 5000
+    objects = [{"id": "identity--0", "type": "identity"}]
+    for index in range(1, depth):
+        objects.append(
+            {
+                "id": "identity--" + str(index),
+                "type": "identity",
+                "created_by_ref": "identity--" + str(index - 1),
+            }
+        )
+    objects.reverse()
+    expectations, bundles = stix_splitter.split_bundle_with_expectations(
+        {"objects": objects}, False
+    )
+    assert expectations == depth
+    assert [bundle["objects"][0]["id"] for bundle in bundles] == [
+        "identity--" + str(index) for index in range(depth)
+    ]
+    assert [bundle["x_opencti_level"] for bundle in bundles] == list(range(depth))
+
+
+def test_split_bundle_breaks_cycles_at_authors():
+    stix_splitter = OpenCTIStix2Splitter()
+    bundle = {
+        "objects": [
+            {
+                "id": "report--1",
+                "type": "report",
+                "created_by_ref": "identity--1",
+                "object_refs": ["identity--1", "identity--2"],
+            },
+            {"id": "identity--1", "type": "identity", "created_by_ref": "identity--2"},
+            {"id": "identity--2", "type": "identity", "created_by_ref": "identity--1"},
+        ]
+    }
+    expectations, bundles = stix_splitter.split_bundle_with_expectations(bundle, False)
+    assert expectations == 3
+    assert [
+        (bundle["objects"][0]["id"], bundle["x_opencti_level"]) for bundle in bundles
+    ] == [("identity--1", 0), ("identity--2", 1), ("report--1", 2)]
+
+
+def test_split_bundle_packs_levels():
+    stix_splitter = OpenCTIStix2Splitter()
+    objects = [{"id": "identity--1", "type": "identity"}]
+    for index in range(5):
+        objects.append(
+            {
+                "id": "malware--" + str(index),
+                "type": "malware",
+                "created_by_ref": "identity--1",
+                "description": "x" * (300 if index == 3 else 10),
+            }
+        )
+    expectations, bundles = stix_splitter.split_bundle_with_expectations(
+        {"objects": objects}, False, max_objects=3, max_bytes=400
+    )
+    assert expectations == 6
+    assert [
+        (bundle["x_opencti_level"], [item["id"] for item in bundle["objects"]])
+        for bundle in bundles
+    ] == [
+        (0, ["identity--1"]),
+        (1, ["malware--0", "malware--1", "malware--2"]),
+        (1, ["malware--3"]),
+        (1, ["malware--4"]),
+    ]
+
+
+def test_split_json_bundle_as_parsed_bundle():
+    with open("./tests/data/cyclic-bundle.json") as file:
+        content = file.read()
+    expectations, bundles = OpenCTIStix2Splitter().split_bundle_with_expectations(
+        content, max_objects=2
+    )
+    _, expected_bundles = OpenCTIStix2Splitter().split_bundle_with_expectations(
+        json.loads(content), False, max_objects=2
+    )
+    assert expectations == 3
+    assert [json.loads(bundle) for bundle in bundles] == expected_bundles
@@ -0,0 +1,124 @@
+import json
+
+from pycti.utils.opencti_stix2_splitter import OpenCTIStix2Splitter
+from pycti.utils.opencti_stix2_stream import StixBundleReader, StixObjectIndex
+
+
+def write_bundle(tmp_path, objects):
+    path = tmp_path / "bundle.json"
+    # Header fields after the objects must still be read
+    path.write_text(
+        '{"objects": '
+        + json.dumps(objects, indent=2)
+        + ', "id": "bundle--1", "spec_version": "2.1", "type": "bundle"}',
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_reader_streams_objects_by_small_chunks(tmp_path):
+    objects = [
+        {"id": "x-test--" + str(index), "type": "x-test", "value": "é" * index}
+        for index in range(20)
+    ]
+    path = write_bundle(tmp_path, objects)
+    for use_mmap in [False, True]:
+        reader = StixBundleReader(path, use_mmap=use_mmap, chunk_size=7)
+        assert list(reader) == objects
+        assert reader.header == {
+            "id": "bundle--1",
+            "spec_version": "2.1",
+            "type": "bundle",
+        }
+
+
+def test_index_remaps_ids_and_computes_levels(tmp_path):
+    index = StixObjectIndex(str(tmp_path / "index.db"), batch_size=2)
+    objects = [
+        {"id": "relationship--1", "source_ref": "malware--1", "target_ref": "a--1"},
+        {"id": "malware--1", "created_by_ref": "identity--1"},
+        {"id": "identity--1"},
+        {"id": "a--1", "related_ref": "b--1"},
+        {"id": "b--1", "related_ref": "a--1"},
+    ]
+    for item in objects:
+        index.add(item, "malware--std" if item["id"] == "malware--1" else None)
+
+    def remap_item(item, cache_ids):
+        item["id"] = cache_ids.get(item["id"], item["id"])
+        for key in item:
+            if key.endswith("_ref"):
+                item[key] = cache_ids.get(item[key], item[key])
+
+    index.remap(remap_item, OpenCTIStix2Splitter().element_refs)
+    assert index.compute_levels() == 3
+    levels = [
+        [item["id"] for items in index.iter_level(level) for item in items]
+        for level in range(3)
+    ]
+    index.close()
+    # The cycle and what depends on it come last
+    assert levels == [
+        ["identity--1"],
+        ["malware--std"],
+        ["relationship--1", "a--1", "b--1"],
+    ]
+
+
+def test_index_levels_of_a_deep_chain(tmp_path):
+    index = StixObjectIndex(str(tmp_path / "index.db"), batch_size=50)
+    depth = 300
+    index.add({"id": "x--0"})
+    for position in range(1, depth):
+        # Every object references the previous one, and the first one
+        index.add(
+            {
+                "id": "x--" + str(position),
+                "object_refs": ["x--" + str(position - 1), "x--0"],
+            }
+        )
+    index.remap(lambda item, cache_ids: None, OpenCTIStix2Splitter().element_refs)
+    assert index.compute_levels() == depth
+    levels = [
+        [item["id"] for items in index.iter_level(level) for item in items]
+        for level in range(depth)
+    ]
+    index.close()
+    assert levels == [["x--" + str(position)] for position in range(depth)]
+
+
+def test_import_bundle_from_file_stream_imports_by_level(
+    fake_stix2, tmp_path, monkeypatch
+):
+    imported = []
+    monkeypatch.setattr(
+        fake_stix2, "resolve_bundle_references", lambda items, types=None: None
+    )
+    monkeypatch.setattr(
+        fake_stix2,
+        "import_items",
+        lambda items, *args: imported.append([item["id"] for item in items]),
+    )
+    path = tmp_path / "bundle.json"
+    path.write_text(
+        json.dumps(
+            {
+                "type": "bundle",
+                "id": "bundle--1",
+                "objects": [
+                    {
+                        "type": "relationship",
+                        "id": "relationship--1",
+                        "relationship_type": "uses",
+                        "source_ref": "malware--1",
+                        "target_ref": "malware--2",
+                    },
+                    {"type": "x-test", "id": "malware--1"},
+                    {"type": "x-test", "id": "malware--2"},
+                ],
+            }
+        )
+    )
+    assert fake_stix2.import_bundle_from_file_stream(str(path), batch_size=1) == 3
+    assert imported[:2] == [["malware--1"], ["malware--2"]]
+    assert imported[2][0].startswith("relationship--")
@@ -0,0 +1,162 @@
+import time
+from types import SimpleNamespace
+
+from pycti.connector.opencti_connector_helper import ListenStream
+from pycti.utils.opencti_stix2_update import OpenCTIStix2Update
+
+
+def get_stix2_update(client, monkeypatch, calls):
+    stix2_update = OpenCTIStix2Update(client)
+    monkeypatch.setattr(
+        stix2_update,
+        "update_attribute",
+        lambda entity_type, id, input: calls.append((entity_type, id, input)),
+    )
+    return stix2_update
+
+
+def patch(id, **operations):
+    return {"id": id, "type": "malware", "x_opencti_patch": operations}
+
+
+def test_process_update_without_coalescing(fake_client, monkeypatch):
+    calls = []
+    stix2_update = get_stix2_update(fake_client, monkeypatch, calls)
+    stix2_update.process_update(patch("malware-a", add={"aliases": ["x"]}))
+    stix2_update.process_update(patch("malware-a", add={"aliases": ["y"]}))
+    assert len(calls) == 2
+
+
+def test_process_update_coalesces_net_delta(fake_client, monkeypatch):
+    calls = []
+    stix2_update = get_stix2_update(fake_client, monkeypatch, calls)
+    with stix2_update.coalescing(max_patches=100, max_delay=60):
+        stix2_update.process_update(patch("malware-a", add={"aliases": ["x", "y"]}))
+        stix2_update.process_update(patch("malware-b", add={"aliases": ["z"]}))
+        stix2_update.process_update(patch("malware-a", remove={"aliases": ["x"]}))
+        stix2_update.process_update(
+            patch("malware-a", replace={"name": {"current": "first"}})
+        )
+        stix2_update.process_update(
+            patch("malware-a", replace={"name": {"current": "last"}})
+        )
+        assert len(calls) == 0
+    assert calls == [
+        (
+            "malware",
+            "malware-a",
+            [
+                {"key": "name", "value": "last"},
+                {"key": "aliases", "value": ["y"], "operation": "add"},
+                {"key": "aliases", "value": ["x"], "operation": "remove"},
+            ],
+        ),
+        (
+            "malware",
+            "malware-b",
+            [{"key": "aliases", "value": ["z"], "operation": "add"}],
+        ),
+    ]
+
+
+def test_process_update_flushes_on_window(fake_client, monkeypatch):
+    calls = []
+    stix2_update = get_stix2_update(fake_client, monkeypatch, calls)
+    with stix2_update.coalescing(max_patches=2, max_delay=60):
+        stix2_update.process_update(patch("malware-a", add={"aliases": ["x"]}))
+        stix2_update.process_update(patch("malware-a", add={"aliases": ["y"]}))
+        assert len(calls) == 1
+        stix2_update.process_update(patch("malware-a", add={"aliases": ["z"]}))
+    assert len(calls) == 2
+
+
+def test_process_update_flushes_idle_patches_on_timer(fake_client, monkeypatch):
+    calls = []
+    stix2_update = get_stix2_update(fake_client, monkeypatch, calls)
+    with stix2_update.coalescing(max_patches=100, max_delay=0.05):
+        stix2_update.process_update(patch("malware-a", add={"aliases": ["x"]}))
+        time.sleep(0.3)
+        assert len(calls) == 1
+
+
+def test_stream_flushes_patches_before_delete(fake_client, monkeypatch):
+    calls = []
+    stix2_update = get_stix2_update(fake_client, monkeypatch, calls)
+    helper = SimpleNamespace(api=SimpleNamespace(stix2=SimpleNamespace()))
+    helper.api.stix2.stix2_update = stix2_update
+
+    def callback(msg):
+        if msg.event == "update":
+            stix2_update.process_update(msg.data)
+        else:
+            calls.append((msg.event, msg.data["id"]))
+
+    stream = ListenStream(
+        helper, callback, None, None, False, None, None, True, False, None, False
+    )
+    with stix2_update.coalescing(max_patches=100, max_delay=60):
+        for event, data in [
+            ("update", patch("malware-a", add={"aliases": ["x"]})),
+            ("delete", {"id": "malware-a"}),
+            ("update", patch("malware-b", add={"aliases": ["y"]})),
+        ]:
+            stream.process_message(SimpleNamespace(event=event, data=data))
+    assert [call[:2] for call in calls] == [
+        ("malware", "malware-a"),
+        ("delete", "malware-a"),
+        ("malware", "malware-b"),
+    ]
+
+
+def test_stream_resumes_before_pending_patches(fake_client, monkeypatch):
+    calls = []
+    stix2_update = get_stix2_update(fake_client, monkeypatch, calls)
+    stix2_update.stream_position("0-0")
+    with stix2_update.coalescing(max_patches=100, max_delay=60):
+        stix2_update.process_update(patch("malware-a", add={"aliases": ["x"]}))
+        assert stix2_update.stream_position("1-0") == "0-0"
+        stix2_update.process_update(patch("malware-a", add={"aliases": ["y"]}))
+        assert stix2_update.stream_position("2-0") == "0-0"
+        stix2_update.flush_updates()
+        assert stix2_update.stream_position("3-0") == "3-0"
+        stix2_update.process_update(patch("malware-b", add={"aliases": ["z"]}))
+        assert stix2_update.stream_position("4-0") == "3-0"
+    assert stix2_update.stream_position("5-0") == "5-0"
+
+
+def test_flush_keeps_failed_patches_pending(fake_client, monkeypatch):
+    calls = []
+    failures = ["Lock"]
+    stix2_update = OpenCTIStix2Update(fake_client)
+
+    def fake_update_attribute(entity_type, id, input):
+        # Patches keep being coalesced while a flush sends its requests
+        assert stix2_update.pending_lock.acquire(blocking=False)
+        stix2_update.pending_lock.release()
+        if len(failures) > 0:
+            raise ValueError(failures.pop())
+        calls.append((entity_type, id, input))
+
+    monkeypatch.setattr(stix2_update, "update_attribute", fake_update_attribute)
+    stix2_update.stream_position("0-0")
+    with stix2_update.coalescing(max_patches=100, max_delay=60):
+        stix2_update.process_update(
+            patch("malware-a", replace={"name": {"current": "first"}})
+        )
+        stix2_update.stream_position("1-0")
+        stix2_update.flush_updates()
+        assert len(calls) == 0
+        stix2_update.process_update(patch("malware-a", add={"aliases": ["x"]}))
+        assert stix2_update.stream_position("2-0") == "0-0"
+        stix2_update.flush_updates()
+        assert stix2_update.stream_position("3-0") == "3-0"
+    assert calls == [
+        (
+            "malware",
+            "malware-a",
+            [
+                {"key": "name", "value": "first"},
+                {"key": "aliases", "value": ["x"], "operation": "add"},
+            ],
+        )
+    ]
@@ -0,0 +1,66 @@
+import base64
+import datetime
+
+from pycti.utils.opencti_stix2_utils import OpenCTIStix2Utils
+
+
+def test_find_date_usual_formats():
+    before = datetime.datetime(2024, 1, 1)
+    assert OpenCTIStix2Utils.find_date(
+        "FireEye. (2017, June 12). APT28.", before
+    ) == datetime.datetime(2017, 6, 12)
+    assert OpenCTIStix2Utils.find_date(
+        "Retrieved March 5th, 2019.", before
+    ) == datetime.datetime(2019, 3, 5)
+    assert OpenCTIStix2Utils.find_date(
+        "Updated 2030-01-01, first seen 2018-04-30", before
+    ) == datetime.datetime(2018, 4, 30)
+    assert OpenCTIStix2Utils.find_date("Sept. 2016", before) == datetime.datetime(
+        2016, 9, 1
+    )
+    assert OpenCTIStix2Utils.find_date("", before) is None
+
+
+def test_find_date_bounded_window():
+    before = datetime.datetime(2024, 1, 1)
+    text = "x " * 100 + "12 October 2020"
+    assert OpenCTIStix2Utils.find_date(text, before, window=50) is None
+    assert OpenCTIStix2Utils.find_date(text, before) == datetime.datetime(2020, 10, 12)
+
+
+def test_decode_file_by_chunks():
+    content = bytes(range(256)) * 50
+    encoded = base64.encodebytes(content).decode("ascii")
+    with OpenCTIStix2Utils.decode_file(encoded, chunk_size=7, spool_size=100) as file:
+        assert file.read() == content
+        # Spilled to disk past the spool size
+        assert file._rolled
+
+
+def test_upload_files_streams_embedded_files(fake_stix2, fake_response, monkeypatch):
+    content = b"MZ" + bytes(range(256)) * 100
+    uploads = []
+
+    def fake_post(url, data=None, files=None, headers=None, **kwargs):
+        assert files is None
+        body = b"".join(data)
+        assert len(body) == len(data)
+        assert headers["Content-Type"] == data.content_type
+        uploads.append(body)
+        return fake_response(
+            {"data": {"stixDomainObjectEdit": {"importPush": {"id": "file"}}}}
+        )
+
+    monkeypatch.setattr(fake_stix2.opencti.session, "post", fake_post)
+    file = {
+        "name": "sample.exe",
+        "mime_type": "application/octet-stream",
+        "data": base64.b64encode(content).decode("ascii"),
+    }
+    fake_stix2.upload_files(
+        fake_stix2.opencti.stix_domain_object, "malware--id", [file]
+    )
+    assert len(uploads) == 1
+    assert content in uploads[0]
+    assert b'filename="sample.exe"' in uploads[0]
+    assert "data" not in file